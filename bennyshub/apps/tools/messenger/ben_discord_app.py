@@ -14,7 +14,7 @@
 # - Space = move highlight, Enter = select / read / open reply box
 # - Long-hold Enter (~2.5s) toggles focus pane (channel list <-> message view)
 
-import os, sys, asyncio, threading, tempfile, json, base64, subprocess, traceback, time, re, ctypes
+import os, sys, asyncio, threading, tempfile, json, base64, subprocess, traceback, time, re, ctypes, bisect
 import discord
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Any
@@ -62,6 +62,19 @@ except Exception as e:
     def is_tts_enabled(): return True
     def check_settings_changed(): return False
 
+# Shared speech daemon (one engine for all hub tools)
+try:
+    from speech_daemon import speak as speak_via_daemon, stop_speech, ensure_daemon  # type: ignore
+except Exception:
+    def speak_via_daemon(*_args, **_kwargs): return False
+    def stop_speech(*_args, **_kwargs): return False
+    def ensure_daemon(): pass
+
+from read_state import ReadState
+from message_store import MessageStore
+from member_resolver import MemberResolver
+from bounded import LRUCache, SeenIds
+
 # Windows-specific imports for focus management
 try:
     import win32gui
@@ -88,6 +101,14 @@ SETTINGS = {
     "DM_BACKFILL_BATCH": 10,
     "ENABLE_SCROLL_BACKFILL": True,
     "ENABLE_RENDER_DM_BACKFILL": False,   # avoid auto-pulling 500 on every render
+    "CACHE_INITIAL_LIMIT": 50,           # messages per thread read from message_cache.sqlite at startup
+    "CHANNEL_DELTA_LIMIT": 100,          # max new messages fetched per channel after the newest stored one
+    "DM_DELTA_LIMIT": 100,
+    "THREAD_WINDOW": 100,                # messages kept in memory per thread; older ones stay in message_cache.sqlite
+    "ACTIVE_THREAD_WINDOW": 1000,        # window for the thread on screen (scroll-back)
+    "NAME_CACHE_SIZE": 5000,
+    "REACTION_CACHE_SIZE": 20000,
+    "SEEN_IDS_SIZE": 50000,
     "FOCUS_ANCHOR_RATIO": 0.5            # keep highlight around mid-pane
 }
 try:
@@ -138,6 +159,9 @@ class TTSWorker(QtCore.QObject):
     def _on_say(self, text: str):
         if not text:
             return
+        # The shared daemon does latest-wins itself; the local engine is a fallback
+        if speak_via_daemon(text, channel="messenger", mode="interrupt"):
+            return
         # Check if TTS is enabled in shared settings
         if _voice_settings_available and not is_tts_enabled():
             return
@@ -193,6 +217,7 @@ class TTSWorker(QtCore.QObject):
     def _halt(self):
         # clear any pending text and stop immediately
         self._latest_text = None
+        stop_speech("messenger")
         if not self._engine:
             return
         try:
@@ -212,8 +237,11 @@ class TTSWorker(QtCore.QObject):
                     pass
         except Exception:
             pass
+        # Nothing to recreate when speech goes through the daemon
+        had_engine = self._engine is not None
         self._engine = None
-        self._ensure_engine()
+        if had_engine:
+            self._ensure_engine()
 
     @QtCore.Slot()
     def _keepalive(self):
@@ -221,8 +249,7 @@ class TTSWorker(QtCore.QObject):
         Lightweight watchdog: ensure the engine exists and the driver is responsive.
         Never speaks; only reinitializes on errors.
         """
-        # Ensure engine object
-        self._ensure_engine()
+        # Only look after a local engine that is in use (normally the daemon speaks)
         eng = self._engine
         if not eng:
             return
@@ -271,6 +298,9 @@ class DiscordBridge(QtCore.QObject):
     reactions_updated = QtCore.Signal(str, object)     # thread_id, message_id (avoid 32-bit int overflow)
     reaction_tts = QtCore.Signal(str)               # speak this line
     history_extended = QtCore.Signal(str)  # NEW: emitted after older DM history is fetched
+    message_edited = QtCore.Signal(str, object)     # thread_id, message_id
+    messages_evicted = QtCore.Signal(str, object)   # thread_id, [message_id] dropped from ui_messages
+    messages_deleted = QtCore.Signal(str, object)   # thread_id, [message_id] deleted on Discord
 
     def __init__(self, token: str, guild_id: int, chan_id: int, dm_bridge_chan_id: int, channel_ids: List[int] = None):
         super().__init__()
@@ -300,13 +330,159 @@ class DiscordBridge(QtCore.QObject):
         self._dm_index: dict[str, str] = {}  # str(user_id) -> display name
         # cache for guild display names (nicknames)
         self.guild: Optional[discord.Guild] = None
-        self._name_cache: Dict[int, str] = {}
+        name_cache_size = int(S("NAME_CACHE_SIZE", 5000))
+        self._name_cache = LRUCache(name_cache_size)  # uid -> display name
+        # batched guild member lookups; fills _name_cache
+        self.members = MemberResolver(self._name_cache, max_names=name_cache_size)
         # reactions store: message_id -> list of dicts {emoji, name, url, count}
-        self.ui_reactions: Dict[int, List[Dict[str, Any]]] = {}
+        self.ui_reactions = LRUCache(int(S("REACTION_CACHE_SIZE", 20000)))
         # NEW: track DM history loading states to avoid duplicate fetches
         self._dm_history_loading: set[str] = set()
         # NEW: global de-duplication for all messages we accept into ui_messages
-        self._seen_ids: set[int] = set()
+        self._seen_ids = SeenIds(int(S("SEEN_IDS_SIZE", 50000)))
+        # ui_messages lists are time-ordered windows; the thread on screen keeps a larger one
+        self._active_thread: Optional[str] = None
+        # Local copy of shown messages: startup renders from it, Discord only sends deltas
+        self.store = MessageStore(os.path.join(os.path.dirname(__file__), "message_cache.sqlite"))
+        self._cached_names: Dict[str, str] = {}  # thread id -> last known channel/DM name
+
+    # ----- local message cache -----
+    def _ui_row(self, ui: UiMessage) -> Dict[str, Any]:
+        return {"id": ui.id, "author": ui.author, "content": ui.content, "ts": ui.ts,
+                "from_me": ui.from_me, "attachments": ui.attachments or [],
+                "reactions": self.ui_reactions.get(ui.id) or []}
+
+    def _cache_messages(self, thread_id: str, uis: List[UiMessage]):
+        try:
+            self.store.save(thread_id, [self._ui_row(ui) for ui in uis])
+        except Exception:
+            pass
+
+    def _accept_cached_rows(self, thread_id: str, rows: List[Dict[str, Any]]) -> int:
+        """Add stored rows to ui_messages (skipping ones already shown). Returns how many were added."""
+        lst = self.ui_messages.setdefault(thread_id, [])
+        added = 0
+        for row in rows:
+            if row["id"] in self._seen_ids:
+                continue
+            lst.append(UiMessage(
+                id=row["id"],
+                author=row["author"],
+                content=row["content"],
+                ts=row["ts"],
+                from_me=row["from_me"],
+                attachments=row["attachments"],
+            ))
+            self._seen_ids.add(row["id"])
+            self.ui_reactions[row["id"]] = row["reactions"]
+            added += 1
+        if added:
+            lst.sort(key=lambda m: m.ts)
+            self._trim_thread(thread_id)
+        return added
+
+    # ----- bounded per-thread windows -----
+    def _insert_ui(self, thread_id: str, ui: UiMessage):
+        """Add a message to its thread, keeping the list time-ordered (no re-sort)."""
+        lst = self.ui_messages.setdefault(thread_id, [])
+        if lst and lst[-1].ts > ui.ts:
+            lst.insert(bisect.bisect_right([m.ts for m in lst], ui.ts), ui)
+        else:
+            lst.append(ui)
+
+    def _trim_thread(self, thread_id: str):
+        """Drop a thread's oldest messages beyond its window. They stay in the store and page back in on scroll."""
+        lst = self.ui_messages.get(thread_id)
+        if not lst:
+            return
+        key = "ACTIVE_THREAD_WINDOW" if thread_id == self._active_thread else "THREAD_WINDOW"
+        excess = len(lst) - int(S(key, 1000 if thread_id == self._active_thread else 100))
+        if excess <= 0:
+            return
+        evicted = lst[:excess]
+        del lst[:excess]
+        for ui in evicted:
+            self.ui_reactions.pop(ui.id, None)
+            # Forget it so ensure_dm_history can bring it back from disk
+            self._seen_ids.discard(ui.id)
+        # The UI drops them from its unread bookkeeping too
+        self.messages_evicted.emit(thread_id, [ui.id for ui in evicted])
+
+    def set_active_thread(self, thread_id: str):
+        """The UI switched threads: shrink the one we left back to the idle window."""
+        prev, self._active_thread = self._active_thread, thread_id
+        if not prev or prev == thread_id:
+            return
+        # Trim on the loop thread, where the lists are appended to
+        if self.loop and self.loop.is_running():
+            try:
+                self.loop.call_soon_threadsafe(self._trim_thread, prev)
+                return
+            except Exception:
+                pass
+        self._trim_thread(prev)
+
+    def _drop_cached_thread(self, thread_id: str):
+        """Forget a thread's stored and in-memory messages (the store can't be joined to what's new)."""
+        self.store.clear_thread(thread_id)
+        lst = self.ui_messages.get(thread_id) or []
+        dropped = [ui.id for ui in lst]
+        del lst[:]
+        for msg_id in dropped:
+            self.ui_reactions.pop(msg_id, None)
+            self._seen_ids.discard(msg_id)
+        if dropped:
+            self.messages_evicted.emit(thread_id, dropped)
+
+    async def _fetch_delta(self, chan, thread_id: str, limit: int, delta_limit: int) -> List[discord.Message]:
+        """
+        Messages newer than the newest stored one (or the latest `limit` if
+        nothing is stored), oldest first.
+        """
+        last_id = self.store.last_id(thread_id)
+        if not last_id:
+            msgs = [m async for m in chan.history(limit=limit, oldest_first=False)]
+            msgs.reverse()
+            return msgs
+        # Only what arrived since the newest stored message
+        delta_limit = max(limit, delta_limit)
+        msgs = [m async for m in chan.history(limit=delta_limit, after=discord.Object(id=last_id), oldest_first=False)]
+        msgs.reverse()
+        if len(msgs) >= delta_limit:
+            # More arrived while we were away than one delta holds, so there is a
+            # hole between the stored copy and these. Start the thread over from
+            # the newest messages; older history pages in from Discord again.
+            print(f"[Cache] {thread_id}: {delta_limit}+ new messages since last run; dropping the stored copy")
+            self._drop_cached_thread(thread_id)
+        return msgs
+
+    def load_cached(self, limit: int = 50) -> int:
+        """Fill ui_messages from the local store. Call from the UI thread before start()."""
+        total = 0
+        self._cached_names = self.store.thread_names()
+        self._load_dm_index()
+        for tid in self.store.threads():
+            total += self._accept_cached_rows(tid, self.store.latest(tid, limit))
+            if tid.startswith("dm:"):
+                uid_str = tid.split(":", 1)[1]
+                if uid_str not in self.dm_threads:
+                    # Stub until Discord connects (same shape as the dm_index stubs)
+                    class _Stub: pass
+                    s = _Stub(); s.name = self._cached_names.get(tid) or self._dm_index.get(uid_str) or "user"
+                    s.id = int(uid_str) if uid_str.isdigit() else 0
+                    self.dm_threads[uid_str] = s  # type: ignore
+        if total:
+            print(f"[Cache] Loaded {total} messages from disk")
+        return total
+
+    def cached_thread_name(self, thread_id: str) -> Optional[str]:
+        return self._cached_names.get(thread_id)
+
+    async def _dm_channel(self, uid: int):
+        """DM channel with a user, using the client cache before the API."""
+        user = self.client.get_user(uid) or await self.client.fetch_user(uid)
+        chan = getattr(user, "dm_channel", None) or await user.create_dm()
+        return user, chan
 
     # ----- public calls from UI thread -----
     def start(self):
@@ -353,7 +529,7 @@ class DiscordBridge(QtCore.QObject):
 
             # NEW: warm-load ALL channels from channel_ids
             if guild:
-                for chan_id in self.channel_ids:
+                async def _warm_channel(chan_id):
                     ch = guild.get_channel(chan_id)
                     if isinstance(ch, discord.TextChannel):
                         # Store in channels dict
@@ -370,33 +546,36 @@ class DiscordBridge(QtCore.QObject):
                             limit = int(S("CHANNEL_INITIAL_LIMIT", 25))
                         except Exception:
                             limit = 25
-                        self.ui_messages[tid] = []
+                        self.ui_messages.setdefault(tid, [])
+                        self._cached_names[tid] = ch.name
+                        self.store.set_thread_name(tid, ch.name)
                         try:
-                            msgs = [m async for m in ch.history(limit=limit, oldest_first=False)]
-                            msgs.reverse()
+                            msgs = await self._fetch_delta(ch, tid, limit, int(S("CHANNEL_DELTA_LIMIT", 100)))
                         except Exception:
                             msgs = []
+                        fresh = []
+                        msgs = [m for m in msgs if m.id not in self._seen_ids]
+                        names = await self._author_names(msgs, tid)
                         for m in msgs:
                             if m.id in self._seen_ids:
                                 continue
-                            try:
-                                author_name = await self._author_display_async(m, tid)
-                            except Exception:
-                                author_name = getattr(getattr(m, "author", None), "name", "user")
                             ui = UiMessage(
                                 id=m.id,
-                                author=author_name,
+                                author=names[m.id],
                                 content=self._format_message_content(m),
                                 ts=m.created_at.timestamp(),
                                 from_me=bool(self.client.user and m.author.id == self.client.user.id),
                                 attachments=self._extract_attachments(m),
                             )
-                            self.ui_messages[tid].append(ui)
+                            self._insert_ui(tid, ui)
                             self._seen_ids.add(m.id)
                             try:
                                 self.ui_reactions[m.id] = self._build_ui_reactions(m)
                             except Exception:
                                 self.ui_reactions[m.id] = []
+                            fresh.append(ui)
+                        self._cache_messages(tid, fresh)
+                        self._trim_thread(tid)
                         try:
                             self.channel_ready.emit(ch)
                         except Exception:
@@ -404,6 +583,9 @@ class DiscordBridge(QtCore.QObject):
                     else:
                         self.status.emit(f"Channel {chan_id} not found or invalid")
 
+                # Channels warm concurrently; each resolves its authors as one batch
+                await asyncio.gather(*(_warm_channel(c) for c in self.channel_ids), return_exceptions=True)
+
             # DM bridge warm load -> index only (small window), no UI message creation
             bridge = None
             try:
@@ -427,6 +609,7 @@ class DiscordBridge(QtCore.QObject):
 
             # Existing open DM channels: index only, no history yet (fast warm-load)
             try:
+                dm_uids = []
                 for dm in list(getattr(self.client, "private_channels", []) or []):
                     try:
                         if isinstance(dm, discord.DMChannel):
@@ -434,15 +617,11 @@ class DiscordBridge(QtCore.QObject):
                             if not u:
                                 continue
                             self.dm_threads[str(u.id)] = u
-                            # NEW: resolve and cache server nickname for list label
-                            try:
-                                disp = await self._resolve_member_display(int(u.id))
-                                if disp:
-                                    self._name_cache[int(u.id)] = disp
-                            except Exception:
-                                pass
+                            dm_uids.append(int(u.id))
                     except Exception:
                         pass
+                # NEW: resolve and cache server nicknames for list labels (one batch)
+                await self._resolve_member_displays(dm_uids)
                 self.dm_threads_changed.emit()
             except Exception:
                 pass
@@ -450,6 +629,7 @@ class DiscordBridge(QtCore.QObject):
             # Persisted DM index (stubs only; resolve nickname now for first render)
             try:
                 self._load_dm_index()
+                index_uids = []
                 for uid_str, disp in list(self._dm_index.items()):
                     try:
                         uid = int(uid_str)
@@ -460,13 +640,9 @@ class DiscordBridge(QtCore.QObject):
                         class _Stub: pass
                         s = _Stub(); s.name = disp; s.id = uid
                         self.dm_threads[str(uid)] = s  # type: ignore
-                    # NEW: resolve and cache nickname so list shows it immediately
-                    try:
-                        name = await self._resolve_member_display(uid)
-                        if name:
-                            self._name_cache[uid] = name
-                    except Exception:
-                        pass
+                    index_uids.append(uid)
+                # NEW: resolve and cache nicknames so list shows them immediately
+                await self._resolve_member_displays(index_uids)
                 self.dm_threads_changed.emit()
             except Exception:
                 pass
@@ -474,6 +650,7 @@ class DiscordBridge(QtCore.QObject):
             # Also discover DMs from cached messages (index only)
             try:
                 cached = list(getattr(self.client, "cached_messages", []) or [])
+                cached_uids = []
                 for m in cached:
                     try:
                         if isinstance(getattr(m, "channel", None), discord.DMChannel):
@@ -488,15 +665,11 @@ class DiscordBridge(QtCore.QObject):
                             if not uid:
                                 continue
                             self.dm_threads[str(uid)] = other
-                            # NEW: resolve and cache nickname for first list render
-                            try:
-                                disp = await self._resolve_member_display(uid)
-                                if disp:
-                                    self._name_cache[uid] = disp
-                            except Exception:
-                                pass
+                            cached_uids.append(uid)
                     except Exception:
                         pass
+                # NEW: resolve and cache nicknames for first list render
+                await self._resolve_member_displays(cached_uids)
                 self.dm_threads_changed.emit()
             except Exception:
                 pass
@@ -560,6 +733,35 @@ class DiscordBridge(QtCore.QObject):
                     pass
                 return
 
+        @self.client.event
+        async def on_message_edit(_before: discord.Message, after: discord.Message):
+            # Messages in the client's cache: discord.py hands over the updated copy
+            if after.id in self._seen_ids:
+                self._apply_message_edit(after)
+
+        @self.client.event
+        async def on_raw_message_edit(payload: discord.RawMessageUpdateEvent):
+            # Link-embed unfurls send an update for nearly every message with a URL,
+            # so ignore anything we don't show; cached ones go to on_message_edit
+            if payload.cached_message is not None or payload.message_id not in self._seen_ids:
+                return
+            try:
+                m = self._message_from_edit(payload)
+                if m is None:
+                    ch = self.client.get_channel(payload.channel_id) or await self.client.fetch_channel(payload.channel_id)
+                    m = await ch.fetch_message(payload.message_id)
+                self._apply_message_edit(m)
+            except Exception:
+                pass
+
+        @self.client.event
+        async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
+            self._remove_messages({payload.message_id})
+
+        @self.client.event
+        async def on_raw_bulk_message_delete(payload: discord.RawBulkMessageDeleteEvent):
+            self._remove_messages(set(payload.message_ids))
+
         @self.client.event
         async def on_reaction_add(reaction, user):
             await self._handle_reaction_change(reaction.message, added=True, reactor=user)
@@ -591,27 +793,26 @@ class DiscordBridge(QtCore.QObject):
     async def _fetch_recent_dm(self, uid: int, recent: int = 75):
         """Fetch only the most recent N messages for a DM (fast path, no TTS/unread spam)."""
         try:
-            user = await self.client.fetch_user(uid)
-            await user.create_dm()
-            chan = user.dm_channel
+            user, chan = await self._dm_channel(uid)
             if not chan:
                 return
             tid = f"dm:{uid}"
             self.ui_messages.setdefault(tid, [])
+            name = getattr(user, "global_name", None) or getattr(user, "name", None)
+            if name and self._cached_names.get(tid) != name:
+                self._cached_names[tid] = name
+                self.store.set_thread_name(tid, name)
+            msgs = await self._fetch_delta(chan, tid, recent, int(S("DM_DELTA_LIMIT", 100)))
+            # (after the fetch: a gap reset empties the thread)
             have = {m.id for m in self.ui_messages[tid]}
-            # newest first, then reverse for chronological append
-            msgs = [m async for m in chan.history(limit=recent, oldest_first=False)]
-            msgs.reverse()
+            # Skip duplicates across all sources
+            msgs = [msg for msg in msgs if msg.id not in self._seen_ids and msg.id not in have]
+            names = await self._author_names(msgs, tid)
+            fresh = []
             for msg in msgs:
-                # Skip duplicates across all sources
                 if msg.id in self._seen_ids:
                     continue
-                if msg.id in have:
-                    continue
-                try:
-                    author_name = await self._author_display_async(msg, tid)
-                except Exception:
-                    author_name = getattr(getattr(msg, "author", None), "name", "user")
+                author_name = names[msg.id]
                 atts = self._extract_attachments(msg)
                 ui = UiMessage(
                     id=msg.id,
@@ -621,7 +822,7 @@ class DiscordBridge(QtCore.QObject):
                     from_me=bool(self.client.user and msg.author.id == self.client.user.id),
                     attachments=atts,
                 )
-                self.ui_messages[tid].append(ui)
+                self._insert_ui(tid, ui)
                 # Mark as seen globally
                 self._seen_ids.add(msg.id)
                 # NEW: capture reactions so they render after restart
@@ -629,8 +830,9 @@ class DiscordBridge(QtCore.QObject):
                     self.ui_reactions[msg.id] = self._build_ui_reactions(msg)
                 except Exception:
                     self.ui_reactions[msg.id] = []
-            # keep chronological just in case
-            self.ui_messages[tid].sort(key=lambda m: m.ts)
+                fresh.append(ui)
+            self._cache_messages(tid, fresh)
+            self._trim_thread(tid)
             # NEW: notify UI so it can recompute unread and refresh the list
             try:
                 self.history_extended.emit(tid)
@@ -705,6 +907,7 @@ class DiscordBridge(QtCore.QObject):
                 except Exception:
                     pass
                 self.ui_reactions[msg.id] = self._build_ui_reactions(msg)
+                self.store.update_reactions(msg.id, self.ui_reactions[msg.id])
                 tid = self._thread_id_for_message(msg) or thread_id
                 self.reactions_updated.emit(tid, msg.id)
             except Exception:
@@ -731,29 +934,35 @@ class DiscordBridge(QtCore.QObject):
 
         async def _load():
             try:
-                user = await self.client.fetch_user(uid)
-                await user.create_dm()
-                chan = user.dm_channel
-                if not chan:
+                have_ids = {m.id for m in self.ui_messages.get(thread_id, [])}
+                need = max(0, desired - len(have_ids))
+                if need <= 0:
                     return
 
+                # Older messages we already stored come from disk
+                rows = self.store.latest(thread_id, need, before_id=min(have_ids) if have_ids else None)
+                need -= self._accept_cached_rows(thread_id, rows)
                 have_ids = {m.id for m in self.ui_messages.get(thread_id, [])}
-                need = max(0, desired - len(have_ids))
                 if need <= 0:
                     return
 
-                # Fetch newest first, then reverse so we append in chronological order
-                msgs = [m async for m in chan.history(limit=need, oldest_first=False)]
+                user, chan = await self._dm_channel(uid)
+                if not chan:
+                    return
+
+                # Fetch newest first (older than what we have), then reverse so we append in chronological order
+                before = discord.Object(id=min(have_ids)) if have_ids else None
+                msgs = [m async for m in chan.history(limit=need, before=before, oldest_first=False)]
                 msgs.reverse()
 
+                msgs = [msg for msg in msgs if msg.id not in have_ids and msg.id not in self._seen_ids]
+                names = await self._author_names(msgs, thread_id)
+                fresh = []
                 for msg in msgs:
                     # Skip if already present or globally seen
                     if msg.id in have_ids or msg.id in self._seen_ids:
                         continue
-                    try:
-                        author_name = await self._author_display_async(msg, thread_id)
-                    except Exception:
-                        author_name = getattr(getattr(msg, "author", None), "name", "user")
+                    author_name = names[msg.id]
                     ui = UiMessage(
                         id=msg.id,
                         author=author_name,
@@ -762,7 +971,7 @@ class DiscordBridge(QtCore.QObject):
                         from_me=bool(self.client.user and msg.author.id == self.client.user.id),
                         attachments=self._extract_attachments(msg),
                     )
-                    self.ui_messages.setdefault(thread_id, []).append(ui)
+                    self._insert_ui(thread_id, ui)
                     # Update local/global seen to prevent duplicates within same batch
                     have_ids.add(msg.id)
                     self._seen_ids.add(msg.id)
@@ -771,8 +980,10 @@ class DiscordBridge(QtCore.QObject):
                         self.ui_reactions[msg.id] = self._build_ui_reactions(msg)
                     except Exception:
                         self.ui_reactions[msg.id] = []
+                    fresh.append(ui)
 
-                self.ui_messages[thread_id].sort(key=lambda m: m.ts)
+                self._cache_messages(thread_id, fresh)
+                self._trim_thread(thread_id)
             except Exception:
                 pass
             finally:
@@ -1041,6 +1252,23 @@ class DiscordBridge(QtCore.QObject):
         # Fallbacks for DMs or when no nickname is available
         return getattr(a, "global_name", None) or getattr(a, "name", "user")
 
+    def _guild(self) -> Optional[discord.Guild]:
+        return self.guild or (self.main_channel.guild if self.main_channel else None)
+
+    def _author_display_resolved(self, m: discord.Message, thread_id: str) -> str:
+        """Author name from what MemberResolver already knows (no network)."""
+        a = getattr(m, "author", None)
+        if not a:
+            return "user"
+        # Server nickname (Member.display_name) first
+        name = self.members.member_name(a.id)
+        if name:
+            return name
+        # DM thread: use a name resolved earlier (e.g. for the thread list)
+        if thread_id.startswith("dm:") and a.id in self._name_cache:
+            return self._name_cache[a.id]
+        return getattr(a, "global_name", None) or getattr(a, "name", "user")
+
     async def _author_display_async(self, m: discord.Message, thread_id: str) -> str:
         """
         Resolve a display name prioritizing server nickname (Member.display_name).
@@ -1050,34 +1278,28 @@ class DiscordBridge(QtCore.QObject):
             a = getattr(m, "author", None)
             if not a:
                 return "user"
-            # Main guild context
-            g = self.guild or (self.main_channel.guild if self.main_channel else None)
-            if g:
-                mem = g.get_member(a.id)
-                if not mem:
-                    try:
-                        mem = await g.fetch_member(a.id)
-                    except Exception:
-                        mem = None
-                if mem and getattr(mem, "display_name", None):
-                    self._name_cache[a.id] = mem.display_name
-                    return mem.display_name
-            # DM thread: attempt guild nickname via cache if already resolved
-            if thread_id.startswith("dm:"):
-                if a.id in self._name_cache:
-                    return self._name_cache[a.id]
-                if g:
-                    mem = g.get_member(a.id)
-                    if mem and getattr(mem, "display_name", None):
-                        self._name_cache[a.id] = mem.display_name
-                        return mem.display_name
-            return getattr(a, "global_name", None) or getattr(a, "name", "user")
+            await self.members.resolve(self._guild(), [a.id])
+            return self._author_display_resolved(m, thread_id)
         except Exception:
             try:
                 return m.author.name
             except Exception:
                 return "user"
 
+    async def _author_names(self, msgs: List[discord.Message], thread_id: str) -> Dict[int, str]:
+        """Display names for a batch of messages (message id -> name); distinct authors resolve together."""
+        try:
+            await self.members.resolve(self._guild(), {m.author.id for m in msgs if getattr(m, "author", None)})
+        except Exception:
+            pass
+        names: Dict[int, str] = {}
+        for m in msgs:
+            try:
+                names[m.id] = self._author_display_resolved(m, thread_id)
+            except Exception:
+                names[m.id] = getattr(getattr(m, "author", None), "name", "user")
+        return names
+
     async def _resolve_member_display(self, uid: int) -> Optional[str]:
         """
         Resolve a user's display name, preferring the guild nickname (Member.display_name),
@@ -1086,32 +1308,19 @@ class DiscordBridge(QtCore.QObject):
         try:
             if uid in self._name_cache:
                 return self._name_cache[uid]
-            g = self.guild or (self.main_channel.guild if self.main_channel else None)
-            if g:
-                mem = g.get_member(uid)
-                if not mem:
-                    try:
-                        mem = await g.fetch_member(uid)
-                    except Exception:
-                        mem = None
-                if mem and getattr(mem, "display_name", None):
-                    self._name_cache[uid] = mem.display_name
-                    return mem.display_name
-            # Fallback to user profile
-            u = self.client.get_user(uid)
-            if not u:
-                try:
-                    u = await self.client.fetch_user(uid)
-                except Exception:
-                    u = None
-            if u:
-                name = getattr(u, "global_name", None) or getattr(u, "name", None)
-                if name:
-                    self._name_cache[uid] = name
-                    return name
+            await self._resolve_member_displays([uid])
+        except Exception:
+            pass
+        return self._name_cache.get(uid)
+
+    async def _resolve_member_displays(self, uids: List[int]):
+        """Batch form of _resolve_member_display: guild members together, then user profiles."""
+        try:
+            uids = [uid for uid in uids if uid not in self._name_cache]
+            await self.members.resolve(self._guild(), uids)
+            await self.members.resolve_users(self.client, uids)
         except Exception:
             pass
-        return None
 
     def display_for_user_id(self, uid: int, fallback: str = "user") -> str:
         # Sync helper for UI lists/headers
@@ -1146,7 +1355,7 @@ class DiscordBridge(QtCore.QObject):
             from_me=from_me,
             attachments=atts,
         )
-        self.ui_messages.setdefault(thread_id, []).append(ui)
+        self._insert_ui(thread_id, ui)
         # Mark as seen globally
         try:
             self._seen_ids.add(m.id)
@@ -1156,6 +1365,8 @@ class DiscordBridge(QtCore.QObject):
             self.ui_reactions[m.id] = self._build_ui_reactions(m)
         except Exception:
             self.ui_reactions[m.id] = []
+        self._cache_messages(thread_id, [ui])
+        self._trim_thread(thread_id)
         self.message_added.emit(thread_id, ui)
 
     def _push_ui_message_with_author(self, thread_id: str, m: discord.Message, author_name: str):
@@ -1187,7 +1398,7 @@ class DiscordBridge(QtCore.QObject):
             from_me=from_me,
             attachments=atts,
         )
-        self.ui_messages.setdefault(thread_id, []).append(ui)
+        self._insert_ui(thread_id, ui)
         # Mark as seen globally
         try:
             self._seen_ids.add(m.id)
@@ -1197,6 +1408,8 @@ class DiscordBridge(QtCore.QObject):
             self.ui_reactions[m.id] = self._build_ui_reactions(m)
         except Exception:
             self.ui_reactions[m.id] = []
+        self._cache_messages(thread_id, [ui])
+        self._trim_thread(thread_id)
         self.message_added.emit(thread_id, ui)
 
     async def _mirror_outgoing_dm(self, recipient: discord.User, content: str):
@@ -1455,6 +1668,50 @@ class DiscordBridge(QtCore.QObject):
             pass
         return out
 
+    def _remove_messages(self, msg_ids: set):
+        """Drop messages deleted on Discord from the store and ui_messages, then tell the UI."""
+        if not msg_ids:
+            return
+        self.store.delete(msg_ids)
+        for tid, msgs in self.ui_messages.items():
+            gone = [mm.id for mm in msgs if mm.id in msg_ids]
+            if not gone:
+                continue
+            msgs[:] = [mm for mm in msgs if mm.id not in msg_ids]
+            for msg_id in gone:
+                self.ui_reactions.pop(msg_id, None)
+            self.messages_deleted.emit(tid, gone)
+
+    def _message_from_edit(self, payload: discord.RawMessageUpdateEvent) -> Optional[discord.Message]:
+        """The edited message built from the gateway event itself, or None if it is too partial."""
+        m = getattr(payload, "message", None)  # newer discord.py builds it already
+        if m is not None:
+            return m
+        data = payload.data or {}
+        if "content" not in data or "author" not in data:
+            return None
+        ch = self.client.get_channel(payload.channel_id)
+        if ch is None:
+            return None
+        try:
+            return discord.Message(state=self.client._connection, channel=ch, data=data)
+        except Exception:
+            return None
+
+    def _apply_message_edit(self, m: discord.Message):
+        """Update a message we already show after it was edited, then tell the UI."""
+        for tid, msgs in self.ui_messages.items():
+            ui = next((mm for mm in msgs if mm.id == m.id), None)
+            if ui is None:
+                continue
+            ui.content = self._format_message_content(m)
+            ui.attachments = self._extract_attachments(m)
+            # Reaction chips are left alone: edit events may omit reactions,
+            # and the reaction handlers keep them current
+            self._cache_messages(tid, [ui])
+            self.message_edited.emit(tid, m.id)
+            return
+
     def _thread_id_for_message(self, m: discord.Message) -> Optional[str]:
         try:
             if self.main_channel and getattr(m.channel, "id", None) == self.main_channel.id:
@@ -1491,6 +1748,7 @@ class DiscordBridge(QtCore.QObject):
             except Exception:
                 full = m
             self.ui_reactions[m.id] = self._build_ui_reactions(full)
+            self.store.update_reactions(m.id, self.ui_reactions[m.id])
             # notify UI
             self.reactions_updated.emit(tid, m.id)
             # TTS only on add, and only if we have this message in UI
@@ -1696,8 +1954,11 @@ class BenDiscordUI(QtWidgets.QMainWindow):
         
         # Initialize missing attributes before using them
         self.block_msg_ids = []
+        self._msg_block_ranges: Dict[int, Tuple[int, int]] = {}  # message id -> (first block number, block count)
         self.unread_ids = set()
-        self.read_ids = set()
+        # Incremental unread bookkeeping so the thread list never rescans messages
+        self._unread_by_thread: Dict[str, int] = {}   # thread id -> unread count
+        self._unread_thread_of: Dict[int, str] = {}   # unread message id -> thread id
         
         # Initialize state tracking
         self._react_tap_armed = False
@@ -1742,11 +2003,10 @@ class BenDiscordUI(QtWidgets.QMainWindow):
         self._enter_hold_arm.setInterval(self.ENTER_HOLD_MS)
         self._enter_hold_arm.timeout.connect(self._arm_enter_hold)
 
-        # Persistent read memory
-        self._read_state_path = os.path.join(os.path.dirname(__file__), "read_state.json")
-        # NEW: persisted last seen timestamp (epoch seconds)
-        self._last_seen_ts = 0.0
-        self._load_read_state()
+        # Persistent read memory (high-water mark + recent read ids, saved in the background)
+        self._read_state = ReadState(os.path.join(os.path.dirname(__file__), "read_state.json"))
+        # Persisted last seen timestamp (epoch seconds) from the previous session
+        self._last_seen_ts = self._read_state.last_seen_ts
 
         # Suppress DM TTS until warm load completes
         self._suppress_incoming_dm_tts = True
@@ -1770,7 +2030,8 @@ class BenDiscordUI(QtWidgets.QMainWindow):
         # Initialize overlays after message view is created
         self._setup_overlays()
 
-        # Create TTS worker
+        # Create TTS worker (speaks through the shared daemon when it's running)
+        ensure_daemon()
         self._tts_thread = QtCore.QThread(self)
         self._tts_worker = TTSWorker()
         self._tts_worker.moveToThread(self._tts_thread)
@@ -1796,8 +2057,18 @@ class BenDiscordUI(QtWidgets.QMainWindow):
         self.bridge.status.connect(self._on_status)
         self.bridge.warm_complete.connect(self._on_warm_complete)
         self.bridge.reactions_updated.connect(self._on_reactions_updated)
+        self.bridge.message_edited.connect(self._on_message_edited)
         self.bridge.reaction_tts.connect(lambda txt: self._speak(txt))
         self.bridge.history_extended.connect(self._on_history_extended)
+        self.bridge.messages_evicted.connect(self._on_messages_evicted)
+        self.bridge.messages_deleted.connect(self._on_messages_deleted)
+
+        # Show what's stored on disk right away; Discord only fills in what's new
+        try:
+            if self.bridge.load_cached(int(S("CACHE_INITIAL_LIMIT", 50))):
+                self._render_thread(self.current_thread_id)
+        except Exception as e:
+            print(f"[Cache] Could not load cached messages: {e}")
 
         # initial fill without auto-selection
         self._refresh_threads()
@@ -3446,37 +3717,33 @@ class BenDiscordUI(QtWidgets.QMainWindow):
         except Exception:
             pass
 
-    def _load_read_state(self):
-        try:
-            with open(self._read_state_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            ids = data.get("read_ids", [])
-            self.read_ids = {int(i) for i in ids if isinstance(i, (int, str))}
-            # NEW: load last seen timestamp (default 0.0 for first run)
-            try:
-                self._last_seen_ts = float(data.get("last_seen_ts", 0.0) or 0.0)
-            except Exception:
-                self._last_seen_ts = 0.0
-        except Exception:
-            self.read_ids = set()
-            # keep default last_seen_ts=0.0
-
-    def _save_read_state(self):
-        try:
-            tmp = self._read_state_path + ".tmp"
-            with open(tmp, "w", encoding="utf-8") as f:
-                # NEW: persist last_seen_ts alongside read_ids
-                json.dump({"read_ids": sorted(self.read_ids), "last_seen_ts": self._last_seen_ts}, f)
-            os.replace(tmp, self._read_state_path)
-        except Exception:
-            pass
+    def _add_unread(self, tid: str, ui) -> bool:
+        """Count ui as unread in tid. Returns True if it wasn't already."""
+        if ui.from_me or ui.id in self.unread_ids:
+            return False
+        self.unread_ids.add(ui.id)
+        self._unread_thread_of[ui.id] = tid
+        self._unread_by_thread[tid] = self._unread_by_thread.get(tid, 0) + 1
+        return True
+
+    def _clear_unread(self, msg_id: int) -> Optional[str]:
+        """Drop msg_id from the unread counts. Returns its thread id if that thread has no unreads left."""
+        if msg_id not in self.unread_ids:
+            return None
+        self.unread_ids.discard(msg_id)
+        tid = self._unread_thread_of.pop(msg_id, None)
+        if tid is None:
+            return None
+        left = max(0, self._unread_by_thread.get(tid, 0) - 1)
+        self._unread_by_thread[tid] = left
+        return tid if left == 0 else None
 
     def _mark_read(self, msg_id: int):
-        if msg_id not in self.read_ids:
-            self.read_ids.add(msg_id)
-            self.unread_ids.discard(msg_id)
-            self._save_read_state()
-            self._refresh_threads()
+        if self._read_state.mark_read(msg_id):
+            emptied = self._clear_unread(msg_id)
+            # The list only changes when a thread stops being unread
+            if emptied:
+                self._refresh_threads()
 
     def _on_channel_ready(self, ch):
         self._refresh_threads()
@@ -3506,29 +3773,35 @@ class BenDiscordUI(QtWidgets.QMainWindow):
             pass
 
     # NEW: compute unread for messages received while app was not running
-    def _label_offline_unreads(self):
+    def _label_offline_unreads(self, tid: Optional[str] = None):
+        """Mark messages newer than last session as unread (all threads, or just tid)."""
         try:
             if self._last_seen_ts <= 0:
                 # First run or no prior session recorded; don't mark everything unread
                 return
-            for tid, msgs in (self.bridge.ui_messages or {}).items():
+            threads = self.bridge.ui_messages or {}
+            items = [(tid, threads.get(tid, []))] if tid else list(threads.items())
+            changed = set()
+            for t, msgs in items:
                 for ui in msgs:
-                    if (not ui.from_me) and (ui.id not in self.read_ids) and (ui.ts > self._last_seen_ts):
-                        self.unread_ids.add(ui.id)
+                    if (ui.ts > self._last_seen_ts) and (not self._read_state.is_read(ui.id)) and self._add_unread(t, ui):
+                        changed.add(t)
+            if not changed:
+                return
             # Refresh list and current thread to apply green coloring
             self._refresh_threads()
-            try:
-                self._render_thread(self.current_thread_id)
-            except Exception:
-                pass
+            if self.current_thread_id in changed:
+                try:
+                    self._render_thread(self.current_thread_id)
+                except Exception:
+                    pass
         except Exception:
             pass
 
     def closeEvent(self, e):
         # NEW: record last seen time for next session before shutting down
         try:
-            self._last_seen_ts = time.time()
-            self._save_read_state()
+            self._read_state.close(time.time())
         except Exception:
             pass
         try:
@@ -3648,6 +3921,67 @@ class BenDiscordUI(QtWidgets.QMainWindow):
             return url
         return None
 
+    def _message_inner_html(self, ui) -> str:
+        """Contents of a message block (header, body, attachments, reaction chips)."""
+        # NEW: Attachments (Images & Videos)
+        attachments_html = ""
+        
+        # Check for embedded YouTube link in content
+        yt_url = self._extract_youtube_url(ui.content)
+        if yt_url:
+            attachments_html += (
+                "&nbsp;<span style='display:inline-block; vertical-align:middle; margin-left:8px; padding:4px 16px; "
+                "background:#202225; border-radius:10px; border:2px solid #FF0000; color:#FF0000; "
+                "font-size:32px; font-weight:bold;'>🎥 YOUTUBE</span>"
+            )
+
+        if ui.attachments:
+            for att in ui.attachments:
+                if att.get("type") == "image":
+                    # Placeholder for image (inline)
+                    attachments_html += (
+                        "&nbsp;<span style='display:inline-block; vertical-align:middle; margin-left:8px; padding:4px 16px; "
+                        "background:#202225; border-radius:10px; border:2px solid #79c0ff; color:#79c0ff; "
+                        "font-size:32px; font-weight:bold;'>📷 IMAGE</span>"
+                    )
+                elif att.get("type") == "video":
+                    # Placeholder for video (inline)
+                    attachments_html += (
+                        "&nbsp;<span style='display:inline-block; vertical-align:middle; margin-left:8px; padding:4px 16px; "
+                        "background:#202225; border-radius:10px; border:2px solid #FFD64D; color:#FFD64D; "
+                        "font-size:32px; font-weight:bold;'>🎥 VIDEO</span>"
+                    )
+
+        esc_author = (ui.author or "").replace("<","&lt;").replace(">","&gt;")
+        body_raw = (ui.content or "")
+        esc_body = body_raw.replace("<","&lt;").replace(">","&gt;")
+        # Linkify URLs
+        esc_body = re.sub(r'(https?://[^\s]+)', r'<a href="\1" style="color:#79c0ff; text-decoration:underline;">\1</a>', esc_body)
+        esc_body = esc_body.replace("\n","<br>")
+        
+        # If empty body but has attachments, don't show [no text], just show attachments
+        if not esc_body.strip():
+            if attachments_html:
+                esc_body = ""
+            else:
+                esc_body = "[no text]"
+        
+        tm = self._fmt_12h(ui.ts)
+
+        # unread green, read white
+        is_unread = ui.id in self.unread_ids
+        text_color = "#00ff1a" if is_unread else "#e9eef5"
+
+        # Inline reactions under the message (same paragraph/block)
+        reactions_html = self._reaction_badges_html(ui.id)
+
+        return (
+            f"<span style='font-weight:800; color:#e9eef5;'>{esc_author}</span> "
+            f"<span style='color:#cfd7e3; font-weight:600;'>({tm})</span>"
+            f"<br><span style='color:{text_color};'>{esc_body}{attachments_html}</span>"
+            f"{reactions_html}"
+        )
+
     def _append_message(self, ui):
         """Append one message as a single large block; unread text in green.""" 
         # Prevent duplicate rendering of the same message in the current view
@@ -3657,69 +3991,21 @@ class BenDiscordUI(QtWidgets.QMainWindow):
         except Exception:
             pass
         try:
-            # NEW: Attachments (Images & Videos)
-            attachments_html = ""
-            
-            # Check for embedded YouTube link in content
-            yt_url = self._extract_youtube_url(ui.content)
-            if yt_url:
-                attachments_html += (
-                    "&nbsp;<span style='display:inline-block; vertical-align:middle; margin-left:8px; padding:4px 16px; "
-                    "background:#202225; border-radius:10px; border:2px solid #FF0000; color:#FF0000; "
-                    "font-size:32px; font-weight:bold;'>🎥 YOUTUBE</span>"
-                )
-
-            if ui.attachments:
-                for att in ui.attachments:
-                    if att.get("type") == "image":
-                        # Placeholder for image (inline)
-                        attachments_html += (
-                            "&nbsp;<span style='display:inline-block; vertical-align:middle; margin-left:8px; padding:4px 16px; "
-                            "background:#202225; border-radius:10px; border:2px solid #79c0ff; color:#79c0ff; "
-                            "font-size:32px; font-weight:bold;'>📷 IMAGE</span>"
-                        )
-                    elif att.get("type") == "video":
-                        # Placeholder for video (inline)
-                        attachments_html += (
-                            "&nbsp;<span style='display:inline-block; vertical-align:middle; margin-left:8px; padding:4px 16px; "
-                            "background:#202225; border-radius:10px; border:2px solid #FFD64D; color:#FFD64D; "
-                            "font-size:32px; font-weight:bold;'>🎥 VIDEO</span>"
-                        )
-
-            esc_author = (ui.author or "").replace("<","&lt;").replace(">","&gt;")
-            body_raw = (ui.content or "")
-            esc_body = body_raw.replace("<","&lt;").replace(">","&gt;")
-            # Linkify URLs
-            esc_body = re.sub(r'(https?://[^\s]+)', r'<a href="\1" style="color:#79c0ff; text-decoration:underline;">\1</a>', esc_body)
-            esc_body = esc_body.replace("\n","<br>")
-            
-            # If empty body but has attachments, don't show [no text], just show attachments
-            if not esc_body.strip():
-                if attachments_html:
-                    esc_body = ""
-                else:
-                    esc_body = "[no text]"
-            
-            tm = self._fmt_12h(ui.ts)
-
-            # unread green, read white
-            is_unread = ui.id in self.unread_ids
-            text_color = "#00ff1a" if is_unread else "#e9eef5"
-
-            # Inline reactions under the message (same paragraph/block)
-            reactions_html = self._reaction_badges_html(ui.id)
-
             html_block = (
                 "<p style='margin: 14px 0; padding: 22px 26px; border-radius: 14px; "
                 "background:#0f1521; font-size: 48px; line-height: 1.5;'>"
-                f"<span style='font-weight:800; color:#e9eef5;'>{esc_author}</span> "
-                f"<span style='color:#cfd7e3; font-weight:600;'>({tm})</span>"
-                f"<br><span style='color:{text_color};'>{esc_body}{attachments_html}</span>"
-                f"{reactions_html}"
+                f"{self._message_inner_html(ui)}"
                 "</p>"
             )
+            doc = self.view_msgs.document()
+            if self.block_msg_ids:
+                prev_first, prev_count = self._msg_block_ranges.get(self.block_msg_ids[-1], (doc.blockCount() - 1, 1))
+                first = prev_first + prev_count
+            else:
+                first = 0  # the first append fills the empty document's block
             self.view_msgs.append(html_block)
             self.block_msg_ids.append(ui.id)
+            self._msg_block_ranges[ui.id] = (first, max(1, doc.blockCount() - first))
 
             # keep scrolled to latest only when not actively scanning messages
             try:
@@ -3732,6 +4018,53 @@ class BenDiscordUI(QtWidgets.QMainWindow):
         except Exception:
             pass
 
+    def _patch_message_block(self, message_id) -> bool:
+        """
+        Re-render one message's block in place (reactions, edits) instead of
+        rebuilding the whole thread. Scroll position and the scan outline stay
+        put. Returns False if the caller should fall back to a full render.
+        """
+        rng = self._msg_block_ranges.get(message_id)
+        if rng is None:
+            return True  # not on screen; nothing to refresh
+        ui = next((m for m in self.bridge.ui_messages.get(self.current_thread_id, []) if m.id == message_id), None)
+        first, count = rng
+        doc = self.view_msgs.document()
+        if ui is None or count != 1:
+            return False
+        block = doc.findBlockByNumber(first)
+        if not block.isValid():
+            return False
+        try:
+            sb = self.view_msgs.verticalScrollBar()
+            at_bottom = sb.value() >= sb.maximum() - 10
+            dl = doc.documentLayout()
+            old_rect = dl.blockBoundingRect(block)
+            blocks_before = doc.blockCount()
+
+            cur = QtGui.QTextCursor(block)
+            cur.beginEditBlock()
+            cur.setPosition(block.position())
+            cur.setPosition(block.position() + block.length() - 1, QtGui.QTextCursor.KeepAnchor)
+            # Block format (padding, background) stays; only the inline content is replaced
+            cur.insertHtml(f"<span style='font-size: 48px;'>{self._message_inner_html(ui)}</span>")
+            cur.endEditBlock()
+
+            if doc.blockCount() != blocks_before:
+                return False
+            # An anchored scan block is re-pinned by _reposition_message_outline (contentsChanged).
+            # Otherwise, a block above the viewport that grew or shrank would shift what's on screen.
+            if at_bottom and self.scan_mode != "messages":
+                sb.setValue(sb.maximum())
+            elif not self._scan_anchor_active and old_rect.bottom() <= sb.value():
+                delta = dl.blockBoundingRect(doc.findBlockByNumber(first)).height() - old_rect.height()
+                sb.setValue(sb.value() + int(delta))
+            if self.scan_mode == "messages" and self._overlay_idx >= 0:
+                self._position_message_outline(self._overlay_idx)
+            return True
+        except Exception:
+            return False
+
     def _reaction_badges_html(self, message_id: int) -> str:
         """
         Build small inline chips showing reactions for a message.
@@ -3986,11 +4319,10 @@ class BenDiscordUI(QtWidgets.QMainWindow):
             else:
                 tid = f"channel:{chan_id}"
                 ch_name = f"#{ch.name}" if ch else f"Channel {chan_id}"
+            if not ch and self.bridge.cached_thread_name(tid):
+                ch_name = f"#{self.bridge.cached_thread_name(tid)}"
             
-            has_unread = any(
-                (m.id in self.unread_ids) and (not m.from_me)
-                for m in self.bridge.ui_messages.get(tid, [])
-            )
+            has_unread = self._unread_by_thread.get(tid, 0) > 0
             entries.append({
                 "tid": tid,
                 "label": ch_name,
@@ -4023,10 +4355,7 @@ class BenDiscordUI(QtWidgets.QMainWindow):
                     uid_int = None
                 base = getattr(user, "global_name", None) or getattr(user, "name", "user")
                 label = self.bridge.display_for_user_id(uid_int, base) if uid_int is not None else base
-                has_unread = any(
-                    (m.id in self.unread_ids) and (not m.from_me)
-                    for m in self.bridge.ui_messages.get(tid, [])
-                )
+                has_unread = self._unread_by_thread.get(tid, 0) > 0
                 entries.append({
                     "tid": tid,
                     "label": label,
@@ -4084,23 +4413,25 @@ class BenDiscordUI(QtWidgets.QMainWindow):
         # Clear view and block map
         self.view_msgs.clear()
         self.block_msg_ids = []
+        self._msg_block_ranges = {}
 
-        # Append existing messages in chronological order as large blocks
-        msgs_all = sorted(self.bridge.ui_messages.get(tid, []), key=lambda x: x.ts)
-        # NEW: defensively dedupe by ID before rendering
-        try:
-            uniq = []
-            _seen_local = set()
-            for _m in msgs_all:
-                if _m.id in _seen_local:
-                    continue
-                _seen_local.add(_m.id)
-                uniq.append(_m)
-            msgs_all = uniq
-        except Exception:
-            pass
+        # Remember which thread is on screen; others are trimmed to the idle window
+        self.bridge.set_active_thread(tid)
+
+        # The bridge keeps each thread time-ordered, so only the tail is needed
         limit = int(S("DM_RENDER_LIMIT" if tid.startswith("dm:") else "CHANNEL_RENDER_LIMIT", 25))
-        msgs = msgs_all[-limit:] if limit and len(msgs_all) > limit else msgs_all
+        msgs_all = list(self.bridge.ui_messages.get(tid, []))
+        # NEW: defensively dedupe by ID before rendering (newest first, until the limit)
+        msgs = []
+        _seen_local = set()
+        for _m in reversed(msgs_all):
+            if _m.id in _seen_local:
+                continue
+            _seen_local.add(_m.id)
+            msgs.append(_m)
+            if limit and len(msgs) >= limit:
+                break
+        msgs.reverse()
         for m in msgs:
             self._append_message(m)
 
@@ -4112,25 +4443,40 @@ class BenDiscordUI(QtWidgets.QMainWindow):
             pass
 
     def _on_reactions_updated(self, thread_id: str, message_id):
-        # Re-render current thread to refresh inline reaction chips
-        if thread_id == self.current_thread_id:
+        # Refresh only that message's reaction chips
+        if thread_id == self.current_thread_id and not self._patch_message_block(message_id):
             self._render_thread(self.current_thread_id)
 
+    def _on_message_edited(self, thread_id: str, message_id):
+        if thread_id == self.current_thread_id and not self._patch_message_block(message_id):
+            self._render_thread(self.current_thread_id)
+
+    def _on_messages_evicted(self, tid: str, msg_ids):
+        # The bridge dropped these from memory; they no longer count as unread
+        emptied = [t for t in (self._clear_unread(mid) for mid in msg_ids or []) if t]
+        if emptied:
+            self._refresh_threads()
+
+    def _on_messages_deleted(self, tid: str, msg_ids):
+        self._on_messages_evicted(tid, msg_ids)
+        if tid == self.current_thread_id:
+            self._render_thread(tid)
+
     def _on_history_extended(self, tid: str):
         # When older history loads for the visible DM, re-render
         if tid == self.current_thread_id:
             self._render_thread(tid)
         # NEW: each time history is extended (for any DM), recompute offline unreads and refresh list
         try:
-            self._label_offline_unreads()
+            self._label_offline_unreads(tid)
         except Exception:
             pass
 
     def _on_message_added(self, thread_id: str, ui):
         # During warm-load, don't mark unread; offline unreads are computed after warm completes.
         try:
-            if (not self._during_warmload) and (not ui.from_me) and (ui.id not in self.read_ids):
-                self.unread_ids.add(ui.id)
+            if (not self._during_warmload) and (not self._read_state.is_read(ui.id)):
+                self._add_unread(thread_id, ui)
         except Exception:
             pass
         # Speak DMs and Channel messages only after warm-load suppression is lifted
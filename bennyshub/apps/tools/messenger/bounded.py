@@ -0,0 +1,106 @@
+"""
+Bounded - Size-capped containers for the messenger's long-lived caches.
+
+The messenger runs for days on a small PC. Its name, reaction and
+seen-message caches were plain dicts and sets that only ever grew; these
+drop-in replacements level off instead:
+
+    LRUCache(max_items)   dict that evicts the least recently used key
+    SeenIds(max_items)    set-like de-duplication that forgets the oldest ids
+
+Both are safe to share between the UI thread and the bridge's event loop
+(every operation takes a lock).
+
+Usage:
+    names = LRUCache(5000)
+    names[uid] = "Ben"
+    names.get(uid, "user")
+
+    seen = SeenIds(50000)
+    if msg_id not in seen:
+        seen.add(msg_id)
+"""
+
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Mapping with a maximum size; reads and writes mark a key as recently used."""
+
+    def __init__(self, max_items):
+        self.max_items = max_items
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._data[key]
+            self._data.move_to_end(key)
+            return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+
+class SeenIds:
+    """Membership set that keeps only the most recently added max_items ids."""
+
+    def __init__(self, max_items):
+        self.max_items = max_items
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, item):
+        with self._lock:
+            return item in self._ids
+
+    def __len__(self):
+        with self._lock:
+            return len(self._ids)
+
+    def add(self, item):
+        with self._lock:
+            if item in self._ids:
+                return
+            self._ids[item] = None
+            while len(self._ids) > self.max_items:
+                self._ids.popitem(last=False)
+
+    def discard(self, item):
+        with self._lock:
+            self._ids.pop(item, None)
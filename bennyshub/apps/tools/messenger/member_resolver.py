@@ -0,0 +1,118 @@
+"""
+Member Resolver - Guild display names for many authors at once.
+
+Warm-loading a channel used to await one name lookup per message, and each
+author the client hadn't cached cost a guild.fetch_member REST call, made
+one after another (and repeated for every message by someone who isn't a
+guild member, since misses were never remembered). MemberResolver resolves
+the distinct ids of a whole batch together:
+
+    * ids already known (or in the gateway member cache) cost nothing
+    * the rest are fetched concurrently, at most FETCH_CONCURRENCY at a time
+    * a fetch already in flight for an id is shared, not repeated
+    * ids that aren't guild members (NotFound) are remembered as misses;
+      other failures (rate limits, timeouts) are retried next time
+
+Both the names and the misses are capped (least recently used / oldest go
+first), so a session that runs for days doesn't keep every author forever.
+
+Resolved names are written into the shared name cache the UI reads from.
+
+Usage (on the bridge's event loop):
+    resolver = MemberResolver(name_cache)
+    await resolver.resolve(guild, {m.author.id for m in messages})
+    resolver.member_name(author_id)     # guild display name, or None
+    await resolver.resolve_users(client, dm_user_ids)   # non-members: profile names
+"""
+
+import asyncio
+
+from bounded import LRUCache, SeenIds
+
+try:
+    from discord import NotFound
+except ImportError:  # discord.py missing: nothing will be fetched anyway
+    class NotFound(Exception):
+        pass
+
+FETCH_CONCURRENCY = 5
+MAX_NAMES = 5000
+
+
+class MemberResolver:
+    """Batched, de-duplicated guild member lookups."""
+
+    def __init__(self, name_cache, concurrency=FETCH_CONCURRENCY, max_names=MAX_NAMES):
+        self.name_cache = name_cache   # uid -> display name (shared with the bridge/UI)
+        self.concurrency = concurrency
+        self._members = LRUCache(max_names)     # uid -> guild display name
+        self._not_members = SeenIds(max_names)
+        self._inflight = {}    # uid -> asyncio.Task
+        self._sem = None       # created on the event loop that first uses it
+
+    def member_name(self, uid):
+        return self._members.get(uid)
+
+    def _semaphore(self):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+        return self._sem
+
+    def _remember(self, uid, member):
+        name = getattr(member, "display_name", None) if member else None
+        if name:
+            self._members[uid] = name
+            self.name_cache[uid] = name
+        else:
+            self._not_members.add(uid)
+
+    async def _fetch_member(self, guild, uid):
+        async with self._semaphore():
+            try:
+                member = await guild.fetch_member(uid)
+            except NotFound:
+                member = None
+            except Exception as e:
+                # Transient (429, network): don't record a miss, so it is retried
+                print(f"[Members] Lookup of {uid} failed: {e}")
+                return
+        self._remember(uid, member)
+
+    async def resolve(self, guild, uids):
+        """Look up every id in uids that isn't known yet, concurrently."""
+        if not guild:
+            return
+        waits = []
+        for uid in set(uids):
+            if not uid or uid in self._members or uid in self._not_members:
+                continue
+            task = self._inflight.get(uid)
+            if task is None:
+                member = guild.get_member(uid)
+                if member is not None:
+                    self._remember(uid, member)
+                    continue
+                task = asyncio.ensure_future(self._fetch_member(guild, uid))
+                self._inflight[uid] = task
+                task.add_done_callback(lambda _t, uid=uid: self._inflight.pop(uid, None))
+            waits.append(task)
+        if waits:
+            await asyncio.gather(*waits, return_exceptions=True)
+
+    async def _fetch_user_name(self, client, uid):
+        user = client.get_user(uid)
+        if user is None:
+            async with self._semaphore():
+                try:
+                    user = await client.fetch_user(uid)
+                except Exception:
+                    user = None
+        name = (getattr(user, "global_name", None) or getattr(user, "name", None)) if user else None
+        if name:
+            self.name_cache[uid] = name
+
+    async def resolve_users(self, client, uids):
+        """Profile names for ids that aren't guild members (and aren't named yet)."""
+        todo = {uid for uid in uids if uid and uid not in self._members and uid not in self.name_cache}
+        if todo:
+            await asyncio.gather(*(self._fetch_user_name(client, uid) for uid in todo), return_exceptions=True)
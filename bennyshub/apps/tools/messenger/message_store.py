@@ -0,0 +1,204 @@
+"""
+Message Store - Local SQLite copy of the messages the Discord client has shown.
+
+Every launch used to start from nothing: each channel's recent history was
+fetched in on_ready, every known DM was fetched again after warm-load, and
+scrolling a DM pulled up to 500 messages more. MessageStore keeps those
+messages (with their reaction chips) on disk so that:
+
+    * the thread list and current thread render from disk at startup,
+      before Discord has even connected
+    * the bridge only asks Discord for what is newer than the newest stored
+      message (history(after=...)), one small call per thread
+    * older DM history is paged in from disk first, and only what isn't
+      stored is fetched
+
+The database uses WAL mode and a single connection shared under a lock; the
+bridge writes from its asyncio thread, the UI reads at startup. Each thread
+keeps at most MAX_PER_THREAD rows, newest first.
+
+Usage:
+    from message_store import MessageStore
+
+    store = MessageStore("message_cache.sqlite")
+    store.save("main", [{"id": 1, "author": "Ben", "content": "hi", "ts": 0.0,
+                         "from_me": True, "attachments": [], "reactions": []}])
+    store.latest("main", limit=50)    # rows, oldest first
+    store.last_id("main")             # newest stored id -> history(after=...)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+MAX_PER_THREAD = 1000
+
+
+class MessageStore:
+    """Per-thread message rows and reaction chips, persisted in SQLite."""
+
+    def __init__(self, db_path, max_per_thread=MAX_PER_THREAD):
+        self.db_path = db_path
+        self.max_per_thread = max_per_thread
+        self._lock = threading.Lock()
+        self._conn = None
+
+    # ---------- Storage ----------
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY,
+                    thread TEXT NOT NULL,
+                    author TEXT,
+                    content TEXT,
+                    ts REAL,
+                    from_me INTEGER,
+                    attachments TEXT,
+                    reactions TEXT
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS messages_thread ON messages (thread, id)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS threads (
+                    thread TEXT PRIMARY KEY,
+                    name TEXT
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _row(r):
+        msg_id, author, content, ts, from_me, attachments, reactions = r
+        return {
+            "id": msg_id,
+            "author": author or "",
+            "content": content or "",
+            "ts": ts or 0.0,
+            "from_me": bool(from_me),
+            "attachments": json.loads(attachments) if attachments else [],
+            "reactions": json.loads(reactions) if reactions else [],
+        }
+
+    # ---------- Reads ----------
+    def threads(self):
+        """Thread ids that have stored messages."""
+        with self._lock:
+            try:
+                return [t for (t,) in self._connect().execute("SELECT DISTINCT thread FROM messages")]
+            except sqlite3.Error as e:
+                print(f"[Cache] Read failed: {e}")
+                return []
+
+    def latest(self, thread, limit=50, before_id=None):
+        """Newest `limit` rows of a thread (optionally older than before_id), oldest first."""
+        sql = ("SELECT id, author, content, ts, from_me, attachments, reactions FROM messages "
+               "WHERE thread = ?" + (" AND id < ?" if before_id else "") + " ORDER BY id DESC LIMIT ?")
+        args = (thread, before_id, limit) if before_id else (thread, limit)
+        with self._lock:
+            try:
+                rows = self._connect().execute(sql, args).fetchall()
+            except (sqlite3.Error, ValueError) as e:
+                print(f"[Cache] Read failed: {e}")
+                return []
+        rows.reverse()
+        return [self._row(r) for r in rows]
+
+    def last_id(self, thread):
+        """Newest stored message id for a thread, or None."""
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT MAX(id) FROM messages WHERE thread = ?", (thread,)).fetchone()
+            except sqlite3.Error:
+                return None
+        return row[0] if row else None
+
+    def thread_names(self):
+        with self._lock:
+            try:
+                return dict(self._connect().execute("SELECT thread, name FROM threads"))
+            except sqlite3.Error:
+                return {}
+
+    # ---------- Writes ----------
+    def save(self, thread, rows):
+        """Insert or replace message rows (dicts as returned by latest())."""
+        if not rows:
+            return
+        values = [(
+            int(r["id"]), thread, r.get("author"), r.get("content"), float(r.get("ts") or 0.0),
+            1 if r.get("from_me") else 0,
+            json.dumps(r.get("attachments") or []),
+            json.dumps(r.get("reactions") or []),
+        ) for r in rows]
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO messages (id, thread, author, content, ts, from_me, attachments, reactions) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values)
+                self._trim(conn, thread)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[Cache] Write failed: {e}")
+
+    def update_reactions(self, msg_id, reactions):
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("UPDATE messages SET reactions = ? WHERE id = ?",
+                             (json.dumps(reactions or []), int(msg_id)))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[Cache] Write failed: {e}")
+
+    def set_thread_name(self, thread, name):
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("INSERT OR REPLACE INTO threads (thread, name) VALUES (?, ?)", (thread, name))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[Cache] Write failed: {e}")
+
+    def delete(self, ids):
+        """Remove messages (deleted on Discord) by id."""
+        values = [(int(i),) for i in ids or []]
+        if not values:
+            return
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.executemany("DELETE FROM messages WHERE id = ?", values)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[Cache] Write failed: {e}")
+
+    def clear_thread(self, thread):
+        """Forget a thread's stored messages (its name is kept)."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM messages WHERE thread = ?", (thread,))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[Cache] Write failed: {e}")
+
+    def _trim(self, conn, thread):
+        conn.execute(
+            "DELETE FROM messages WHERE thread = ? AND id NOT IN "
+            "(SELECT id FROM messages WHERE thread = ? ORDER BY id DESC LIMIT ?)",
+            (thread, thread, self.max_per_thread))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -143,6 +143,15 @@ except Exception as e:
     def is_tts_enabled(): return True
     def check_settings_changed(): return False
 
+# Shared speech daemon (one engine for all hub tools); the local worker below
+# only starts if the daemon can't be reached
+try:
+    from speech_daemon import speak as speak_via_daemon, ensure_daemon, prerender  # type: ignore
+except Exception:
+    def speak_via_daemon(*_args, **_kwargs): return False
+    def ensure_daemon(): pass
+    def prerender(_phrases): return False
+
 _tts_queue = None
 _tts_thread = None
 _tts_ready = False
@@ -199,7 +208,15 @@ WORD_PRONUNCIATION_MAP = {
     'HE': 'he', 'ME': 'me', 'US': 'us', 'HI': 'hi', 'OK': 'okay', 'OH': 'oh', 'AH': 'ah'
 }
 
-def speak(text: str):
+def _ensure_tts_worker():
+    global _tts_queue, _tts_thread
+    if _tts_thread is None and pyttsx3 is not None:
+        _tts_queue = queue.Queue(maxsize=8)
+        _tts_thread = threading.Thread(target=_tts_worker, daemon=True)
+        _tts_thread.start()
+
+def speak(text: str, cached: bool = False):
+    """Speak text; cached=True for fixed scan labels the daemon can play pre-rendered."""
     if not text:
         return
     
@@ -207,7 +224,10 @@ def speak(text: str):
     upper_text = text.strip().upper()
     if upper_text in WORD_PRONUNCIATION_MAP:
         text = WORD_PRONUNCIATION_MAP[upper_text]
-        
+
+    if speak_via_daemon(str(text), channel="keyboard", mode="latest", cache=cached):
+        return
+    _ensure_tts_worker()
     try:
         if _tts_queue:
             # keep queue lean - clear everything to interrupt pending
@@ -601,10 +621,10 @@ QPushButton[variant="primary"]{
         # Seed predictions once on startup
         self._schedule_predictions()
 
-        # Start TTS worker
-        global _tts_queue, _tts_thread
-        _tts_queue = queue.Queue(maxsize=8)
-        _tts_thread = threading.Thread(target=_tts_worker, daemon=True); _tts_thread.start()
+        # Speech goes through the shared daemon (local worker starts only as a fallback);
+        # have it pre-render the fixed scan labels while idle
+        ensure_daemon()
+        prerender(self._fixed_scan_labels())
 
         # Capture space and enter globally
         app = QtWidgets.QApplication.instance()
@@ -1153,10 +1173,20 @@ QLabel {
             elif rd.id == "predRow":
                 self._read_pred_row()
             else:
-                speak(rd.label)
+                speak(rd.label, cached=True)
         except Exception:
             pass
 
+    def _fixed_scan_labels(self) -> List[str]:
+        """Row names and key labels that never change (predictions and typed text excluded)."""
+        labels = ["empty", "button", "space", "delete letter", "delete word", "clear", "send", "close"]
+        for rd in self.rows:
+            if rd.id in ("row_text", "predRow"):
+                continue
+            labels.append(rd.label)
+            labels.extend((w.text() or "").strip() for w in rd.widgets if isinstance(w, QtWidgets.QPushButton))
+        return [l for l in labels if l]
+
     def _speak_key_label(self):
         try:
             rd = self.rows[self.row_idx]
@@ -1179,14 +1209,14 @@ QLabel {
                     }
                     label = action_labels.get(action)
                     if label:
-                        speak(label)
+                        speak(label, cached=True)
                         return
                 
                 # Fallback to button text for non-control buttons
                 lbl = (w.text() or "").strip()
-                speak(lbl if lbl else "button")
+                speak(lbl if lbl else "button", cached=rd.id != "predRow")
             else:
-                speak("button")
+                speak("button", cached=True)
         except Exception:
             pass
 
@@ -0,0 +1,150 @@
+"""
+Read State - Compact, debounced record of which Discord messages Ben has read.
+
+The messenger used to rewrite every read message id it had ever seen to
+read_state.json each time one message was read, so marking a message read
+got slower (and the file bigger) forever.
+
+Discord message ids are snowflakes with the creation time built in, and
+messages from before the last session ended are never labelled unread
+again. So the store keeps a high-water mark instead of history:
+
+    last_seen_ts   when the previous session closed; everything created
+                   before it counts as read
+    read_ids       only the ids newer than that, read during this session
+
+Closing a session moves the mark forward and drops the ids it now covers,
+so the file stays small. mark_read() is a set insert; the file is written
+by a background thread, batched and debounced.
+
+Usage:
+    state = ReadState("read_state.json")
+    if not state.is_read(msg_id):
+        state.mark_read(msg_id)
+    ...
+    state.close()   # on exit: advance last_seen_ts, compact and write now
+"""
+
+import json
+import os
+import threading
+import time
+
+DISCORD_EPOCH_MS = 1420070400000
+SAVE_DEBOUNCE = 2.0     # seconds of quiet before a batch of marks is written
+CUTOFF_MARGIN = 60.0    # seconds; allows for clock skew between us and Discord
+
+
+def snowflake_ts(msg_id):
+    """Creation time (epoch seconds) encoded in a Discord id."""
+    try:
+        return ((int(msg_id) >> 22) + DISCORD_EPOCH_MS) / 1000.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ReadState:
+    """Read message ids above a time high-water mark, persisted off the UI thread."""
+
+    def __init__(self, path, debounce=SAVE_DEBOUNCE):
+        self.path = path
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self.last_seen_ts = 0.0
+        self._read_ids = set()
+        self._load()
+        self._writer = threading.Thread(target=self._run, name="read-state-writer", daemon=True)
+        self._writer.start()
+
+    # ---------- Load / compact ----------
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        try:
+            self.last_seen_ts = float(data.get("last_seen_ts", 0.0) or 0.0)
+        except (TypeError, ValueError):
+            self.last_seen_ts = 0.0
+        ids = data.get("read_ids", [])
+        self._read_ids = {int(i) for i in ids if isinstance(i, (int, str)) and str(i).isdigit()}
+        # Files from before the high-water mark list every id ever read
+        if self._compact():
+            self._wake.set()
+
+    def _cutoff(self):
+        return self.last_seen_ts - CUTOFF_MARGIN if self.last_seen_ts > 0 else 0.0
+
+    def _compact(self):
+        """Drop ids the high-water mark already covers. Returns True if any were dropped."""
+        cutoff = self._cutoff()
+        if cutoff <= 0:
+            return False
+        keep = {i for i in self._read_ids if snowflake_ts(i) > cutoff}
+        dropped = len(keep) != len(self._read_ids)
+        self._read_ids = keep
+        return dropped
+
+    # ---------- Queries / updates ----------
+    def is_read(self, msg_id):
+        cutoff = self._cutoff()
+        if cutoff > 0 and snowflake_ts(msg_id) <= cutoff:
+            return True
+        return msg_id in self._read_ids
+
+    def mark_read(self, msg_id):
+        """Record msg_id as read. Returns True if it wasn't already. O(1); the write happens later."""
+        if self.is_read(msg_id):
+            return False
+        with self._lock:
+            self._read_ids.add(msg_id)
+        self._wake.set()
+        return True
+
+    def set_last_seen(self, ts=None):
+        """Move the high-water mark (end of session) and compact."""
+        with self._lock:
+            self.last_seen_ts = float(ts if ts is not None else time.time())
+            self._compact()
+        self._wake.set()
+
+    # ---------- Persistence ----------
+    def _snapshot(self):
+        with self._lock:
+            return {"last_seen_ts": self.last_seen_ts, "read_ids": sorted(self._read_ids)}
+
+    def _write(self):
+        with self._write_lock:
+            data = self._snapshot()
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"[ReadState] Save failed: {e}")
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait()
+            if self._closed:
+                break
+            # Let a burst of marks settle, then write them in one go
+            time.sleep(self.debounce)
+            self._wake.clear()
+            self._write()
+
+    def flush(self):
+        """Write now (synchronously)."""
+        self._wake.clear()
+        self._write()
+
+    def close(self, last_seen_ts=None):
+        """End of session: advance the high-water mark, compact and write."""
+        self._closed = True
+        self.set_last_seen(last_seen_ts)
+        self.flush()
@@ -35,6 +35,12 @@ except Exception as e:
     def is_tts_enabled(): return True
     def check_settings_changed(): return False
 
+# Shared speech daemon (one engine for all hub tools)
+try:
+    from speech_daemon import speak as speak_via_daemon  # type: ignore
+except Exception:
+    def speak_via_daemon(*_args, **_kwargs): return False
+
 # --- Paths and config ---
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_PATH = os.path.join(APP_DIR, "config.json")
@@ -181,7 +187,12 @@ def _tts_say(line: str):
     # Check shared settings first
     if _voice_settings_available and not is_tts_enabled():
         return
-    if not TTS_ENABLED or not line or pyttsx3 is None:
+    if not TTS_ENABLED or not line:
+        return
+    # Messages queue behind each other rather than replacing one another
+    if speak_via_daemon(line, channel="dm_listener", mode="queue"):
+        return
+    if pyttsx3 is None:
         return
     try:
         if _tts_engine is None:
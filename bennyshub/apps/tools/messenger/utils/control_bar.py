@@ -45,6 +45,12 @@ except Exception as e:
     def apply_sapi_voice_settings(_sapi): pass
     def check_settings_changed(): return False
 
+# Shared speech daemon (one engine for all hub tools)
+try:
+    from speech_daemon import speak as speak_via_daemon  # type: ignore
+except Exception:
+    def speak_via_daemon(*_args, **_kwargs): return False
+
 # ------------------------------ Config ------------------------------
 # Because this file lives in utils/, the data directory is one level up.
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
@@ -864,6 +870,10 @@ class ControlBar(tk.Tk):
         if _voice_settings_available and not is_tts_enabled():
             self._refocus_bar()
             return
+        # Outranks scan labels and other apps' speech in the shared daemon
+        if speak_via_daemon("I need help", channel="alert", mode="interrupt", priority=10):
+            self._refocus_bar()
+            return
         if _win32com_client:
             try:
                 speaker = _win32com_client.Dispatch("SAPI.SpVoice")
@@ -104,12 +104,29 @@ try:
         finally:
             _tts_ready = False
 
-    _tts_thread = threading.Thread(target=_tts_worker, daemon=True)
-    _tts_thread.start()
+    def _ensure_tts_worker():
+        # Local engine is only a fallback for when the speech daemon is unreachable
+        global _tts_thread
+        if _tts_thread is None:
+            _tts_thread = threading.Thread(target=_tts_worker, daemon=True)
+            _tts_thread.start()
 except Exception:
     _tts_queue = None
     _tts_thread = None
     _tts_ready = False
+    def _ensure_tts_worker(): pass
+
+# Shared speech daemon (one engine for all hub tools)
+try:
+    _shared_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "shared"))
+    if _shared_dir not in sys.path:
+        sys.path.insert(0, _shared_dir)
+    from speech_daemon import speak as speak_via_daemon, ensure_daemon, prerender
+except Exception:
+    def speak_via_daemon(*_args, **_kwargs): return False
+    def ensure_daemon(): pass
+    def prerender(_phrases): return False
+ensure_daemon()
 
 WORD_PRONUNCIATION_MAP = {
     'IS': 'is', 'IT': 'it', 'IN': 'in', 'IF': 'if', 'OF': 'of', 'OR': 'or', 'ON': 'on',
@@ -118,8 +135,19 @@ WORD_PRONUNCIATION_MAP = {
     'HE': 'he', 'ME': 'me', 'US': 'us', 'HI': 'hi', 'OK': 'okay', 'OH': 'oh', 'AH': 'ah'
 }
 
-def speak(text: str):
-    if not text or _tts_queue is None:
+# Spoken names of the letter/number rows while scanning
+SCAN_ROW_NAMES = {
+    "row1": "a b c d e f",
+    "row2": "g h i j k l",
+    "row3": "m n o p q r",
+    "row4": "s t u v w x",
+    "row5": "y z zero one two three",
+    "row6": "four five six seven eight nine",
+}
+
+def speak(text: str, cached: bool = False):
+    """Speak text; cached=True for fixed scan labels the daemon can play pre-rendered."""
+    if not text:
         return
 
     # Apply pronunciation map
@@ -127,6 +155,11 @@ def speak(text: str):
     if upper_text in WORD_PRONUNCIATION_MAP:
         text = WORD_PRONUNCIATION_MAP[upper_text]
 
+    if speak_via_daemon(str(text), channel="search", mode="latest", cache=cached):
+        return
+    if _tts_queue is None:
+        return
+    _ensure_tts_worker()
     try:
         # keep the queue lean: drop older items if any
         while _tts_queue.qsize() > 1:
@@ -622,6 +655,8 @@ class Narbe(QtWidgets.QMainWindow):
             # Build UI and focus/highlight
             self._make_ui()
             self._highlight_rows()
+            # Have the speech daemon pre-render the fixed scan labels while idle
+            prerender(self._fixed_scan_labels())
 
             # --- prediction thread + debounce ---
             self.pred_req_id = 0
@@ -1812,19 +1847,20 @@ QLineEdit{
                         speak("empty")
             else:
                 # Normal keyboard mode
-                row_names = {
-                    "row1": "a b c d e f",
-                    "row2": "g h i j k l",
-                    "row3": "m n o p q r",
-                    "row4": "s t u v w x",
-                    "row5": "y z zero one two three",
-                    "row6": "four five six seven eight nine",
-                }
-                speak(row_names.get(rd.id, rd.label))
+                speak(SCAN_ROW_NAMES.get(rd.id, rd.label), cached=True)
             return
-        if rd.id == "row_modes": speak("search")
-        elif rd.id == "row_controls": speak("controls")
-        elif rd.id == "predRow": speak("predictive text")
+        if rd.id == "row_modes": speak("search", cached=True)
+        elif rd.id == "row_controls": speak("controls", cached=True)
+        elif rd.id == "predRow": speak("predictive text", cached=True)
+
+    def _fixed_scan_labels(self) -> List[str]:
+        """Row names and key labels that never change (predictions excluded)."""
+        labels = list(SCAN_ROW_NAMES.values()) + ["search", "controls", "predictive text"]
+        for rd in self.rows:
+            if rd.id in ("row_text", "predRow"):
+                continue
+            labels.extend((w.text() or "").strip() for w in rd.widgets if isinstance(w, QtWidgets.QPushButton))
+        return [l for l in labels if l]
 
     def _speak_key_label(self):
         cur = self.rows[self.row_idx]
@@ -1832,7 +1868,9 @@ QLineEdit{
             w = cur.widgets[self.key_idx]
             if isinstance(w, QtWidgets.QPushButton):
                 label = (w.text() or "").strip()
-                if label: speak(label)
+                # Predictions and history terms change; everything else is a fixed label
+                fixed = cur.id != "predRow" and not self.search_history_mode
+                if label: speak(label, cached=fixed)
         except Exception:
             pass
 
@@ -92,6 +92,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
     
     loadData();
+    connectServerEvents();
     setupInputListeners();
     
     // Small delay to ensure voice manager is ready before first speak
@@ -110,6 +111,35 @@ const isElectron = typeof window !== 'undefined' && window.electronAPI;
 // Base path for streaming app resources (relative to hub)
 const STREAMING_BASE_PATH = isElectron ? 'apps/tools/streaming/' : '/';
 
+// --- SERVER EVENTS (standalone mode) ---
+// The server pushes launch, automation, playback and progress events over
+// /api/events, so last-watched data stays current without re-fetching.
+let serverEvents = null;
+let lastWatchedCache = null; // show -> record, kept in sync by "progress" events
+
+function connectServerEvents() {
+    if (isElectron || serverEvents || typeof EventSource === 'undefined') return;
+    serverEvents = new EventSource('/api/events');
+
+    serverEvents.addEventListener('progress', (e) => {
+        const p = JSON.parse(e.data);
+        if (lastWatchedCache && p.show) {
+            lastWatchedCache[p.show.toLowerCase().trim()] = {
+                season: p.season, episode: p.episode, url: p.url,
+                linear_index: p.linear_index, timestamp: Date.now()
+            };
+        }
+    });
+
+    ['launch', 'automation', 'playback', 'control_bar'].forEach(type => {
+        serverEvents.addEventListener(type, (e) => {
+            const detail = JSON.parse(e.data);
+            console.log(`[Streaming] ${type}:`, detail);
+            document.dispatchEvent(new CustomEvent('streaming-server-event', { detail: { type, data: detail } }));
+        });
+    });
+}
+
 // --- DATA LOADING ---
 async function loadData() {
     try {
@@ -119,8 +149,10 @@ async function loadData() {
             allData = await window.electronAPI.streaming.getData() || [];
             console.log(`[Streaming] Loaded ${allData.length} items from Electron API`);
         } else {
-            // Fallback to fetch for browser testing
-            const dRes = await fetch(STREAMING_BASE_PATH + 'data.json');
+            // Fallback to fetch for browser testing.
+            // /api/catalog points images at the server's local mirror.
+            let dRes = await fetch('/api/catalog').catch(() => null);
+            if (!dRes || !dRes.ok) dRes = await fetch(STREAMING_BASE_PATH + 'data.json');
             if (dRes.ok) allData = await dRes.json();
         }
         
@@ -369,9 +401,12 @@ async function openRecent() {
         let recent = {};
         if (isElectron) {
             recent = await window.electronAPI.streaming.getLastWatched() || {};
+        } else if (lastWatchedCache && serverEvents && serverEvents.readyState === EventSource.OPEN) {
+            recent = lastWatchedCache;
         } else {
             const res = await fetch('/api/last_watched');
             if (res.ok) recent = await res.json();
+            if (serverEvents) lastWatchedCache = recent;
         }
         
         // Normalize keys to lowercase and deduplicate (keep most recent)
@@ -411,34 +446,59 @@ async function openRecent() {
 }
 
 let currentTypeFilter = null; // function taking item.type string returning boolean
+let currentTypeKey = 'all';    // same filter as a facet name: 'movies', 'shows' or 'all'
+
+// Precomputed, pre-sorted menu views from the server (standalone mode only).
+// Responses carry ETags, so reopening a menu is usually a 304.
+async function fetchFacet(path) {
+    if (isElectron) return null;
+    try {
+        const res = await fetch('/api/facets/' + path);
+        if (res.ok) return await res.json();
+    } catch (e) {}
+    return null;
+}
+
+async function loadGenres(typeKey, getSourceItems) {
+    const facet = await fetchFacet(`genres?type=${typeKey}`);
+    if (facet) {
+        genres = facet.genres.map(g => g.name);
+        facet.genres.forEach(g => { if (g.image && !genreData[g.name]) genreData[g.name] = g.image; });
+    } else {
+        processGenres(getSourceItems());
+    }
+}
 
-function openMovies() {
+async function openMovies() {
     currentTypeFilter = (t) => t.toLowerCase().includes('movie');
+    currentTypeKey = 'movies';
     
-    // Filter source data for genres
-    const movies = allData.filter(item => item.type && currentTypeFilter(item.type));
-    processGenres(movies);
+    // Genres for movies only
+    await loadGenres('movies', () => allData.filter(item => item.type && currentTypeFilter(item.type)));
     openBrowseInternal("Movies");
 }
 
-function openShows() {
+async function openShows() {
     currentTypeFilter = (t) => {
         const lo = t.toLowerCase();
         return lo.includes('series') || lo.includes('show') || lo.includes('tv');
     };
+    currentTypeKey = 'shows';
     
-    // Filter source data for genres
-    const shows = allData.filter(item => item.type && currentTypeFilter(item.type));
-    processGenres(shows);
+    // Genres for shows only
+    await loadGenres('shows', () => allData.filter(item => item.type && currentTypeFilter(item.type)));
     openBrowseInternal("TV Shows");
 }
 
 // Browse (Genres)
 let currentGenrePage = 1;
 
-function openBrowse() {
+async function openBrowse() {
     currentTypeFilter = null;
-    filteredData = allData.filter(item => item.type !== 'music').sort((a,b) => a.title.localeCompare(b.title));
+    currentTypeKey = 'all';
+    const facet = await fetchFacet('titles?type=all');
+    filteredData = facet ? facet.items
+        : allData.filter(item => item.type !== 'music').sort((a,b) => a.title.localeCompare(b.title));
     openItemsView("Browse All");
 }
 
@@ -602,8 +662,14 @@ function selectGenre(idx) {
     if(el && el.onclick) el.onclick();
 }
 
-function selectGenreByName(gName) {
+async function selectGenreByName(gName) {
     if (!gName) return;
+    const facet = await fetchFacet(`titles?type=${currentTypeKey}&genre=${encodeURIComponent(gName)}`);
+    if (facet) {
+        filteredData = facet.items;
+        openItemsView(gName);
+        return;
+    }
     // Filter data - check if genre string contains the selected genre
     filteredData = allData.filter(item => {
         const itemGenre = item.genre || "Other";
@@ -854,9 +920,11 @@ function openSearch() {
                 let data = [];
                 if (isElectron) {
                     data = await window.electronAPI.streaming.getSearchHistory();
-                } else {
-                    const res = await fetch('/api/search_history');
-                    if (res.ok) data = await res.json();
+                } else if (window.predictionSystem) {
+                    // Standalone server ranks history per keystroke via /api/search_suggest
+                    window.predictionSystem.enableServerSuggestions('/api/search_suggest');
+                    window.keyboardController.updatePredictions();
+                    return;
                 }
                 if (window.predictionSystem) {
                     window.predictionSystem.setRecentSearches(data);
@@ -1095,8 +1163,18 @@ async function continueShow(item, epsData) {
         if (isElectron) {
             last = await window.electronAPI.streaming.getLastWatched(item.title);
         } else {
-            const res = await fetch(`/api/last_watched?show=${encodeURIComponent(item.title)}`);
-            if (res.ok) last = await res.json();
+            // One request: the server resolves the last-watched episode (or the first one)
+            const res = await fetch(`/api/next_episode?show=${encodeURIComponent(item.title)}`);
+            const resume = res.ok ? await res.json() : {};
+            // A record the index can't place (e.g. a "Play" save) resumes its own URL below
+            const ep = resume.current || (resume.has_record ? null : resume.episode);
+            if (ep && ep.url) {
+                launchContent(ep.url, item.title, "shows", ep.season, ep.episode);
+                closeModal();
+                return;
+            }
+            const lastRes = await fetch(`/api/last_watched?show=${encodeURIComponent(item.title)}`);
+            if (lastRes.ok) last = await lastRes.json();
         }
         
         if (last && last.url) {
@@ -1541,9 +1619,8 @@ function handleGlobalBack() {
         
         if (currentTypeFilter) {
              // Re-apply filter to get genres
-             const filteredSource = allData.filter(item => item.type && currentTypeFilter(item.type));
-             processGenres(filteredSource);
-             openBrowseInternal(lastBrowseTitle);
+             loadGenres(currentTypeKey, () => allData.filter(item => item.type && currentTypeFilter(item.type)))
+                 .then(() => openBrowseInternal(lastBrowseTitle));
         } else {
              openBrowse();
         }
@@ -1661,15 +1738,32 @@ function setupInputListeners() {
         if(q) {
              
 
-            // Open items view sets state to ITEMS, rendering results
-             filteredData = allData.filter(item => 
-                (item.title && item.title.toLowerCase().includes(q.toLowerCase()))
-                && item.type !== 'music'
-            );
-            
-            openItemsView("Search Results"); 
-            // openItemsView sets currentState = STATE.ITEMS
-            speak("Search Results. Found " + filteredData.length + " results");
+            const showResults = () => {
+                // Open items view sets state to ITEMS, rendering results
+                openItemsView("Search Results"); 
+                // openItemsView sets currentState = STATE.ITEMS
+                speak("Search Results. Found " + filteredData.length + " results");
+            };
+            const searchLocally = () => {
+                filteredData = allData.filter(item => 
+                    (item.title && item.title.toLowerCase().includes(q.toLowerCase()))
+                    && item.type !== 'music'
+                );
+                showResults();
+            };
+
+            if (isElectron) {
+                searchLocally();
+            } else {
+                // Ranked full-text search on the streaming server
+                fetch(`/api/catalog/search?q=${encodeURIComponent(q)}&limit=200`)
+                    .then(res => res.ok ? res.json() : Promise.reject(res.status))
+                    .then(data => {
+                        filteredData = (data.results || []).filter(item => item.type !== 'music');
+                        showResults();
+                    })
+                    .catch(searchLocally);
+            }
         }
     });
     
@@ -2046,6 +2140,8 @@ function selectEditorModal() {
 
 // --- SERVICE EMBLEM HELPER ---
 function getServiceEmblem(item) {
+    // A locally mirrored icon downloaded fine, so it isn't one of the broken ones
+    if (item.service_icon && item.service_icon.startsWith('/img/')) return item.service_icon;
     if (item.service) { // Prioritize new map always due to broken icons in JSON
         const key = item.service.toLowerCase();
         // Fallback map - Synced with editor.js
@@ -0,0 +1,138 @@
+"""
+Asset Cache - In-memory cache of static text assets with gzip variants and ETags.
+
+The streaming page loads the same scripts (scan-manager.js, voice-manager.js,
+app.js, ...) on every navigation. Rather than opening and re-reading each
+file per request, AssetCache keeps the bytes, a gzip-compressed copy and an
+ETag in memory, keyed by path. A single os.stat per request detects edits
+(mtime/size change) and reloads only that file, so editing a script during
+development still shows up on the next refresh.
+
+Only compressible text types are cached; anything else returns None and is
+left to the regular file handler.
+
+Usage:
+    from asset_cache import AssetCache
+
+    cache = AssetCache(max_bytes=8 * 1024 * 1024)
+    asset = cache.get(SHARED_DIR, "scan-manager.js")
+    if asset:
+        body, encoding = asset.body_for(accept_encoding_header)
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+MIN_GZIP_SIZE = 512  # smaller files aren't worth compressing
+
+CONTENT_TYPES = {
+    ".js": "application/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".html": "text/html; charset=utf-8",
+    ".json": "application/json; charset=utf-8",
+    ".svg": "image/svg+xml",
+    ".txt": "text/plain; charset=utf-8",
+}
+
+
+def safe_join(root, rel_path):
+    """Join rel_path onto root, refusing anything that escapes root."""
+    root = os.path.abspath(root)
+    full = os.path.abspath(os.path.join(root, rel_path.lstrip("/\\")))
+    if full != root and not full.startswith(root + os.sep):
+        return None
+    return full
+
+
+class Asset:
+    """One cached file: raw bytes, optional gzip bytes and validators."""
+
+    __slots__ = ("body", "gzip_body", "etag", "content_type", "mtime", "signature")
+
+    def __init__(self, body, content_type, mtime, signature):
+        self.body = body
+        self.content_type = content_type
+        self.mtime = mtime
+        self.signature = signature
+        self.etag = '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+        self.gzip_body = None
+        if len(body) >= MIN_GZIP_SIZE:
+            compressed = gzip.compress(body, compresslevel=6, mtime=0)
+            if len(compressed) < len(body):
+                self.gzip_body = compressed
+
+    def size(self):
+        return len(self.body) + len(self.gzip_body or b"")
+
+    def body_for(self, accept_encoding):
+        """(bytes, content-encoding or None) for a request's Accept-Encoding header."""
+        if self.gzip_body is not None and "gzip" in (accept_encoding or "").lower():
+            return self.gzip_body, "gzip"
+        return self.body, None
+
+    def matches(self, if_none_match):
+        """True if an If-None-Match header already names this version."""
+        if not if_none_match:
+            return False
+        tags = [t.strip() for t in if_none_match.split(",")]
+        return "*" in tags or self.etag in tags or ("W/" + self.etag) in tags
+
+
+class AssetCache:
+    """Path -> Asset LRU bounded by total cached bytes."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._assets = OrderedDict()
+        self._bytes = 0
+
+    def get(self, root, rel_path):
+        """Return the Asset for root/rel_path, or None if missing, unsafe or not a cached type."""
+        full = safe_join(root, rel_path)
+        if not full:
+            return None
+        content_type = CONTENT_TYPES.get(os.path.splitext(full)[1].lower())
+        if not content_type:
+            return None
+        try:
+            st = os.stat(full)
+        except OSError:
+            self._drop(full)
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            asset = self._assets.get(full)
+            if asset and asset.signature == signature:
+                self._assets.move_to_end(full)
+                return asset
+
+        try:
+            with open(full, "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        asset = Asset(body, content_type, st.st_mtime, signature)
+
+        with self._lock:
+            old = self._assets.pop(full, None)
+            if old:
+                self._bytes -= old.size()
+            if asset.size() <= self.max_bytes:
+                self._assets[full] = asset
+                self._bytes += asset.size()
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._assets.popitem(last=False)
+                    self._bytes -= evicted.size()
+        return asset
+
+    def _drop(self, full):
+        with self._lock:
+            old = self._assets.pop(full, None)
+            if old:
+                self._bytes -= old.size()
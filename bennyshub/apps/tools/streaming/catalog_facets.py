@@ -0,0 +1,179 @@
+"""
+Catalog Facets - Precomputed, pre-sorted menu views of the streaming catalog.
+
+The streaming menus group titles by type, genre and service. Instead of the
+page re-filtering and re-sorting the whole catalog whenever a menu opens,
+CatalogFacets builds every grouping once (when data.json or genres.json
+changes) and keeps each view as ready-to-send JSON bytes with an ETag:
+
+    genres/<type>              genre names (+ images from genres.json) for a type
+    titles/<type>/<genre>      titles in one genre, sorted
+    titles/<type>              every title of a type, sorted ("Browse All")
+    services                   service names with title counts
+    service/<name>             titles on one service, sorted
+    recent                     most recently added titles (end of data.json first)
+
+<type> is "movies", "shows" or "all", matching the page's own filters.
+
+Usage:
+    from catalog_facets import CatalogFacets
+
+    facets = CatalogFacets("data.json", "genres.json")
+    view = facets.get("titles", type="movies", genre="Comedy")
+    if view: body, etag = view
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+RECENT_LIMIT = 50
+TYPES = ("movies", "shows", "all")
+
+
+def item_genres(item):
+    """The page's genre split: comma separated, trimmed, "Other" if empty."""
+    names = [g.strip() for g in (item.get("genre") or "Other").split(",")]
+    return [g for g in names if g] or ["Other"]
+
+
+def type_matches(item, type_key):
+    item_type = str(item.get("type") or "").lower()
+    if type_key == "movies":
+        return "movie" in item_type
+    if type_key == "shows":
+        return "series" in item_type or "show" in item_type or "tv" in item_type
+    return True
+
+
+def _title_key(item):
+    title = str(item.get("title") or "")
+    return (title.casefold(), title)
+
+
+def _sorted_genres(names):
+    ordered = sorted(n for n in names if n != "Other")
+    if "Other" in names:
+        ordered.append("Other")  # "Other" goes last, as on the page
+    return ordered
+
+
+class CatalogFacets:
+    """Lazily rebuilt facet views, each stored as (json bytes, etag)."""
+
+    def __init__(self, data_path, genres_path, transform=None, version_fn=None):
+        """
+        transform(items) -> items is applied before building (e.g. image URL
+        rewriting); version_fn() returns a value that forces a rebuild when it
+        changes (e.g. the image mirror's version).
+        """
+        self.data_path = data_path
+        self.genres_path = genres_path
+        self.transform = transform
+        self.version_fn = version_fn
+        self._lock = threading.Lock()
+        self._signature = None
+        self._views = {}
+
+    # ---------- Building ----------
+    def _current_signature(self):
+        parts = []
+        for path in (self.data_path, self.genres_path):
+            try:
+                st = os.stat(path)
+                parts.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                parts.append(None)
+        parts.append(self.version_fn() if self.version_fn else None)
+        return tuple(parts)
+
+    @staticmethod
+    def _read_json(path, expected):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return expected()
+        return data if isinstance(data, expected) else expected()
+
+    @staticmethod
+    def _encode(payload):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return body, '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+
+    def _build(self, items, genre_images):
+        items = [i for i in items if isinstance(i, dict) and i.get("title")]
+        if self.transform:
+            items = self.transform(items)
+        browsable = [i for i in items if i.get("type") != "music"]
+        views = {}
+
+        for type_key in TYPES:
+            typed = [i for i in browsable if type_key == "all" or (i.get("type") and type_matches(i, type_key))]
+            by_genre = {}
+            for item in typed:
+                for genre in item_genres(item):
+                    by_genre.setdefault(genre, []).append(item)
+            genre_list = [
+                {"name": g, "image": genre_images.get(g), "count": len(by_genre[g])}
+                for g in _sorted_genres(by_genre)
+            ]
+            views[("genres", type_key)] = {"type": type_key, "genres": genre_list}
+            views[("titles", type_key)] = {"type": type_key, "items": sorted(typed, key=_title_key)}
+            for genre, members in by_genre.items():
+                views[("titles", type_key, genre)] = {
+                    "type": type_key, "genre": genre, "items": sorted(members, key=_title_key),
+                }
+
+        # Services group case-insensitively under the first spelling seen
+        by_service, service_names = {}, {}
+        for item in browsable:
+            service = str(item.get("service") or "").strip()
+            if service:
+                key = service.casefold()
+                service_names.setdefault(key, service)
+                by_service.setdefault(key, []).append(item)
+        views[("services",)] = {"services": [
+            {"name": service_names[k], "count": len(by_service[k])} for k in sorted(by_service)
+        ]}
+        for key, members in by_service.items():
+            views[("service", key)] = {"service": service_names[key], "items": sorted(members, key=_title_key)}
+
+        views[("recent",)] = {"items": list(reversed(browsable))[:RECENT_LIMIT]}
+        return {key: self._encode(payload) for key, payload in views.items()}
+
+    def _ensure_current(self):
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+        items = self._read_json(self.data_path, list)
+        genre_images = self._read_json(self.genres_path, dict)
+        self._views = self._build(items, genre_images)
+        self._signature = signature
+        print(f"[Facets] Built {len(self._views)} views from {len(items)} items")
+
+    def rebuild(self):
+        """Rebuild now (after a save) instead of on the next request."""
+        with self._lock:
+            self._signature = None
+            self._ensure_current()
+
+    # ---------- Queries ----------
+    def get(self, facet, type="all", genre=None, name=None):
+        """(json bytes, etag) for one view, or None if it doesn't exist."""
+        if facet in ("genres", "titles") and type not in TYPES:
+            return None
+        if facet == "titles":
+            key = ("titles", type, genre) if genre else ("titles", type)
+        elif facet == "genres":
+            key = ("genres", type)
+        elif facet == "service":
+            key = ("service", str(name or "").strip().casefold())
+        elif facet in ("services", "recent"):
+            key = (facet,)
+        else:
+            return None
+        with self._lock:
+            self._ensure_current()
+            return self._views.get(key)
@@ -0,0 +1,240 @@
+"""
+Catalog Index - Server-side full-text search over the streaming catalog (data.json).
+
+Builds an inverted index over title, genre, director, actors, year,
+description and service. Queries are tokenized the same way; the last word
+(the one still being typed) also matches by prefix via a sorted vocabulary,
+and results are ranked with BM25 using per-field weights so title hits
+outrank description hits.
+
+The index updates incrementally: when the catalog is saved only the items
+whose content changed are re-indexed. Edits made by other processes (the
+editor server writes data.json directly) are picked up by mtime.
+
+Usage:
+    from catalog_index import CatalogIndex
+
+    index = CatalogIndex("data.json")
+    index.search("simpsons", limit=20)   # [item, ...] best first
+    index.update(new_items)              # after saving a new catalog
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+
+# Field weights for ranking (a title hit is worth more than a description hit)
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "actors": 1.5,
+    "director": 1.5,
+    "genre": 1.5,
+    "service": 1.0,
+    "year": 1.0,
+    "description": 1.0,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+PREFIX_WEIGHT = 0.8  # prefix expansions score slightly below exact words
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lowercase, strip accents and split into word tokens."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _TOKEN_RE.findall(text.lower())
+
+
+def item_key(item):
+    """Stable identity for a catalog item (its id, else title + url)."""
+    if item.get("id"):
+        return str(item["id"])
+    return f"{item.get('title', '')}\n{item.get('url', '')}"
+
+
+def _fingerprint(item):
+    return hashlib.sha1(json.dumps(item, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class CatalogIndex:
+    """Incrementally maintained BM25 inverted index over catalog items."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._docs = {}        # key -> item
+        self._rank = {}        # key -> position in catalog order (tie-breaker)
+        self._fingerprints = {}
+        self._doc_terms = {}   # key -> {term: weighted tf}
+        self._doc_len = {}     # key -> weighted length
+        self._total_len = 0.0
+        self._postings = {}    # term -> {key: weighted tf}
+        self._vocab = []       # sorted terms for prefix expansion
+
+    # ---------- Index maintenance ----------
+    def _index_doc(self, key, item):
+        terms = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for tok in tokenize(item.get(field)):
+                terms[tok] = terms.get(tok, 0.0) + weight
+        length = sum(terms.values())
+        self._doc_terms[key] = terms
+        self._doc_len[key] = length
+        self._total_len += length
+        for term, tf in terms.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                i = bisect_left(self._vocab, term)
+                self._vocab.insert(i, term)
+            posting[key] = tf
+
+    def _unindex_doc(self, key):
+        for term in self._doc_terms.pop(key, {}):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(key, None)
+            if not posting:
+                del self._postings[term]
+                i = bisect_left(self._vocab, term)
+                if i < len(self._vocab) and self._vocab[i] == term:
+                    del self._vocab[i]
+        self._total_len -= self._doc_len.pop(key, 0.0)
+
+    def update(self, items):
+        """
+        Bring the index in line with a new catalog, re-indexing only items
+        that were added, removed or changed. Returns the number re-indexed.
+        """
+        with self._lock:
+            new_docs = {}
+            order = []
+            for item in items or []:
+                if not isinstance(item, dict):
+                    continue
+                key = item_key(item)
+                if key in new_docs:
+                    continue
+                new_docs[key] = item
+                order.append(key)
+
+            changed = 0
+            for key in list(self._docs):
+                if key not in new_docs:
+                    self._unindex_doc(key)
+                    self._fingerprints.pop(key, None)
+                    changed += 1
+            for key, item in new_docs.items():
+                fp = _fingerprint(item)
+                if self._fingerprints.get(key) == fp:
+                    continue
+                if key in self._docs:
+                    self._unindex_doc(key)
+                self._index_doc(key, item)
+                self._fingerprints[key] = fp
+                changed += 1
+
+            self._docs = new_docs
+            self._rank = {key: i for i, key in enumerate(order)}
+            try:
+                self._mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                self._mtime = None
+            return changed
+
+    def _ensure_current(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[Catalog] Could not read {os.path.basename(self.path)}: {e}")
+            self._mtime = mtime
+            return
+        changed = self.update(items if isinstance(items, list) else [])
+        print(f"[Catalog] Indexed {len(self._docs)} items ({changed} updated)")
+
+    # ---------- Queries ----------
+    def _expand(self, token, allow_prefix):
+        """Terms matching a query token: itself, plus prefix completions if allowed."""
+        matches = {token: 1.0} if token in self._postings else {}
+        if allow_prefix:
+            i = bisect_left(self._vocab, token)
+            while i < len(self._vocab) and self._vocab[i].startswith(token):
+                matches.setdefault(self._vocab[i], PREFIX_WEIGHT)
+                i += 1
+        return matches
+
+    def search(self, query, limit=50):
+        """
+        Return up to `limit` items matching every query word, best first.
+
+        The last word also matches by prefix so partially typed queries work.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            self._ensure_current()
+            n_docs = len(self._docs)
+            if not n_docs:
+                return []
+            avg_len = (self._total_len / n_docs) or 1.0
+
+            # Score the most selective word first so later words only
+            # need to look at the surviving candidates
+            expanded = []
+            for pos, token in enumerate(tokens):
+                expansions = self._expand(token, allow_prefix=(pos == len(tokens) - 1))
+                if not expansions:
+                    return []
+                size = sum(len(self._postings[term]) for term in expansions)
+                expanded.append((size, expansions))
+            expanded.sort(key=lambda pair: pair[0])
+
+            def term_score(key, tf, boost, idf):
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * self._doc_len[key] / avg_len)
+                return boost * idf * tf * (BM25_K1 + 1) / norm
+
+            scores = None
+            for _size, expansions in expanded:
+                token_scores = {}
+                for term, boost in expansions.items():
+                    posting = self._postings[term]
+                    idf = math.log(1.0 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                    if scores is None or len(posting) <= len(scores):
+                        pairs = posting.items()
+                    else:
+                        pairs = ((key, posting[key]) for key in scores if key in posting)
+                    for key, tf in pairs:
+                        score = term_score(key, tf, boost, idf)
+                        if score > token_scores.get(key, 0.0):
+                            token_scores[key] = score
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {k: v + token_scores[k] for k, v in scores.items() if k in token_scores}
+                if not scores:
+                    return []
+
+            best = sorted(scores, key=lambda k: (-scores[k], self._rank.get(k, 0)))[:limit]
+            return [self._docs[key] for key in best]
+
+    def size(self):
+        with self._lock:
+            self._ensure_current()
+            return len(self._docs)
@@ -0,0 +1,358 @@
+"""
+CDP Client - One persistent, multiplexed Chrome DevTools connection per process.
+
+The control bar used to open a fresh WebSocket (after an HTTP tab listing)
+for every button press. CDPClient keeps a single browser-level WebSocket open
+instead and multiplexes everything over it:
+
+    * commands carry unique ids; a reader thread matches replies to callers,
+      so several commands can be in flight at once
+    * tabs are tracked from Target.targetCreated / targetInfoChanged /
+      targetDestroyed events, so finding "the video tab" needs no network
+    * page tabs are attached as flattened sessions (Target.attachToTarget
+      with flatten=true) as soon as they appear, so a command to a tab is a
+      single round trip
+    * events are dispatched to listeners registered with on()
+    * if Chrome goes away the next call reconnects (rate limited), and
+      in-flight calls fail fast instead of hanging
+
+Requires Chrome to be started with --remote-debugging-port=9222 and the
+websocket-client package; without them calls return None and callers fall
+back to keyboard input as before.
+
+Usage:
+    from cdp_client import get_client
+
+    cdp = get_client()
+    target = cdp.find_page("https://www.netflix.com/watch/...")
+    cdp.evaluate(target, "document.querySelector('video').paused")
+"""
+
+import itertools
+import json
+import threading
+import time
+import urllib.request
+
+try:
+    import websocket  # pip install websocket-client
+except Exception:
+    websocket = None
+
+CDP_PORT = 9222
+CALL_TIMEOUT = 2.0
+RECONNECT_INTERVAL = 1.0
+
+
+def normalize_url(url):
+    """Strip fragment, query and trailing slash for loose tab matching."""
+    base = str(url or "").split("#", 1)[0].split("?", 1)[0]
+    return base.rstrip("/")
+
+
+class _Pending:
+    __slots__ = ("event", "reply", "callback")
+
+    def __init__(self, callback=None):
+        self.event = threading.Event()
+        self.reply = None
+        self.callback = callback
+
+
+class CDPClient:
+    """Browser-level DevTools connection with per-tab flattened sessions."""
+
+    def __init__(self, port=CDP_PORT):
+        self.port = port
+        self._lock = threading.RLock()
+        self._send_lock = threading.Lock()
+        self._ws = None
+        self._reader = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._targets = {}     # targetId -> targetInfo (pages only)
+        self._sessions = {}    # targetId -> sessionId
+        self._listeners = {}   # event method -> [callback(params, session_id)]
+        self._session_hooks = []  # callback(target_id, session_id) after attaching
+        self._last_attempt = 0.0
+
+    # ---------- Connection ----------
+    def _browser_ws_url(self):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/json/version", timeout=0.5) as resp:
+                return json.loads(resp.read().decode("utf-8")).get("webSocketDebuggerUrl")
+        except Exception:
+            return None
+
+    def connected(self):
+        return self._ws is not None
+
+    def ensure_connected(self):
+        """Connect if needed (at most once per RECONNECT_INTERVAL). Returns True if connected."""
+        if self._ws is not None:
+            return True
+        if websocket is None:
+            return False
+        with self._lock:
+            if self._ws is not None:
+                return True
+            now = time.monotonic()
+            if now - self._last_attempt < RECONNECT_INTERVAL:
+                return False
+            self._last_attempt = now
+            url = self._browser_ws_url()
+            if not url:
+                return False
+            try:
+                ws = websocket.create_connection(url, timeout=CALL_TIMEOUT, suppress_origin=True)
+                ws.settimeout(None)
+            except Exception as e:
+                print(f"[CDP] Connect failed: {e}")
+                return False
+            self._ws = ws
+            self._targets.clear()
+            self._sessions.clear()
+            self._reader = threading.Thread(target=self._read_loop, args=(ws,), daemon=True)
+            self._reader.start()
+        # Existing tabs arrive as targetCreated events right after this
+        self.call("Target.setDiscoverTargets", {"discover": True})
+        return True
+
+    def _disconnect(self, ws):
+        with self._lock:
+            if self._ws is not ws:
+                return
+            self._ws = None
+            self._targets.clear()
+            self._sessions.clear()
+            pending, self._pending = self._pending, {}
+        for slot in pending.values():
+            slot.reply = {"error": {"message": "disconnected"}}
+            slot.event.set()
+            if slot.callback:
+                self._safe(slot.callback, slot.reply)
+        try:
+            ws.close()
+        except Exception:
+            pass
+
+    def close(self):
+        ws = self._ws
+        if ws is not None:
+            self._disconnect(ws)
+
+    # ---------- Reader / dispatch ----------
+    def _read_loop(self, ws):
+        while True:
+            try:
+                raw = ws.recv()
+            except Exception:
+                break
+            if not raw:
+                break
+            try:
+                msg = json.loads(raw)
+            except ValueError:
+                continue
+            if "id" in msg:
+                with self._lock:
+                    slot = self._pending.pop(msg["id"], None)
+                if slot:
+                    slot.reply = msg
+                    slot.event.set()
+                    if slot.callback:
+                        self._safe(slot.callback, msg)
+            elif "method" in msg:
+                self._dispatch(msg["method"], msg.get("params", {}), msg.get("sessionId"))
+        self._disconnect(ws)
+
+    @staticmethod
+    def _safe(fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"[CDP] Listener error: {e}")
+
+    def _dispatch(self, method, params, session_id):
+        if method in ("Target.targetCreated", "Target.targetInfoChanged"):
+            self._track_target(params.get("targetInfo", {}))
+        elif method == "Target.targetDestroyed":
+            with self._lock:
+                self._targets.pop(params.get("targetId"), None)
+                self._sessions.pop(params.get("targetId"), None)
+        elif method == "Target.detachedFromTarget":
+            with self._lock:
+                for target_id, sid in list(self._sessions.items()):
+                    if sid == params.get("sessionId"):
+                        del self._sessions[target_id]
+        for callback in list(self._listeners.get(method, ())):
+            self._safe(callback, params, session_id)
+
+    def _track_target(self, info):
+        if info.get("type") != "page":
+            return
+        target_id = info.get("targetId")
+        url = info.get("url", "")
+        if url.startswith(("devtools://", "chrome-extension://")):
+            return
+        with self._lock:
+            self._targets[target_id] = info
+            attached = target_id in self._sessions
+        if not attached:
+            # Attach ahead of time so the first command is a single round trip
+            self.call_async("Target.attachToTarget", {"targetId": target_id, "flatten": True},
+                            callback=lambda reply, t=target_id: self._on_attached(t, reply))
+
+    def _on_attached(self, target_id, reply):
+        session_id = (reply.get("result") or {}).get("sessionId")
+        if not session_id:
+            return
+        with self._lock:
+            if target_id not in self._targets:
+                return
+            self._sessions[target_id] = session_id
+        for hook in list(self._session_hooks):
+            self._safe(hook, target_id, session_id)
+
+    # ---------- Commands ----------
+    def _send(self, method, params, session_id, slot):
+        if not self.ensure_connected():
+            return None
+        msg_id = next(self._ids)
+        payload = {"id": msg_id, "method": method}
+        if params:
+            payload["params"] = params
+        if session_id:
+            payload["sessionId"] = session_id
+        with self._lock:
+            ws = self._ws
+            if ws is None:
+                return None
+            self._pending[msg_id] = slot
+        try:
+            with self._send_lock:
+                ws.send(json.dumps(payload))
+        except Exception:
+            with self._lock:
+                self._pending.pop(msg_id, None)
+            self._disconnect(ws)
+            return None
+        return msg_id
+
+    def call(self, method, params=None, session_id=None, timeout=CALL_TIMEOUT):
+        """Send a command and wait for its reply. Returns the result dict, or None on error/timeout."""
+        slot = _Pending()
+        msg_id = self._send(method, params, session_id, slot)
+        if msg_id is None:
+            return None
+        if not slot.event.wait(timeout):
+            with self._lock:
+                self._pending.pop(msg_id, None)
+            return None
+        if not slot.reply or "error" in slot.reply:
+            return None
+        return slot.reply.get("result", {})
+
+    def call_async(self, method, params=None, session_id=None, callback=None):
+        """Send a command without waiting; callback(reply) runs on the reader thread."""
+        return self._send(method, params, session_id, _Pending(callback)) is not None
+
+    def on(self, method, callback):
+        """Register callback(params, session_id) for a DevTools event."""
+        self._listeners.setdefault(method, []).append(callback)
+
+    def on_session(self, callback):
+        """Register callback(target_id, session_id), run whenever a page session is attached."""
+        self._session_hooks.append(callback)
+        with self._lock:
+            existing = list(self._sessions.items())
+        for target_id, session_id in existing:
+            self._safe(callback, target_id, session_id)
+
+    # ---------- Tabs ----------
+    def pages(self):
+        """Tracked page targets (targetInfo dicts)."""
+        self.ensure_connected()
+        with self._lock:
+            return list(self._targets.values())
+
+    def find_page(self, url_hint=None):
+        """targetId of the tab matching url_hint (else the first page), or None."""
+        pages = self.pages()
+        if url_hint:
+            base = normalize_url(url_hint)
+            for info in pages:
+                u = normalize_url(info.get("url", ""))
+                if base and (u == base or u.startswith(base)):
+                    return info["targetId"]
+        # Prefer a real site over the hub page / blank tabs
+        for info in pages:
+            if info.get("url", "").startswith(("http://", "https://")) and "localhost" not in info.get("url", ""):
+                return info["targetId"]
+        return pages[0]["targetId"] if pages else None
+
+    def page_url(self, target_id):
+        with self._lock:
+            info = self._targets.get(target_id)
+        return info.get("url") if info else None
+
+    def target_for_session(self, session_id):
+        """targetId a flattened session belongs to (for routing session events)."""
+        with self._lock:
+            for target_id, sid in self._sessions.items():
+                if sid == session_id:
+                    return target_id
+        return None
+
+    def session(self, target_id):
+        """sessionId for a page, attaching now if the eager attach hasn't finished."""
+        if not target_id:
+            return None
+        with self._lock:
+            session_id = self._sessions.get(target_id)
+        if session_id:
+            return session_id
+        result = self.call("Target.attachToTarget", {"targetId": target_id, "flatten": True})
+        session_id = (result or {}).get("sessionId")
+        if session_id:
+            self._on_attached(target_id, {"result": {"sessionId": session_id}})
+        return session_id
+
+    def page_call(self, target_id, method, params=None, timeout=CALL_TIMEOUT):
+        """Command to one tab. Returns the result dict or None."""
+        session_id = self.session(target_id)
+        if not session_id:
+            return None
+        return self.call(method, params, session_id=session_id, timeout=timeout)
+
+    def page_send(self, target_id, method, params=None):
+        """Fire-and-forget command to one tab (pipelined, no wait)."""
+        session_id = self.session(target_id)
+        return bool(session_id) and self.call_async(method, params, session_id=session_id)
+
+    def evaluate(self, target_id, expression, await_promise=False, timeout=CALL_TIMEOUT):
+        """
+        Evaluate JS in a tab. Returns (ok, value): ok is False if the tab is
+        unreachable or the script threw.
+        """
+        result = self.page_call(target_id, "Runtime.evaluate", {
+            "expression": expression,
+            "awaitPromise": await_promise,
+            "returnByValue": True,
+        }, timeout=timeout)
+        if result is None or "exceptionDetails" in result:
+            return False, None
+        return True, result.get("result", {}).get("value")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client(port=CDP_PORT):
+    """The process-wide CDPClient (created on first use)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = CDPClient(port)
+        return _client
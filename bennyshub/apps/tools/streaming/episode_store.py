@@ -0,0 +1,355 @@
+"""
+Episode Store - Indexed, lazily loaded episode catalog for the streaming server.
+
+episodes.json stays the editable source of truth. The first time it is seen
+(or whenever its mtime/size changes) it is copied into a small SQLite file with
+an index on the normalized show title. Requests then load just one show's
+seasons on demand and keep recently used shows in an LRU, so startup time and
+memory stay flat however many shows the catalog holds.
+
+Each show also gets a linear episode order (seasons in order, specials in
+season 0 left out) assigned when the index is built, so "next" and
+"previous" episode lookups are a single array step.
+
+Usage:
+    from episode_store import EpisodeStore, normalize_show
+
+    store = EpisodeStore("episodes.json", "data/episodes.sqlite")
+    seasons = store.get_show("Bluey")   # {1: [{season, episode, title, url}, ...]}
+
+Migrating the legacy spreadsheet ahead of time (pandas is only needed here):
+    python episode_store.py --migrate data/EPISODE_SELECTION.xlsx episodes.json
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+SCHEMA_VERSION = 2
+DEFAULT_CACHE_SIZE = 32
+
+
+def normalize_show(title):
+    """Normalize a show title for lookups (lowercase, trimmed)."""
+    return str(title or "").lower().strip()
+
+
+def _pick_column(cols, *names):
+    for name in names:
+        if name in cols:
+            return cols[name]
+    return None
+
+
+def migrate_excel_to_json(xlsx_path, json_path):
+    """
+    Convert the legacy EPISODE_SELECTION.xlsx sheet into episodes.json.
+
+    Cleaning, type conversion and sorting run as column operations in pandas;
+    the nested {show: {season: [episode, ...]}} dict is then built in one pass
+    over the sorted records. pandas is imported here rather than at module
+    level so normal server startups never pay for it.
+
+    Returns the number of shows written, or None if the sheet is unusable.
+    """
+    import pandas as pd
+
+    df = pd.read_excel(xlsx_path)
+    cols = {str(c).lower().strip(): c for c in df.columns}
+
+    # Map columns
+    show_col = _pick_column(cols, "show title", "show", "title", "series")
+    season_col = _pick_column(cols, "season number", "season")
+    episode_col = _pick_column(cols, "episode number", "episode")
+    title_col = _pick_column(cols, "episode title", "title")
+    url_col = _pick_column(cols, "disneyplusurl", "episode url", "url")
+
+    if not (show_col and season_col and episode_col and title_col and url_col):
+        print("[Episodes] Missing columns in Excel")
+        return None
+
+    frame = pd.DataFrame({
+        "show": df[show_col].fillna("").astype(str).str.strip().str.lower(),
+        "season": pd.to_numeric(df[season_col], errors="coerce"),
+        "episode": pd.to_numeric(df[episode_col], errors="coerce"),
+        "title": df[title_col].fillna("").astype(str).str.strip(),
+        "url": df[url_col].fillna("").astype(str).str.strip(),
+    })
+    frame = frame[(frame["show"] != "") & frame["season"].notna() & frame["episode"].notna()]
+    frame = frame.astype({"season": "int64", "episode": "int64"})
+    frame = frame.sort_values(["show", "season", "episode"], kind="stable")
+
+    catalog = {}
+    for show, season, episode, title, url in zip(
+        frame["show"].tolist(), frame["season"].tolist(), frame["episode"].tolist(),
+        frame["title"].tolist(), frame["url"].tolist(),
+    ):
+        catalog.setdefault(show, {}).setdefault(season, []).append({
+            "season": season,
+            "episode": episode,
+            "title": title,
+            "url": url,
+        })
+
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, indent=2)
+    os.replace(tmp_path, json_path)
+    return len(catalog)
+
+
+class EpisodeStore:
+    """SQLite-backed episode catalog with a per-show LRU cache."""
+
+    def __init__(self, json_path, db_path, cache_size=DEFAULT_CACHE_SIZE):
+        self.json_path = json_path
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._conn = None
+        self._cache = OrderedDict()
+        self._checked_source = None
+
+    # ---------- Index maintenance ----------
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # Older layout - drop it; refresh() rebuilds from episodes.json
+                self._conn.executescript("""
+                    DROP TABLE IF EXISTS meta;
+                    DROP TABLE IF EXISTS episodes;
+                """)
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS episodes (
+                    show_key TEXT NOT NULL,
+                    season INTEGER NOT NULL,
+                    episode INTEGER NOT NULL,
+                    title TEXT,
+                    url TEXT,
+                    position INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS idx_episodes_show
+                    ON episodes (show_key, season, episode);
+            """)
+        return self._conn
+
+    def _source_signature(self):
+        try:
+            st = os.stat(self.json_path)
+        except OSError:
+            return None
+        return f"{SCHEMA_VERSION}:{st.st_mtime_ns}:{st.st_size}"
+
+    def refresh(self):
+        """
+        Rebuild the SQLite index if episodes.json changed since the last build.
+
+        Cheap when nothing changed (one stat + one meta lookup). Returns True
+        if the index was rebuilt.
+        """
+        with self._lock:
+            signature = self._source_signature()
+            if signature is None or signature == self._checked_source:
+                return False
+            conn = self._connect()
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+            if row and row[0] == signature:
+                self._checked_source = signature
+                return False
+
+            with open(self.json_path, "r", encoding="utf-8") as f:
+                raw_data = json.load(f)
+
+            rows = []
+            for show, seasons in raw_data.items():
+                key = normalize_show(show)
+                if not key or not isinstance(seasons, dict):
+                    continue
+                for season_key, episodes in seasons.items():
+                    try:
+                        season = int(season_key)
+                    except (TypeError, ValueError):
+                        print(f"[Episodes] Warning: Non-integer season key '{season_key}' in '{show}'")
+                        continue
+                    for ep in episodes or []:
+                        try:
+                            number = int(ep.get("episode"))
+                        except (TypeError, ValueError, AttributeError):
+                            continue
+                        rows.append((key, season, number, str(ep.get("title", "")), str(ep.get("url", ""))))
+
+            # Linear order per show: seasons then episodes, skipping specials (season 0)
+            rows.sort(key=lambda r: (r[0], r[1], r[2]))
+            positioned = []
+            last_show, position = None, 0
+            for row in rows:
+                if row[0] != last_show:
+                    last_show, position = row[0], 0
+                if row[1] > 0:
+                    positioned.append(row + (position,))
+                    position += 1
+                else:
+                    positioned.append(row + (None,))
+
+            with conn:
+                conn.execute("DELETE FROM episodes")
+                conn.executemany(
+                    "INSERT INTO episodes (show_key, season, episode, title, url, position) VALUES (?, ?, ?, ?, ?, ?)",
+                    positioned,
+                )
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)", (signature,))
+            self._cache.clear()
+            self._checked_source = signature
+            print(f"[Episodes] Indexed {len(rows)} episodes from {os.path.basename(self.json_path)}")
+            return True
+
+    # ---------- Queries ----------
+    def _load_show(self, key):
+        """Cached per-show entry: seasons, linear order and lookup maps."""
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        entry = {"seasons": {}, "linear": [], "by_episode": {}, "by_url": {}}
+        cursor = self._connect().execute(
+            "SELECT season, episode, title, url, position FROM episodes "
+            "WHERE show_key = ? ORDER BY season, episode",
+            (key,),
+        )
+        for season, episode, title, url, position in cursor:
+            ep = {"season": season, "episode": episode, "title": title, "url": url}
+            entry["seasons"].setdefault(season, []).append(ep)
+            if position is not None:
+                entry["linear"].append(ep)
+                entry["by_episode"][(season, episode)] = position
+                if url:
+                    entry["by_url"].setdefault(url, position)
+
+        self._cache[key] = entry
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return entry
+
+    def _entry(self, show_title):
+        key = normalize_show(show_title)
+        if not key:
+            return None
+        self.refresh()
+        if self._checked_source is None:
+            # No episodes.json yet - nothing to serve
+            return None
+        return self._load_show(key)
+
+    def get_show(self, show_title):
+        """
+        Return {season: [episode, ...]} for one show, or {} if unknown.
+
+        Episodes are sorted by episode number within each season.
+        """
+        with self._lock:
+            entry = self._entry(show_title)
+            return entry["seasons"] if entry else {}
+
+    def position(self, show_title, season=None, episode=None, url=None):
+        """Linear index of an episode (by season/episode, else by URL), or None."""
+        with self._lock:
+            entry = self._entry(show_title)
+            if not entry:
+                return None
+            try:
+                found = entry["by_episode"].get((int(season), int(episode)))
+            except (TypeError, ValueError):
+                found = None
+            if found is None and url:
+                found = entry["by_url"].get(url)
+            return found
+
+    def resolve(self, show_title, record=None, step=1):
+        """
+        Resolve the episode `step` places after (or before, if negative) the
+        one in a last-watched record.
+
+        Returns {"current", "episode", "index", "total", "has_record"}:
+        "current" is the record's episode (None if it isn't in the index) and
+        "episode" the target (None past either end). Only when there is no
+        record at all ("has_record" false) does "next" start at the first
+        episode; a record that can't be placed gives no target.
+        """
+        with self._lock:
+            entry = self._entry(show_title)
+            linear = entry["linear"] if entry else []
+            result = {"current": None, "episode": None, "index": None, "total": len(linear),
+                      "has_record": bool(record)}
+            if not linear:
+                return result
+
+            current = None
+            record = record or {}
+            hint = record.get("linear_index")
+            if isinstance(hint, int) and 0 <= hint < len(linear):
+                ep = linear[hint]
+                if ep["season"] == record.get("season") and ep["episode"] == record.get("episode"):
+                    current = hint
+            if current is None:
+                current = self.position(show_title, record.get("season"), record.get("episode"), record.get("url"))
+
+            if current is None:
+                target = 0 if step > 0 and not result["has_record"] else None
+            else:
+                result["current"] = linear[current]
+                target = current + step
+            if target is not None and 0 <= target < len(linear):
+                result["episode"] = linear[target]
+                result["index"] = target
+            return result
+
+    def show_count(self):
+        """Number of distinct shows in the index."""
+        with self._lock:
+            self.refresh()
+            if self._checked_source is None:
+                return 0
+            return self._connect().execute("SELECT COUNT(DISTINCT show_key) FROM episodes").fetchone()[0]
+
+    def invalidate(self):
+        """Forget cached shows and force the next query to re-check episodes.json."""
+        with self._lock:
+            self._cache.clear()
+            self._checked_source = None
+
+
+def main():
+    """Command-line entry point for migrating the Excel sheet ahead of time."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Episode catalog tools")
+    parser.add_argument("--migrate", nargs="*", metavar="PATH",
+                        help="Convert XLSX [JSON] to episodes.json "
+                             "(defaults: data/EPISODE_SELECTION.xlsx episodes.json)")
+    args = parser.parse_args()
+
+    if args.migrate is None:
+        parser.print_help()
+        return
+
+    xlsx_path = args.migrate[0] if len(args.migrate) > 0 else os.path.join(here, "data", "EPISODE_SELECTION.xlsx")
+    json_path = args.migrate[1] if len(args.migrate) > 1 else os.path.join(here, "episodes.json")
+    if not os.path.exists(xlsx_path):
+        print(f"[Episodes] Episode file not found: {xlsx_path}")
+        sys.exit(1)
+
+    count = migrate_excel_to_json(xlsx_path, json_path)
+    if count is None:
+        sys.exit(1)
+    print(f"[Episodes] Migrated {count} shows to {json_path}")
+
+
+if __name__ == "__main__":
+    main()
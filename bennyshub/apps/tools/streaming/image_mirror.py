@@ -0,0 +1,227 @@
+"""
+Image Mirror - Local, content-addressed copies of catalog posters and service icons.
+
+Every tile in the streaming grid used to load its poster from image.tmdb.org
+on each visit. ImageMirror downloads every `image` and `service_icon`
+referenced by data.json in the background and stores each one under the
+SHA-256 of its bytes, so identical images are kept once. The server serves
+them from /img/<hash> and rewrites catalog URLs to match; images that are
+not mirrored yet keep their remote URL, so nothing breaks while the first
+prefetch runs.
+
+The cache is capped in size and evicts the least recently served images.
+index.json maps remote URLs to hashes and records last use.
+
+Usage:
+    from image_mirror import ImageMirror
+
+    mirror = ImageMirror("data/image_cache")
+    mirror.prefetch_catalog(items)        # background download
+    items = mirror.rewrite(items)         # image URLs -> /img/<hash> where mirrored
+    path, content_type = mirror.get(hash) # for serving /img/<hash>
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+DOWNLOAD_TIMEOUT = 15
+DOWNLOAD_WORKERS = 4
+SAVE_DELAY = 2.0
+VERSION_INTERVAL = 30.0   # during a long prefetch, publish new images at most this often
+IMAGE_FIELDS = ("image", "service_icon")
+URL_PREFIX = "/img/"
+
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+    "image/svg+xml": ".svg",
+    "image/avif": ".avif",
+}
+
+
+class ImageMirror:
+    """Size-capped, LRU-evicted local mirror of remote catalog images."""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._urls = {}      # remote url -> content hash
+        self._blobs = {}     # content hash -> {"size", "type", "last_used"}
+        self._failed = set() # urls that failed this session (not retried until restart)
+        self._pending = set()
+        self._save_timer = None
+        self.version = 0     # bumped when mirrored URLs change: once per prefetch batch (or VERSION_INTERVAL)
+        self._changed = False
+        self._version_at = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="img-mirror")
+        self._load_index()
+
+    # ---------- Index ----------
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        blobs = data.get("blobs") or {}
+        # Drop entries whose file went missing
+        self._blobs = {h: b for h, b in blobs.items() if os.path.exists(self._blob_path(h, b.get("type")))}
+        self._urls = {u: h for u, h in (data.get("urls") or {}).items() if h in self._blobs}
+
+    def _schedule_save(self):
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(SAVE_DELAY, self._save_index)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _save_index(self):
+        with self._lock:
+            self._save_timer = None
+            payload = {"urls": dict(self._urls), "blobs": {h: dict(b) for h, b in self._blobs.items()}}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"[Images] Could not save index: {e}")
+
+    def _blob_path(self, content_hash, content_type):
+        return os.path.join(self.cache_dir, content_hash + EXTENSIONS.get(content_type, ".img"))
+
+    # ---------- Downloading ----------
+    def _download(self, url):
+        try:
+            req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0 (StreamingHub image mirror)"})
+            with urllib.request.urlopen(req, timeout=DOWNLOAD_TIMEOUT) as resp:
+                content_type = (resp.headers.get("Content-Type") or "").split(";")[0].strip().lower()
+                if not content_type.startswith("image/"):
+                    raise ValueError(f"not an image ({content_type or 'no content type'})")
+                body = resp.read(MAX_IMAGE_BYTES + 1)
+            if len(body) > MAX_IMAGE_BYTES:
+                raise ValueError("image too large")
+        except Exception as e:
+            with self._lock:
+                self._pending.discard(url)
+                self._failed.add(url)
+                self._bump_version()
+            print(f"[Images] Failed {url[:80]}: {e}")
+            return
+
+        content_hash = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(content_hash, content_type)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self._pending.discard(url)
+            self._urls[url] = content_hash
+            blob = self._blobs.setdefault(content_hash, {"size": len(body), "type": content_type})
+            blob["last_used"] = time.time()
+            self._evict()
+            self._changed = True
+            self._bump_version()
+            self._schedule_save()
+
+    def _bump_version(self):
+        # Called under the lock. Rewritten catalog views are keyed on version,
+        # so bump it once a batch finishes rather than for every image.
+        if not self._changed:
+            return
+        now = time.monotonic()
+        if self._pending and now - self._version_at < VERSION_INTERVAL:
+            return
+        self.version += 1
+        self._changed = False
+        self._version_at = now
+
+    def _evict(self):
+        total = sum(b["size"] for b in self._blobs.values())
+        if total <= self.max_bytes:
+            return
+        for content_hash in sorted(self._blobs, key=lambda h: self._blobs[h].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            blob = self._blobs.pop(content_hash)
+            total -= blob["size"]
+            try:
+                os.remove(self._blob_path(content_hash, blob.get("type")))
+            except OSError:
+                pass
+        self._urls = {u: h for u, h in self._urls.items() if h in self._blobs}
+
+    def prefetch(self, urls):
+        """Queue downloads for remote URLs not mirrored yet. Returns how many were queued."""
+        queued = 0
+        with self._lock:
+            for url in urls:
+                if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+                    continue
+                if url in self._urls or url in self._failed or url in self._pending:
+                    continue
+                self._pending.add(url)
+                self._executor.submit(self._download, url)
+                queued += 1
+        if queued:
+            print(f"[Images] Prefetching {queued} images")
+        return queued
+
+    def prefetch_catalog(self, items):
+        """Queue every poster and service icon referenced by catalog items."""
+        urls = []
+        for item in items or []:
+            if isinstance(item, dict):
+                urls.extend(item.get(field) for field in IMAGE_FIELDS)
+        return self.prefetch(urls)
+
+    # ---------- Serving ----------
+    def local_url(self, url):
+        """/img/<hash> for a mirrored URL, else None."""
+        with self._lock:
+            content_hash = self._urls.get(url)
+        return URL_PREFIX + content_hash if content_hash else None
+
+    def rewrite(self, items):
+        """Copies of catalog items with mirrored image URLs pointed at /img/<hash>."""
+        rewritten = []
+        with self._lock:
+            for item in items or []:
+                if isinstance(item, dict):
+                    local = {f: self._urls[item[f]] for f in IMAGE_FIELDS if item.get(f) in self._urls}
+                    if local:
+                        item = dict(item)
+                        for field, content_hash in local.items():
+                            item[field] = URL_PREFIX + content_hash
+                rewritten.append(item)
+        return rewritten
+
+    def get(self, content_hash):
+        """(file path, content type) for a mirrored image, or None. Marks it recently used."""
+        if not _HASH_RE.match(content_hash or ""):
+            return None
+        with self._lock:
+            blob = self._blobs.get(content_hash)
+            if not blob:
+                return None
+            blob["last_used"] = time.time()
+            self._schedule_save()
+            return self._blob_path(content_hash, blob.get("type")), blob.get("type")
@@ -0,0 +1,193 @@
+"""
+Key Sequence - Send a platform's post-navigation keys to a tab over DevTools.
+
+After opening an episode the control bar presses a short, per-platform key
+sequence (Plex: x, enter, p, f; most sites just f). Pressing them as OS key
+events only works while Chrome has focus, and the fixed sleeps between keys
+are either too long or, on a slow load, too short. run_key_sequence() sends
+the keys with Input.dispatchKeyEvent on the shared CDPClient instead:
+
+    * keys go to the tab itself, so focus doesn't matter
+    * consecutive keys without conditions are pipelined in one burst
+    * a step can wait for a DOM condition before its key is pressed, and
+      can be skipped when a condition already holds; the wait runs as one
+      awaited promise in the page, so it returns as soon as the page is ready
+
+A step is a key name ("f", "enter", "space") or a dict:
+
+    {"key": "f", "wait": "video", "skip": "fullscreen", "timeout": 5}
+
+"wait" and "skip" take a name from CONDITIONS or any JS expression. A wait
+that times out just moves on, as the old fixed sleep would have.
+wait_for_condition() runs the same in-page wait on its own.
+
+Usage:
+    from cdp_client import get_client
+    from key_sequence import run_key_sequence
+
+    cdp = get_client()
+    steps = ["x", {"key": "enter", "wait": "quiet"}, {"key": "f", "skip": "fullscreen"}]
+    done = run_key_sequence(cdp, cdp.find_page(url), steps)
+    # steps[done:] were not delivered (DevTools went away) - press them some other way
+"""
+
+import time
+
+STEP_TIMEOUT = 3.0     # default per-step wait, seconds
+QUIET_MS = 250         # "quiet": no DOM mutations for this long
+
+# name -> (DOM key, DOM code, Windows virtual-key code, text)
+_SPECIAL_KEYS = {
+    "enter": ("Enter", "Enter", 0x0D, "\r"),
+    "return": ("Enter", "Enter", 0x0D, "\r"),
+    "space": (" ", "Space", 0x20, " "),
+    "escape": ("Escape", "Escape", 0x1B, ""),
+    "esc": ("Escape", "Escape", 0x1B, ""),
+    "tab": ("Tab", "Tab", 0x09, ""),
+}
+
+# Named conditions. `last` is the time of the most recent DOM mutation.
+CONDITIONS = {
+    "video": "!!document.querySelector('video')",
+    "video_ready": "Array.from(document.querySelectorAll('video')).some((v) => v.readyState >= 2)",
+    "playing": "(() => { const v = document.querySelector('video'); return !!v && !v.paused; })()",
+    "fullscreen": "!!document.fullscreenElement",
+    "quiet": "Date.now() - last >= %d" % QUIET_MS,
+}
+
+# Resolves "skip" if the skip condition holds, "ready" once the wait
+# condition holds, or "timeout". Polling happens inside the page.
+_STEP_JS = """
+new Promise((resolve) => {
+  let last = Date.now();
+  const test = (fn) => { try { return !!fn(); } catch (e) { return false; } };
+  const skip = () => (%(skip)s);
+  const ready = () => (%(wait)s);
+  if (test(skip)) { resolve('skip'); return; }
+  const observer = new MutationObserver(() => { last = Date.now(); });
+  observer.observe(document.documentElement || document, { childList: true, subtree: true, attributes: true });
+  const start = Date.now();
+  const timer = setInterval(() => {
+    const ok = test(ready);
+    if (ok || Date.now() - start >= %(timeout_ms)d) {
+      clearInterval(timer);
+      observer.disconnect();
+      resolve(ok ? 'ready' : 'timeout');
+    }
+  }, 50);
+})
+"""
+
+
+def key_info(name):
+    """(key, code, vk, text) for a step's key name, or None if unsupported."""
+    k = str(name or "").lower()
+    if k in _SPECIAL_KEYS:
+        return _SPECIAL_KEYS[k]
+    if len(k) == 1 and "a" <= k <= "z":
+        return (k, "Key" + k.upper(), ord(k.upper()), k)
+    if len(k) == 1 and "0" <= k <= "9":
+        return (k, "Digit" + k, ord(k), k)
+    return None
+
+
+def vk_for(name):
+    """Windows virtual-key code for a step's key name (for the OS-key fallback)."""
+    info = key_info(name)
+    return info[2] if info else None
+
+
+def normalize_steps(steps):
+    """Steps as dicts with key/wait/skip/timeout."""
+    out = []
+    for step in steps or []:
+        if isinstance(step, dict):
+            out.append({"key": step.get("key"), "wait": step.get("wait"),
+                        "skip": step.get("skip"), "timeout": step.get("timeout", STEP_TIMEOUT)})
+        else:
+            out.append({"key": step, "wait": None, "skip": None, "timeout": STEP_TIMEOUT})
+    return out
+
+
+def describe_steps(steps):
+    """Short text form for logs, e.g. "x, enter (quiet), f (video, unless fullscreen)"."""
+    parts = []
+    for step in normalize_steps(steps):
+        notes = [n for n in (step["wait"], step["skip"] and f"unless {step['skip']}") if n]
+        parts.append(f"{step['key']} ({', '.join(notes)})" if notes else str(step["key"]))
+    return ", ".join(parts)
+
+
+def _condition(value, default):
+    if not value:
+        return default
+    return CONDITIONS.get(value, value)
+
+
+def _key_events(info):
+    key, code, vk, text = info
+    down = {"type": "keyDown", "key": key, "code": code, "windowsVirtualKeyCode": vk, "keyCode": vk}
+    if text:
+        down["text"] = down["unmodifiedText"] = text
+    return down, {"type": "keyUp", "key": key, "code": code, "windowsVirtualKeyCode": vk, "keyCode": vk}
+
+
+def wait_for_condition(client, target_id, condition, timeout=STEP_TIMEOUT):
+    """
+    Wait in the page until condition (a CONDITIONS name or JS expression)
+    holds. Returns True when it did, False on timeout, None if the tab
+    couldn't be evaluated. Retries while a navigation replaces the document.
+    """
+    if not client or not target_id:
+        return None
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        js = _STEP_JS % {"skip": "false", "wait": _condition(condition, "true"),
+                         "timeout_ms": int(remaining * 1000)}
+        ok, outcome = client.evaluate(target_id, js, await_promise=True, timeout=remaining + 1.0)
+        if ok and outcome in ("ready", "timeout"):
+            return outcome == "ready"
+        if not client.connected():
+            return None
+        # Context destroyed by the navigation - try again in the new document
+        time.sleep(0.1)
+
+
+def run_key_sequence(client, target_id, steps):
+    """
+    Press steps in a tab over DevTools. Returns how many steps were handled
+    (pressed or skipped); anything after that index was not delivered.
+    """
+    steps = normalize_steps(steps)
+    if not client or not target_id:
+        return 0
+    for done, step in enumerate(steps):
+        info = key_info(step["key"])
+        if info is None:
+            print(f"[PostNav] Skipping unsupported key {step['key']!r}")
+            continue
+        if step["wait"] or step["skip"]:
+            timeout = float(step["timeout"] or STEP_TIMEOUT)
+            js = _STEP_JS % {
+                "skip": _condition(step["skip"], "false"),
+                "wait": _condition(step["wait"], "true"),
+                "timeout_ms": int(timeout * 1000),
+            }
+            ok, outcome = client.evaluate(target_id, js, await_promise=True, timeout=timeout + 1.0)
+            if not ok:
+                return done
+            if outcome == "skip":
+                print(f"[PostNav] '{step['key']}' skipped ({step['skip']})")
+                continue
+            if outcome == "timeout":
+                print(f"[PostNav] Timed out waiting for {step['wait']} before '{step['key']}'")
+        down, up = _key_events(info)
+        # Pipelined: keys with no condition between them go out back to back
+        if not (client.page_send(target_id, "Input.dispatchKeyEvent", down) and
+                client.page_send(target_id, "Input.dispatchKeyEvent", up)):
+            return done
+        print(f"[PostNav] Pressed '{step['key']}' via DevTools")
+    return len(steps)
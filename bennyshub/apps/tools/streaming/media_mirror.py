@@ -0,0 +1,118 @@
+"""
+Media Mirror - Live playback state of every Chrome tab, pushed over DevTools.
+
+Instead of evaluating JS in the page to ask whether the video is playing,
+MediaMirror installs a small observer in each tab the CDPClient attaches to:
+
+    Runtime.addBinding                     exposes window.__hubMedia(json)
+    Page.addScriptToEvaluateOnNewDocument  re-installs the observer after navigations
+    Runtime.evaluate                       installs it in the document already loaded
+
+The observer reports play, pause, volumechange, fullscreenchange and ended
+(plus a one-off "sync" when it starts) through the binding. Each call
+arrives as a Runtime.bindingCalled event on the shared connection, so state
+changes reach the control bar as they happen with no round trips.
+
+Usage:
+    from cdp_client import get_client
+    from media_mirror import MediaMirror
+
+    mirror = MediaMirror(get_client())
+    mirror.on_change(lambda target_id, event, state: print(event, state["paused"]))
+    mirror.state()   # {"paused": False, "volume": 0.8, "fullscreen": True, ...}
+"""
+
+import json
+import threading
+
+BINDING_NAME = "__hubMedia"
+MEDIA_EVENTS = ("play", "pause", "volumechange", "fullscreenchange", "ended")
+
+# Media events don't bubble, so listen in the capture phase on the document.
+_OBSERVER_JS = """
+(() => {
+  if (window.__hubMediaObserver) return;
+  window.__hubMediaObserver = true;
+  const send = (event, target) => {
+    const v = (target && target.tagName === 'VIDEO') ? target : document.querySelector('video');
+    try {
+      window.%(binding)s(JSON.stringify({
+        event: event,
+        hasVideo: !!v,
+        paused: v ? v.paused : null,
+        volume: v ? Math.round(v.volume * 100) / 100 : null,
+        muted: v ? v.muted : null,
+        fullscreen: !!document.fullscreenElement,
+        currentTime: v ? Math.round(v.currentTime) : null,
+        duration: (v && isFinite(v.duration)) ? Math.round(v.duration) : null,
+        url: location.href
+      }));
+    } catch (e) {}
+  };
+  ['play', 'pause', 'volumechange', 'ended'].forEach((name) =>
+    document.addEventListener(name, (e) => send(name, e.target), true));
+  document.addEventListener('fullscreenchange', () => send('fullscreenchange'), true);
+  if (document.querySelector('video')) send('sync');
+})();
+""" % {"binding": BINDING_NAME}
+
+
+class MediaMirror:
+    """Per-tab media state kept current from page-pushed binding calls."""
+
+    def __init__(self, client):
+        self.client = client
+        self._lock = threading.Lock()
+        self._states = {}      # targetId -> last state dict
+        self._callbacks = []   # callback(target_id, event, state)
+        self._last_target = None
+        client.on("Runtime.bindingCalled", self._on_binding)
+        client.on("Target.targetDestroyed", self._on_destroyed)
+        client.on_session(self._install)
+
+    def _install(self, target_id, session_id):
+        # Runs on the client's reader thread, so only pipelined sends here
+        send = self.client.call_async
+        send("Runtime.enable", session_id=session_id)
+        send("Page.enable", session_id=session_id)
+        send("Runtime.addBinding", {"name": BINDING_NAME}, session_id=session_id)
+        send("Page.addScriptToEvaluateOnNewDocument", {"source": _OBSERVER_JS}, session_id=session_id)
+        send("Runtime.evaluate", {"expression": _OBSERVER_JS}, session_id=session_id)
+
+    def _on_binding(self, params, session_id):
+        if params.get("name") != BINDING_NAME:
+            return
+        try:
+            state = json.loads(params.get("payload") or "{}")
+        except ValueError:
+            return
+        target_id = self.client.target_for_session(session_id)
+        if not target_id or not isinstance(state, dict):
+            return
+        event = state.pop("event", "sync")
+        with self._lock:
+            self._states[target_id] = state
+            self._last_target = target_id
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback(target_id, event, state)
+            except Exception as e:
+                print(f"[Media] Callback error: {e}")
+
+    def _on_destroyed(self, params, _session_id):
+        with self._lock:
+            self._states.pop(params.get("targetId"), None)
+            if self._last_target == params.get("targetId"):
+                self._last_target = None
+
+    def on_change(self, callback):
+        """Register callback(target_id, event, state); runs on the DevTools reader thread."""
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def state(self, target_id=None):
+        """Last known state for a tab (default: the tab that reported most recently), or None."""
+        with self._lock:
+            state = self._states.get(target_id or self._last_target)
+            return dict(state) if state else None
@@ -0,0 +1,347 @@
+"""
+Page Automation - Wait for a streaming page to actually be ready via Chrome DevTools.
+
+The hub launches Chrome with --remote-debugging-port=9222, so the tab that
+open_link_logic opens can be watched over the DevTools Protocol instead of
+guessed at with fixed sleeps. PageWatcher attaches to the tab whose URL
+matches the one just opened, then waits for real events:
+
+    wait_for_load()     Page.loadEventFired (or readyState already "complete")
+    wait_for_settled()  the DOM has stopped changing (single-page apps like
+                        Plex keep building their UI long after "load")
+    wait_for_video()    a <video> element exists and its readyState is high enough
+
+The settle and video waits run as single awaited promises inside the page,
+driven by a MutationObserver (and media events), so they return as soon as
+the page is ready. Every wait has a timeout; when DevTools is unreachable (no
+websocket-client, Chrome started without the debugging port) the waits fall
+back to sleeping for the old fixed delays so automation still works.
+
+Usage:
+    from page_automation import PageWatcher
+
+    page = PageWatcher("https://pluto.tv/...", on_step=lambda step, ok, secs: ...)
+    page.wait_for_load(timeout=15, fallback=7)
+    page.wait_for_settled(quiet=1.0, timeout=15)
+    page.wait_for_video(timeout=20, fallback=6)
+    page.close()
+"""
+
+import json
+import time
+import urllib.request
+from urllib.parse import urlparse
+
+try:
+    import websocket  # pip install websocket-client
+except Exception:
+    websocket = None
+
+CDP_PORT = 9222
+ATTACH_TIMEOUT = 5.0   # how long to look for the new tab before giving up on CDP
+POLL_INTERVAL = 0.1
+
+# HTMLMediaElement.readyState values
+HAVE_METADATA = 1
+HAVE_CURRENT_DATA = 2
+HAVE_ENOUGH_DATA = 4
+
+# Resolves true once a <video> reaches the wanted readyState, false on timeout.
+# Media events don't bubble, so listen in the capture phase on the document.
+_VIDEO_READY_JS = """
+new Promise((resolve) => {
+  const want = %(ready_state)d;
+  let done = false, observer = null, timer = null;
+  const events = ['loadedmetadata', 'loadeddata', 'canplay', 'canplaythrough', 'playing'];
+  const finish = (ok) => {
+    if (done) return;
+    done = true;
+    if (observer) observer.disconnect();
+    if (timer) clearTimeout(timer);
+    events.forEach((e) => document.removeEventListener(e, check, true));
+    resolve(ok);
+  };
+  const check = () => {
+    for (const v of document.querySelectorAll('video')) {
+      if (v.readyState >= want) { finish(true); return; }
+    }
+  };
+  events.forEach((e) => document.addEventListener(e, check, true));
+  observer = new MutationObserver(check);
+  observer.observe(document.documentElement || document, { childList: true, subtree: true });
+  timer = setTimeout(() => finish(false), %(timeout_ms)d);
+  check();
+})
+"""
+
+# Resolves true once the DOM has had no mutations for quiet_ms (and, if given,
+# `selector` matches), false on timeout.
+_SETTLED_JS = """
+new Promise((resolve) => {
+  const quiet = %(quiet_ms)d, selector = %(selector)s;
+  let last = Date.now();
+  const observer = new MutationObserver(() => { last = Date.now(); });
+  observer.observe(document.documentElement || document, { childList: true, subtree: true, attributes: true });
+  const start = Date.now();
+  const timer = setInterval(() => {
+    const present = !selector || !!document.querySelector(selector);
+    const ok = present && Date.now() - last >= quiet;
+    if (ok || Date.now() - start >= %(timeout_ms)d) {
+      clearInterval(timer);
+      observer.disconnect();
+      resolve(ok);
+    }
+  }, 50);
+})
+"""
+
+
+def _host(url):
+    try:
+        host = urlparse(url).netloc.lower()
+    except Exception:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def list_tabs(port=CDP_PORT, timeout=0.4):
+    """Page targets from the DevTools HTTP endpoint ([] if unreachable)."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/list", timeout=timeout) as resp:
+            tabs = json.loads(resp.read().decode("utf-8"))
+    except Exception:
+        return []
+    return [t for t in tabs if t.get("type") == "page" and t.get("webSocketDebuggerUrl")]
+
+
+class CDPSession:
+    """Minimal blocking DevTools connection: commands by id, events buffered."""
+
+    def __init__(self, ws_url, timeout=2.0):
+        self._ws = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+        self._next_id = 0
+        self._events = []
+
+    def _recv(self, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        self._ws.settimeout(remaining)
+        try:
+            return json.loads(self._ws.recv())
+        except websocket.WebSocketTimeoutException:
+            return None
+
+    def call(self, method, params=None, timeout=2.0):
+        """Send a command and return its reply ({"result": ...} or {"error": ...}), or None on timeout."""
+        self._next_id += 1
+        msg_id = self._next_id
+        payload = {"id": msg_id, "method": method}
+        if params:
+            payload["params"] = params
+        self._ws.send(json.dumps(payload))
+        deadline = time.monotonic() + timeout
+        while True:
+            msg = self._recv(deadline)
+            if msg is None:
+                return None
+            if msg.get("id") == msg_id:
+                return msg
+            if "method" in msg:
+                self._events.append(msg)
+
+    def wait_event(self, method, timeout):
+        """Return the params of the next `method` event (buffered ones first), or None on timeout."""
+        for i, msg in enumerate(self._events):
+            if msg.get("method") == method:
+                del self._events[i]
+                return msg.get("params", {})
+        deadline = time.monotonic() + timeout
+        while True:
+            msg = self._recv(deadline)
+            if msg is None:
+                return None
+            if msg.get("method") == method:
+                return msg.get("params", {})
+            if "method" in msg:
+                self._events.append(msg)
+
+    def evaluate(self, expression, timeout=2.0):
+        """Evaluate JS (awaiting promises); returns the value, or None if it failed."""
+        reply = self.call("Runtime.evaluate", {
+            "expression": expression,
+            "awaitPromise": True,
+            "returnByValue": True,
+        }, timeout=timeout)
+        if not reply or "error" in reply:
+            return None
+        result = reply.get("result", {})
+        if "exceptionDetails" in result:
+            return None
+        return result.get("result", {}).get("value")
+
+    def close(self):
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+
+class PageWatcher:
+    """
+    Event-driven readiness checks for the tab showing `url`, with sleep fallbacks.
+
+    on_step(step, ok, seconds) is called after each wait ("page_load",
+    "page_settled", "video_ready") so callers can report progress.
+    """
+
+    def __init__(self, url, port=CDP_PORT, attach_timeout=ATTACH_TIMEOUT, on_step=None):
+        self.url = url
+        self.port = port
+        self.attach_timeout = attach_timeout
+        self.on_step = on_step
+        self.session = None
+        self._attached = False
+        self._started = time.monotonic()
+
+    def _report(self, step, ok, start):
+        if self.on_step:
+            try:
+                self.on_step(step, ok, round(time.monotonic() - start, 2))
+            except Exception:
+                pass
+
+    def _find_tab(self):
+        host = _host(self.url)
+        tabs = list_tabs(self.port)
+        for tab in tabs:
+            if tab.get("url") == self.url:
+                return tab
+        for tab in tabs:
+            if host and _host(tab.get("url", "")) == host:
+                return tab
+        return None
+
+    def attach(self):
+        """Connect to the tab once it shows up. Returns True if DevTools is usable."""
+        if self._attached:
+            return self.session is not None
+        self._attached = True
+        if websocket is None:
+            print("[CDP] websocket-client not installed; using fixed delays")
+            return False
+        deadline = self._started + self.attach_timeout
+        while True:
+            tab = self._find_tab()
+            if tab:
+                try:
+                    self.session = CDPSession(tab["webSocketDebuggerUrl"])
+                    self.session.call("Page.enable")
+                    print(f"[CDP] Attached to {tab.get('url', '')[:80]}")
+                    return True
+                except Exception as e:
+                    print(f"[CDP] Could not attach: {e}")
+                    self.session = None
+                    return False
+            if time.monotonic() >= deadline:
+                print("[CDP] Tab not found on DevTools port; using fixed delays")
+                return False
+            time.sleep(POLL_INTERVAL)
+
+    def _fallback(self, seconds, start):
+        # Time spent in this wait looking for the tab counts against its delay
+        remaining = seconds - (time.monotonic() - start)
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def wait_for_load(self, timeout=15.0, fallback=5.0):
+        """Wait for the page's load event. Returns True if it was observed."""
+        start = time.monotonic()
+        if not self.attach():
+            self._fallback(fallback, start)
+            self._report("page_load", False, start)
+            return False
+        start = time.monotonic()
+        try:
+            if self.session.evaluate("document.readyState") == "complete":
+                self._report("page_load", True, start)
+                return True
+            loaded = self.session.wait_event("Page.loadEventFired", timeout) is not None
+        except Exception as e:
+            print(f"[CDP] Lost connection waiting for load: {e}")
+            self.close()
+            loaded = False
+        print(f"[CDP] Page {'loaded' if loaded else 'load timed out'} after {time.monotonic() - start:.1f}s")
+        self._report("page_load", loaded, start)
+        return loaded
+
+    def wait_for_settled(self, quiet=1.0, selector=None, timeout=15.0, fallback=0.0):
+        """
+        Wait until the DOM has been quiet for `quiet` seconds (and `selector`
+        matches, if given). Returns True if it settled before the timeout.
+        """
+        start = time.monotonic()
+        if not self.attach():
+            self._fallback(fallback, start)
+            self._report("page_settled", False, start)
+            return False
+        deadline = start + timeout
+        settled = False
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                js = _SETTLED_JS % {"quiet_ms": int(quiet * 1000), "selector": json.dumps(selector),
+                                    "timeout_ms": int(remaining * 1000)}
+                value = self.session.evaluate(js, timeout=remaining + 1.0)
+                if value is None:
+                    # Context destroyed by a navigation - try again in the new document
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                settled = bool(value)
+                break
+        except Exception as e:
+            print(f"[CDP] Lost connection waiting for the page to settle: {e}")
+            self.close()
+        print(f"[CDP] Page {'settled' if settled else 'still changing'} after {time.monotonic() - start:.1f}s")
+        self._report("page_settled", settled, start)
+        return settled
+
+    def wait_for_video(self, timeout=20.0, ready_state=HAVE_CURRENT_DATA, fallback=5.0):
+        """
+        Wait until a <video> on the page reaches `ready_state`. Returns True if
+        it did; re-arms across in-page navigations until the timeout.
+        """
+        start = time.monotonic()
+        if not self.attach():
+            self._fallback(fallback, start)
+            self._report("video_ready", False, start)
+            return False
+        start = time.monotonic()
+        deadline = start + timeout
+        ready = False
+        try:
+            while not ready:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                js = _VIDEO_READY_JS % {"ready_state": ready_state, "timeout_ms": int(remaining * 1000)}
+                value = self.session.evaluate(js, timeout=remaining + 1.0)
+                if value is None:
+                    # Context destroyed by a navigation - try again in the new document
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                ready = bool(value)
+                break
+        except Exception as e:
+            print(f"[CDP] Lost connection waiting for video: {e}")
+            self.close()
+        print(f"[CDP] Video {'ready' if ready else 'not ready'} after {time.monotonic() - start:.1f}s")
+        self._report("video_ready", ready, start)
+        return ready
+
+    def close(self):
+        if self.session:
+            self.session.close()
+            self.session = None
@@ -6,6 +6,8 @@ class PredictionSystem {
         this.customVocabulary = []; // From data.json (titles)
         this.recentSearches = [];   // From search_history.json
         this.frequentWords = {};    // Basic dictionary if needed
+        this.suggestEndpoint = null; // Server-ranked search history (standalone server only)
+        this.suggestRequest = null;  // In-flight suggestion fetch (aborted on next keystroke)
         
         // Initialize basic common words
         this.initBasicDictionary();
@@ -29,6 +31,28 @@ class PredictionSystem {
         console.log(`Prediction: Loaded ${this.recentSearches.length} recent searches.`);
     }
 
+    // Ask the streaming server for ranked history completions instead of
+    // downloading the whole history and filtering it here
+    enableServerSuggestions(endpoint) {
+        this.suggestEndpoint = endpoint;
+    }
+
+    async fetchServerSuggestions(input) {
+        if (this.suggestRequest) this.suggestRequest.abort();
+        const controller = new AbortController();
+        this.suggestRequest = controller;
+        try {
+            const res = await fetch(`${this.suggestEndpoint}?prefix=${encodeURIComponent(input)}&limit=6`, {
+                signal: controller.signal
+            });
+            return res.ok ? await res.json() : null;
+        } catch (e) {
+            return null; // Aborted by a newer keystroke or server unavailable
+        } finally {
+            if (this.suggestRequest === controller) this.suggestRequest = null;
+        }
+    }
+
     async getHybridPredictions(buffer) {
         const input = buffer.toUpperCase().trim();
         let predictions = [];
@@ -59,8 +83,13 @@ class PredictionSystem {
             predictions.push(...titleMatches);
         }
 
-        // 2. Recent Searches
-        if (input.length > 0) {
+        // 2. Recent Searches (server-ranked by recency and frequency when available)
+        const serverMatches = this.suggestEndpoint ? await this.fetchServerSuggestions(input) : null;
+        if (Array.isArray(serverMatches)) {
+            serverMatches.forEach(s => {
+                if (s && !predictions.includes(s)) predictions.push(s);
+            });
+        } else if (input.length > 0) {
              const searchMatches = this.recentSearches
                 .filter(term => {
                     const T = term.toUpperCase();
@@ -75,7 +104,7 @@ class PredictionSystem {
         }
 
         // 3. Fallback: Recent searches default (if input empty)
-        if (input.length === 0) {
+        if (input.length === 0 && !Array.isArray(serverMatches)) {
             // Show recent searches first
             [...this.recentSearches].reverse().forEach(s => {
                 if (!predictions.includes(s)) predictions.push(s);
@@ -0,0 +1,252 @@
+"""
+Progress Store - Last-watched positions shared by the streaming server and control bar.
+
+Records live in memory after the first read. Saves update that map and return
+immediately; a debounced timer writes the changed rows to a SQLite database in
+WAL mode, which several processes can read and write safely. Each row carries
+a millisecond timestamp and upserts only replace older rows, so concurrent
+writers never lose each other's updates.
+
+After every flush the full table is exported atomically to last_watched.json,
+the format the Electron hub and older tools read. Edits that the hub makes to
+that JSON file are merged back in when its mtime changes.
+
+Usage:
+    from progress_store import ProgressStore
+
+    store = ProgressStore("data/progress.sqlite", "data/last_watched.json")
+    store.set("Bluey", 2, 5, "https://www.disneyplus.com/...")
+    store.get("bluey")   # {"season": 2, "episode": 5, "url": ..., "timestamp": ...}
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_FLUSH_DELAY = 1.0
+
+
+def normalize_show(title):
+    """Normalize a show title the same way the hub does (lowercase, trimmed)."""
+    return str(title or "").lower().strip()
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class ProgressStore:
+    """In-memory last-watched map with write-behind SQLite persistence."""
+
+    def __init__(self, db_path, json_path=None, flush_delay=DEFAULT_FLUSH_DELAY):
+        self.db_path = db_path
+        self.json_path = json_path
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._conn = None
+        self._records = None          # show -> record, loaded on first use
+        self._dirty = set()
+        self._timer = None
+        self._data_version = None
+        self._json_mtime = None
+        atexit.register(self.flush)
+
+    # ---------- Storage ----------
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=5.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS progress (
+                    show TEXT PRIMARY KEY,
+                    season INTEGER,
+                    episode INTEGER,
+                    url TEXT,
+                    linear_index INTEGER,
+                    timestamp INTEGER NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def _read_rows(self):
+        rows = self._connect().execute(
+            "SELECT show, season, episode, url, linear_index, timestamp FROM progress ORDER BY timestamp"
+        )
+        records = {}
+        for show, season, episode, url, linear_index, timestamp in rows:
+            rec = {"season": season, "episode": episode, "url": url, "timestamp": timestamp}
+            if linear_index is not None:
+                rec["linear_index"] = linear_index
+            records[show] = rec
+        return records
+
+    def _current_data_version(self):
+        # Changes whenever another connection (e.g. the control bar) commits
+        return self._connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def _merge(self, show, rec):
+        """Adopt rec unless we already hold a newer (or pending) version."""
+        current = self._records.get(show)
+        if show in self._dirty and current is not None:
+            return False
+        if current is None or rec.get("timestamp", 0) > current.get("timestamp", 0):
+            self._records[show] = rec
+            return True
+        return False
+
+    def _sync_external(self):
+        """Pick up rows other processes committed and hub edits to the JSON file."""
+        if self._records is None:
+            self._records = self._read_rows()
+            self._data_version = self._current_data_version()
+            if not self._records:
+                self._import_json(force=True)
+            else:
+                self._import_json()
+            return
+
+        version = self._current_data_version()
+        if version != self._data_version:
+            self._data_version = version
+            for show, rec in self._read_rows().items():
+                self._merge(show, rec)
+        self._import_json()
+
+    def _import_json(self, force=False):
+        if not self.json_path:
+            return
+        try:
+            mtime = os.stat(self.json_path).st_mtime_ns
+        except OSError:
+            return
+        if not force and mtime == self._json_mtime:
+            return
+        self._json_mtime = mtime
+        try:
+            with open(self.json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+
+        # Entries without a timestamp keep their file order (oldest first)
+        base = _now_ms() - len(data) if force else 0
+        for i, (show, info) in enumerate(data.items()):
+            if isinstance(info, str):
+                info = {"url": info}  # legacy format (just url)
+            if not isinstance(info, dict):
+                continue
+            key = normalize_show(show)
+            rec = {
+                "season": info.get("season", -1),
+                "episode": info.get("episode", -1),
+                "url": info.get("url", ""),
+                "timestamp": int(info.get("timestamp") or base + i),
+            }
+            if info.get("linear_index") is not None:
+                rec["linear_index"] = info["linear_index"]
+            if self._merge(key, rec):
+                self._dirty.add(key)
+        if self._dirty:
+            self._schedule_flush()
+
+    # ---------- Public API ----------
+    def get(self, show_title=None):
+        """Return one show's record (or None), or every record oldest-first if no show is given."""
+        with self._lock:
+            self._sync_external()
+            if not show_title:
+                ordered = sorted(self._records.items(), key=lambda kv: kv[1].get("timestamp", 0))
+                return {show: dict(rec) for show, rec in ordered}
+            rec = self._records.get(normalize_show(show_title))
+            return dict(rec) if rec else None
+
+    def set(self, show_title, season, episode, url, linear_index=None, flush_now=False):
+        """
+        Record a position. Returns immediately; the write happens on the
+        debounced flush unless flush_now is set (for short-lived processes).
+        """
+        key = normalize_show(show_title)
+        if not key:
+            return
+        rec = {
+            "season": int(season) if season is not None else -1,
+            "episode": int(episode) if episode is not None else -1,
+            "url": url,
+            "timestamp": _now_ms(),
+        }
+        if linear_index is not None:
+            rec["linear_index"] = int(linear_index)
+        with self._lock:
+            if self._records is None:
+                self._sync_external()
+            self._records[key] = rec
+            self._dirty.add(key)
+            if not flush_now:
+                self._schedule_flush()
+        if flush_now:
+            self.flush()
+
+    def _schedule_flush(self):
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending rows to SQLite and export the JSON snapshot."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty or self._records is None:
+                return
+            pending = [(show, self._records[show]) for show in self._dirty if show in self._records]
+            self._dirty.clear()
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.executemany("""
+                        INSERT INTO progress (show, season, episode, url, linear_index, timestamp)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(show) DO UPDATE SET
+                            season = excluded.season,
+                            episode = excluded.episode,
+                            url = excluded.url,
+                            linear_index = excluded.linear_index,
+                            timestamp = excluded.timestamp
+                        WHERE excluded.timestamp >= progress.timestamp
+                    """, [
+                        (show, rec.get("season"), rec.get("episode"), rec.get("url"),
+                         rec.get("linear_index"), rec.get("timestamp", 0))
+                        for show, rec in pending
+                    ])
+                snapshot = self._read_rows()
+                self._data_version = self._current_data_version()
+            except sqlite3.Error as e:
+                print(f"[Progress] Error saving progress: {e}")
+                self._dirty.update(show for show, _ in pending)
+                self._schedule_flush()
+                return
+            for show, rec in snapshot.items():
+                self._merge(show, rec)
+            self._export_json(snapshot)
+
+    def _export_json(self, snapshot):
+        if not self.json_path:
+            return
+        tmp_path = f"{self.json_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(tmp_path, self.json_path)
+            self._json_mtime = os.stat(self.json_path).st_mtime_ns
+        except OSError as e:
+            print(f"[Progress] Error exporting {os.path.basename(self.json_path)}: {e}")
@@ -0,0 +1,176 @@
+"""
+Search History - Recency/frequency ranked search history with prefix suggestions.
+
+search_history.json keeps its original format (a list of terms, newest first)
+so the Electron hub can keep reading and writing it. Use counts and last-used
+times are kept alongside in search_history_stats.json.
+
+Every word of every term is kept in a sorted array, so a prefix lookup is a
+bisect over that array rather than a scan of the whole history. Matches are
+ranked by frecency: use count weighted by an exponential recency decay.
+
+Usage:
+    from search_history import SearchHistory
+
+    history = SearchHistory("search_history.json")
+    history.record("The Simpsons")
+    history.suggest("simp", limit=6)   # ["The Simpsons", ...]
+"""
+
+import heapq
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+
+MAX_ENTRIES = 50  # same cap the hub uses
+RECENCY_HALF_LIFE = 7 * 24 * 3600  # seconds
+
+
+def _key(term):
+    return " ".join(str(term or "").lower().split())
+
+
+class SearchHistory:
+    """In-memory search history with a bisect-based prefix index."""
+
+    def __init__(self, path, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.stats_path = os.path.splitext(path)[0] + "_stats.json"
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._entries = None     # key -> {"term", "count", "last"}
+        self._index = []         # sorted (word_suffix, key) pairs
+        self._mtime = None
+
+    # ---------- Loading / persistence ----------
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _ensure_loaded(self):
+        """Load on first use, and reload if another process rewrote the file."""
+        mtime = self._file_mtime()
+        if self._entries is not None and mtime == self._mtime:
+            return
+        self._mtime = mtime
+
+        terms = []
+        if mtime is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    terms = json.load(f)
+            except (OSError, ValueError):
+                terms = []
+        stats = {}
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        now = time.time()
+        self._entries = {}
+        self._index = []
+        # File is newest first; without stats, space them a second apart
+        for i, term in enumerate(terms if isinstance(terms, list) else []):
+            if not isinstance(term, str) or not term.strip():
+                continue
+            key = _key(term)
+            if key in self._entries:
+                continue
+            info = stats.get(key) or {}
+            self._add(key, {
+                "term": term.strip(),
+                "count": int(info.get("count", 1)),
+                "last": float(info.get("last", now - i)),
+            })
+
+    def _save(self):
+        ordered = sorted(self._entries.values(), key=lambda e: e["last"], reverse=True)
+        stats = {_key(e["term"]): {"count": e["count"], "last": e["last"]} for e in ordered}
+        for path, payload in ((self.stats_path, stats), (self.path, [e["term"] for e in ordered])):
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(tmp_path, path)
+        self._mtime = self._file_mtime()
+
+    # ---------- Index maintenance ----------
+    @staticmethod
+    def _suffixes(key):
+        words = key.split(" ")
+        return {" ".join(words[i:]) for i in range(len(words))}
+
+    def _add(self, key, entry):
+        self._entries[key] = entry
+        for suffix in self._suffixes(key):
+            insort(self._index, (suffix, key))
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        for suffix in self._suffixes(key):
+            i = bisect_left(self._index, (suffix, key))
+            if i < len(self._index) and self._index[i] == (suffix, key):
+                del self._index[i]
+
+    # ---------- Public API ----------
+    def terms(self):
+        """All terms, newest first (the legacy /api/search_history payload)."""
+        with self._lock:
+            self._ensure_loaded()
+            ordered = sorted(self._entries.values(), key=lambda e: e["last"], reverse=True)
+            return [e["term"] for e in ordered]
+
+    def record(self, term):
+        """Record a search: bump its count and move it to the front."""
+        term = str(term or "").strip()
+        key = _key(term)
+        if not key:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+            if entry:
+                entry["term"] = term
+                entry["count"] += 1
+                entry["last"] = time.time()
+            else:
+                self._add(key, {"term": term, "count": 1, "last": time.time()})
+                if len(self._entries) > self.max_entries:
+                    oldest = min(self._entries, key=lambda k: self._entries[k]["last"])
+                    self._remove(oldest)
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._index = []
+            self._save()
+
+    def _score(self, entry, now):
+        age = max(0.0, now - entry["last"])
+        return (1.0 + math.log(entry["count"])) * (0.5 ** (age / RECENCY_HALF_LIFE))
+
+    def suggest(self, prefix, limit=6):
+        """
+        Top `limit` terms with a word starting with `prefix`, best first.
+
+        An empty prefix returns the highest-ranked terms overall.
+        """
+        prefix = _key(prefix)
+        with self._lock:
+            self._ensure_loaded()
+            if prefix:
+                lo = bisect_left(self._index, (prefix,))
+                hi = bisect_left(self._index, (prefix + "\uffff",))
+                keys = {key for _, key in self._index[lo:hi] if key != prefix}
+            else:
+                keys = self._entries.keys()
+            now = time.time()
+            best = heapq.nlargest(limit, keys, key=lambda k: self._score(self._entries[k], now))
+            return [self._entries[k]["term"] for k in best]
@@ -11,7 +11,6 @@ import json
 import os
 import sys
 import subprocess
-import pandas as pd
 import time
 import threading
 import pyautogui
@@ -20,7 +19,15 @@ import win32con
 import psutil
 from psutil import process_iter
 from pynput.keyboard import Controller as KeyboardController
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qs, unquote
+from episode_store import EpisodeStore, migrate_excel_to_json
+from progress_store import ProgressStore
+from search_history import SearchHistory
+from catalog_index import CatalogIndex
+from page_automation import PageWatcher, HAVE_METADATA
+from asset_cache import AssetCache, safe_join
+from image_mirror import ImageMirror
+from catalog_facets import CatalogFacets
 import pynput # Ensure pynput is imported if we use it, otherwise skip
 import win32api
 import win32process
@@ -35,6 +42,17 @@ CHROME_PATH = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
 
 # Shared directory (for scan-manager.js and voice-manager.js)
 SHARED_DIR = os.path.abspath(os.path.join(DIRECTORY, "..", "..", "..", "shared"))
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+from http_metrics import RequestMetrics, MetricsHandlerMixin, get_logger  # noqa: E402
+from event_bus import EventBus, stream_events  # noqa: E402
+
+# Request metrics (served at /api/metrics) and leveled logging (HUB_LOG_LEVEL)
+log = get_logger("Streaming")
+METRICS = RequestMetrics()
+
+# Push channel for the page (/api/events): launch, automation, playback, progress
+EVENTS = EventBus()
 
 # --- Hub Window Management ---
 def find_hub_window():
@@ -143,13 +161,16 @@ def force_foreground_window(window_title_fragment):
         print(f"[FOCUS] Error: {e}")
     return False
 
-def launch_control_bar(mode="basic", show_title=None, delay=0.0):
+def launch_control_bar(mode="basic", show_title=None, delay=0.0, post_nav_done=False):
     try:
         cmd = [sys.executable, CONTROL_BAR_PATH, "--mode", mode, "--app-title", "Streaming Hub"]
         if show_title:
             cmd += ["--show", show_title]
         if delay > 0:
             cmd += ["--delay", str(delay)]
+        if post_nav_done:
+            # The platform's keys were already pressed; the bar must not replay them
+            cmd += ["--post-nav-done"]
         subprocess.Popen(cmd)
         print(f"Launched control bar: {cmd}")
     except Exception as e:
@@ -186,6 +207,7 @@ def open_link_logic(title, url, ctype):
     Handles: Plex, YouTube, PlutoTV, Paramount+, Amazon, trailers, and generic services.
     """
     print(f"Opening: {title} | {url} | Type: {ctype}")
+    EVENTS.publish("launch", {"title": title, "url": url, "type": ctype})
     
     # Kill any existing control bar first
     kill_control_bar()
@@ -201,36 +223,67 @@ def open_link_logic(title, url, ctype):
         except Exception as e:
             print(f"[FOCUS] Click failed: {e}")
     
+    def run_automation(name, steps, bar_delay=1.0):
+        """
+        Run a platform's automation in the background, then show the control
+        bar as soon as it finishes rather than after a fixed delay.
+        """
+        def _run():
+            started = time.monotonic()
+
+            def report(step, ok=True, seconds=None, **extra):
+                data = {"title": title, "platform": name, "step": step, "ok": ok,
+                        "elapsed": round(time.monotonic() - started, 2)}
+                if seconds is not None:
+                    data["seconds"] = seconds
+                data.update(extra)
+                EVENTS.publish("automation", data)
+
+            page = PageWatcher(url, on_step=report)
+            report("started")
+            done = False
+            try:
+                steps(page)
+                done = True
+                report("finished")
+            except Exception as e:
+                print(f"[{name}] Automation error: {e}")
+                report("failed", ok=False, error=str(e))
+            finally:
+                page.close()
+                launch_control_bar("basic", show_title=title, delay=bar_delay, post_nav_done=done)
+        threading.Thread(target=_run, daemon=True).start()
+
     # --- TRAILERS (YouTube links launched as trailers) ---
     # Treat trailers the same as YouTube
     if ctype == "trailer" or (("youtube.com" in url or "youtu.be" in url) and ctype == "trailer"):
         open_in_chrome(url)
         
-        def _automate_trailer():
-            print(f"[TRAILER] Waiting for YouTube page load...")
-            time.sleep(5)
+        def _automate_trailer(page):
+            print(f"[TRAILER] Waiting for YouTube player...")
+            page.wait_for_video(timeout=15, ready_state=HAVE_METADATA, fallback=5)
             
             force_foreground_window("YouTube")
             force_foreground_window("Chrome")
             click_to_focus()
             
-            time.sleep(0.5)
-            
             # YouTube: 'f' for fullscreen
             print("[TRAILER] Sending 'f' to fullscreen...")
             pyautogui.press('f')
             
-        threading.Thread(target=_automate_trailer, daemon=True).start()
-        launch_control_bar("basic", show_title=title, delay=10.0)
+        run_automation("TRAILER", _automate_trailer)
         return  # Exit early so it doesn't fall through to other handlers
     
     # --- PLEX ---
     if "plex.tv" in url or "plex.direct" in url:
         open_in_chrome(url)
 
-        def _automate_plex():
+        def _automate_plex(page):
             print(f"[PLEX] Waiting for page load...")
-            time.sleep(7)
+            page.wait_for_load(timeout=20, fallback=7)
+            # Plex is a single-page app: "load" fires long before its UI is
+            # built, so wait for the DOM to stop changing before pressing keys
+            page.wait_for_settled(quiet=1.0, timeout=15)
             
             # Force Chrome/Plex to foreground
             force_foreground_window("Plex")
@@ -245,27 +298,27 @@ def open_link_logic(title, url, ctype):
             time.sleep(1)
             pyautogui.press('p')  # 'p' plays the video
             
-            # Wait for video to start, then fullscreen the Plex player
-            time.sleep(2)
+            # Fullscreen the Plex player once the video is actually playable
+            page.wait_for_video(timeout=15, fallback=2)
             print("[PLEX] Sending 'f' to fullscreen the player...")
             pyautogui.press('f')
             
-        threading.Thread(target=_automate_plex, daemon=True).start()
-        launch_control_bar("basic", show_title=title, delay=14.0)  # Increased delay to account for extra steps
+        run_automation("PLEX", _automate_plex)
         
     # --- PLUTO TV ---
     elif "pluto.tv" in url:
         open_in_chrome(url)
         
-        def _automate_pluto():
+        def _automate_pluto(page):
             print(f"[PLUTO] Waiting for page load...")
-            time.sleep(7)
+            page.wait_for_load(timeout=20, fallback=7)
             
             force_foreground_window("Pluto")
             force_foreground_window("Chrome")
             click_to_focus()
             
-            time.sleep(6)  # Extra wait for video player
+            # Wait for the video player instead of a fixed 6 s
+            page.wait_for_video(timeout=20, fallback=6)
             
             # PlutoTV sequence: m (unmute) -> f (fullscreen)
             print("[PLUTO] Sending 'm' to unmute...")
@@ -282,37 +335,33 @@ def open_link_logic(title, url, ctype):
             
             print("[PLUTO] Automation complete.")
             
-        threading.Thread(target=_automate_pluto, daemon=True).start()
-        launch_control_bar("basic", show_title=title, delay=16.0)
+        run_automation("PLUTO", _automate_pluto)
 
     # --- YOUTUBE ---
     elif "youtube.com" in url or "youtu.be" in url:
         open_in_chrome(url)
         
-        def _automate_youtube():
-            print(f"[YOUTUBE] Waiting for page load...")
-            time.sleep(5)
+        def _automate_youtube(page):
+            print(f"[YOUTUBE] Waiting for YouTube player...")
+            page.wait_for_video(timeout=15, ready_state=HAVE_METADATA, fallback=5)
             
             force_foreground_window("YouTube")
             force_foreground_window("Chrome")
             click_to_focus()
             
-            time.sleep(0.5)
-            
             # YouTube: 'f' for fullscreen
             print("[YOUTUBE] Sending 'f' to fullscreen...")
             pyautogui.press('f')
             
-        threading.Thread(target=_automate_youtube, daemon=True).start()
-        launch_control_bar("basic", show_title=title, delay=10.0)
+        run_automation("YOUTUBE", _automate_youtube)
 
     # --- PARAMOUNT+ / AMAZON (need click to dismiss overlays) ---
     elif "paramountplus.com" in url or "amazon.com" in url or "primevideo.com" in url:
         open_in_chrome(url)
         
-        def _automate_click():
+        def _automate_click(page):
             print(f"[CLICK-SERVICE] Waiting for page load...")
-            time.sleep(5)
+            page.wait_for_load(timeout=15, fallback=5)
             
             force_foreground_window("Chrome")
             click_to_focus()
@@ -324,19 +373,16 @@ def open_link_logic(title, url, ctype):
                 print(f"[CLICK-SERVICE] Clicked center: ({sw//2}, {sh//2})")
             except: pass
             
-            time.sleep(2)
-            
-        threading.Thread(target=_automate_click, daemon=True).start()
-        launch_control_bar("basic", show_title=title, delay=8.0)
+        run_automation("CLICK-SERVICE", _automate_click)
 
     # --- NETFLIX / DISNEY+ / HULU / MAX / OTHER ---
     else:
         # These services auto-play and auto-fullscreen when you navigate to watch URLs
         open_in_chrome(url)
         
-        def _automate_generic():
+        def _automate_generic(page):
             print(f"[GENERIC] Waiting for page load...")
-            time.sleep(5)
+            page.wait_for_load(timeout=15, fallback=5)
             force_foreground_window("Chrome")
             click_to_focus()
             # F11 removed: Chrome is already launched with --start-fullscreen. 
@@ -346,47 +392,22 @@ def open_link_logic(title, url, ctype):
             #     print("[GENERIC] Sent F11 for browser fullscreen")
             # except: pass
             
-        threading.Thread(target=_automate_generic, daemon=True).start()
-        launch_control_bar("basic", show_title=title, delay=6.0)
+        run_automation("GENERIC", _automate_generic)
 
-# Cache for episodes
-EPISODE_CACHE = {}
+# Indexed episode store (episodes.json -> SQLite, loaded per show on demand)
+EPISODES_JSON = os.path.join(DIRECTORY, "episodes.json")
+EPISODE_DB = os.path.join(DATA_DIR, "episodes.sqlite")
+EPISODE_STORE = EpisodeStore(EPISODES_JSON, EPISODE_DB)
 
 def load_episode_catalog():
-    """Load episodes from JSON (preferred) or Excel into memory."""
-    global EPISODE_CACHE
-    
-    # Check for JSON first
-    json_path = os.path.join(DIRECTORY, "episodes.json")
+    """Prepare the episode store: migrate from Excel if needed, then (re)build the index."""
+    json_path = EPISODES_JSON
     if os.path.exists(json_path):
         try:
-            with open(json_path, 'r') as f:
-                # Load JSON but ensure integer keys for seasons
-                raw_data = json.load(f)
-                # Convert season keys back to integers for Python cache consistency (json keys are strings)
-                EPISODE_CACHE = {}
-                for show, seasons in raw_data.items():
-                    # Normalize show title to lowercase for reliable matching
-                    key = str(show).lower().strip()
-                    try:
-                        # Handle season keys that might be strings of ints
-                        params = {}
-                        for k, v in seasons.items():
-                            try:
-                                params[int(k)] = v
-                            except ValueError:
-                                # Keep string key if not int? or skip? 
-                                # Episodes usually need int seasons.
-                                print(f"Warning: Non-integer season key '{k}' in '{show}'")
-                                continue
-                        EPISODE_CACHE[key] = params
-                    except Exception as e:
-                        print(f"Error parsing show '{show}': {e}")
-                        
-            print(f"Loaded {len(EPISODE_CACHE)} shows from JSON.")
-            return
+            EPISODE_STORE.refresh()
         except Exception as e:
-            print(f"Error loading episodes.json: {e}")
+            print(f"Error indexing episodes.json: {e}")
+        return
 
     # Fallback to Excel
     if not os.path.exists(EPISODE_FILE):
@@ -395,174 +416,269 @@ def load_episode_catalog():
 
     try:
         print("Migrating/Loading from Excel...")
-        df = pd.read_excel(EPISODE_FILE)
-        cols = {c.lower().strip(): c for c in df.columns}
-        
-        # Map columns
-        show_col   = cols.get("show title") or cols.get("show") or cols.get("title") or cols.get("series")
-        season_col = cols.get("season number") or cols.get("season")
-        episode_col= cols.get("episode number") or cols.get("episode")
-        title_col  = cols.get("episode title") or cols.get("title")
-        url_col    = cols.get("disneyplusurl") or cols.get("episode url") or cols.get("url")
-
-        if not (show_col and season_col and episode_col and title_col and url_col):
-            print("Missing columns in Excel")
+        count = migrate_excel_to_json(EPISODE_FILE, json_path)
+        if count is None:
             return
-
-        EPISODE_CACHE = {}
-        for _, row in df.iterrows():
-            show = str(row[show_col]).strip()
-            if not show: continue
-            
-            try:
-                s_num = int(row[season_col])
-                e_num = int(row[episode_col])
-            except: continue
-            
-            title = str(row[title_col]).strip()
-            url = str(row[url_col]).strip() if pd.notna(row[url_col]) else ""
-
-            key = show.lower()
-            if key not in EPISODE_CACHE:
-                EPISODE_CACHE[key] = {}
-            if s_num not in EPISODE_CACHE[key]:
-                EPISODE_CACHE[key][s_num] = []
-                
-            EPISODE_CACHE[key][s_num].append({
-                "season": s_num,
-                "episode": e_num,
-                "title": title,
-                "url": url
-            })
-
-        # Sort
-        for show in EPISODE_CACHE:
-            for s in EPISODE_CACHE[show]:
-                EPISODE_CACHE[show][s].sort(key=lambda x: x['episode'])
-        
-        # Save to JSON for future use
-        try:
-            with open(json_path, 'w') as f:
-                json.dump(EPISODE_CACHE, f, indent=2)
-            print("Successfully migrated Excel to episodes.json")
-        except Exception as e:
-            print(f"Error saving to episodes.json: {e}")
-                
-        print(f"Loaded {len(EPISODE_CACHE)} shows.")
+        print("Successfully migrated Excel to episodes.json")
+        EPISODE_STORE.refresh()
+        print(f"Loaded {count} shows.")
     except Exception as e:
         print(f"Error loading episodes: {e}")
 
-# Initial load
-load_episode_catalog()
+# Initial load - runs in the background so the HTTP server can bind immediately;
+# requests that arrive first simply wait on the store's lock
+threading.Thread(target=load_episode_catalog, daemon=True).start()
+
+# Last-watched positions: in-memory map with debounced, cross-process-safe writes
+PROGRESS_DB = os.path.join(DATA_DIR, "progress.sqlite")
+PROGRESS_STORE = ProgressStore(PROGRESS_DB, LAST_WATCHED_FILE)
 
 def get_last_watched(show_title=None):
     try:
-        if os.path.exists(LAST_WATCHED_FILE):
-            with open(LAST_WATCHED_FILE, 'r') as f:
-                data = json.load(f)
-                if not show_title:
-                    return data # Return all data
-                info = data.get(show_title)
-                if isinstance(info, dict): return info
-                # Handle lagacy string format (just url)
-                if isinstance(info, str): return {"url": info}
-    except: pass
+        return PROGRESS_STORE.get(show_title)
+    except Exception as e:
+        print(f"Error reading last watched: {e}")
     return None
 
 def set_last_watched(show_title, season, episode, url):
     try:
-        data = {}
-        if os.path.exists(LAST_WATCHED_FILE):
-            with open(LAST_WATCHED_FILE, 'r') as f:
-                try: data = json.load(f)
-                except: pass
-        
-        # Remove existing to ensure most recent is at the end (Python 3.7+ dict order)
-        if show_title in data:
-            del data[show_title]
-
-        data[show_title] = {
-            "season": int(season) if season is not None else -1,
-            "episode": int(episode) if episode is not None else -1,
-            "url": url
-        }
-        
-        with open(LAST_WATCHED_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Remember the linear position so next/prev resolve without a search
+        linear_index = EPISODE_STORE.position(show_title, season, episode, url)
+        PROGRESS_STORE.set(show_title, season, episode, url, linear_index=linear_index)
+        EVENTS.publish("progress", {
+            "show": show_title, "season": season, "episode": episode,
+            "url": url, "linear_index": linear_index,
+        })
     except Exception as e:
         print(f"Error saving last watched: {e}")
 
-class Handler(http.server.SimpleHTTPRequestHandler):
+# Search history with a ranked prefix index for per-keystroke suggestions
+SEARCH_HISTORY = SearchHistory(os.path.join(DIRECTORY, "search_history.json"))
+
+# Full-text catalog search (inverted index over data.json)
+CATALOG_INDEX = CatalogIndex(os.path.join(DIRECTORY, "data.json"))
+
+# Local mirror of catalog posters / service icons, served from /img/<hash>
+IMAGE_MIRROR = ImageMirror(os.path.join(DATA_DIR, "image_cache"))
+
+def read_catalog():
+    try:
+        with open(os.path.join(DIRECTORY, "data.json"), "r", encoding="utf-8") as f:
+            items = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return items if isinstance(items, list) else []
+
+# Mirror anything new in the background so the dashboard renders from disk
+threading.Thread(target=lambda: IMAGE_MIRROR.prefetch_catalog(read_catalog()), daemon=True).start()
+
+# Precomputed menu views (type -> genre -> titles, services, recent) with ETags
+FACETS = CatalogFacets(
+    os.path.join(DIRECTORY, "data.json"),
+    os.path.join(DIRECTORY, "genres.json"),
+    transform=IMAGE_MIRROR.rewrite,
+    version_fn=lambda: IMAGE_MIRROR.version,
+)
+
+# Static assets (shared scripts, app js/css/html) kept in memory with gzip + ETag
+ASSET_CACHE = AssetCache()
+
+# Cache-Control per route: API responses are never stored, versioned assets
+# (?v=N, bumped on every change) are reused for a day, and everything else is
+# revalidated with its ETag / Last-Modified so unchanged files come back as 304.
+CACHE_NO_STORE = 'no-store, no-cache, must-revalidate, max-age=0'
+CACHE_REVALIDATE = 'no-cache'
+CACHE_VERSIONED = 'public, max-age=86400'
+CACHE_IMMUTABLE = 'public, max-age=31536000, immutable'
+
+def cache_policy(path, qs):
+    if path.startswith('/api/facets/'):
+        return CACHE_REVALIDATE  # ETag-validated, see _send_cached_json
+    if path.startswith('/api/'):
+        return CACHE_NO_STORE
+    if path.startswith('/img/'):
+        return CACHE_IMMUTABLE  # content-addressed, never changes
+    if 'v' in qs:
+        return CACHE_VERSIONED
+    return CACHE_REVALIDATE
+
+class Handler(MetricsHandlerMixin, http.server.SimpleHTTPRequestHandler):
+    _cache_policy = CACHE_NO_STORE
+    logger = log
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIRECTORY, **kwargs)
 
     def end_headers(self):
-        self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate, max-age=0')
-        self.send_header('Pragma', 'no-cache')
-        self.send_header('Expires', '0')
+        self.send_header('Cache-Control', self._cache_policy)
+        if self._cache_policy == CACHE_NO_STORE:
+            self.send_header('Pragma', 'no-cache')
+            self.send_header('Expires', '0')
         super().end_headers()
 
+    def _serve_asset(self, root, rel_path):
+        """Serve a cached text asset (304 if the client's copy is current). Returns False if not cacheable."""
+        asset = ASSET_CACHE.get(root, rel_path)
+        if asset is None:
+            return False
+        if asset.matches(self.headers.get('If-None-Match')):
+            self.send_response(304)
+            self.send_header('ETag', asset.etag)
+            self.end_headers()
+            return True
+        body, encoding = asset.body_for(self.headers.get('Accept-Encoding'))
+        self.send_response(200)
+        self.send_header('Content-type', asset.content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', asset.etag)
+        self.send_header('Last-Modified', self.date_time_string(asset.mtime))
+        if asset.gzip_body is not None:
+            self.send_header('Vary', 'Accept-Encoding')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+        return True
+
+    @METRICS.instrument
     def do_GET(self):
         parsed = urlparse(self.path)
         path = parsed.path
         qs = parse_qs(parsed.query)
         
-        print(f"[GET] Request path: {path}")  # Debug all requests
+        self._cache_policy = cache_policy(path, qs)
 
         # Serve shared files (scan-manager.js, voice-manager.js)
         if path.startswith('/shared/'):
-            # Extract filename from path
-            filename = path.replace('/shared/', '')
-            shared_file = os.path.join(SHARED_DIR, filename)
-            print(f"[Shared] Requested: {filename}, Full path: {shared_file}, Exists: {os.path.exists(shared_file)}")
-            if os.path.exists(shared_file):
+            filename = unquote(path[len('/shared/'):])
+            if self._serve_asset(SHARED_DIR, filename):
+                return
+            # Not a cached text type - send it as-is
+            shared_file = safe_join(SHARED_DIR, filename)
+            if shared_file and os.path.isfile(shared_file):
+                with open(shared_file, 'rb') as f:
+                    body = f.read()
                 self.send_response(200)
-                if filename.endswith('.js'):
-                    self.send_header('Content-type', 'application/javascript')
-                else:
-                    self.send_header('Content-type', 'text/plain')
+                self.send_header('Content-type', 'text/plain')
+                self.send_header('Content-Length', str(len(body)))
                 self.end_headers()
-                with open(shared_file, 'rb') as f:
-                    self.wfile.write(f.read())
-                return
+                self.wfile.write(body)
             else:
-                print(f"[Shared] File not found: {shared_file}")
+                self.send_error(404)
+            return
+
+        # Mirrored catalog images (content-addressed)
+        if path.startswith('/img/'):
+            found = IMAGE_MIRROR.get(path[len('/img/'):])
+            if not found:
+                self.send_error(404)
+                return
+            file_path, content_type = found
+            try:
+                with open(file_path, 'rb') as f:
+                    body = f.read()
+            except OSError:
                 self.send_error(404)
                 return
+            self.send_response(200)
+            self.send_header('Content-type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
 
         if path == '/api/episodes':
             raw_show = qs.get('show', [''])[0]
-            show = raw_show.lower().strip()
-            print(f"API Episode Request: '{raw_show}' -> '{show}'") # Debug
-            
-            if show in EPISODE_CACHE:
-                print(f"  Found in cache with {len(EPISODE_CACHE[show])} seasons")
-                self._send_json(EPISODE_CACHE[show])
-            else:
-                print(f"  Not found in cache. Cache keys sample: {list(EPISODE_CACHE.keys())[:5]}")
-                self._send_json({})
+            try:
+                seasons = EPISODE_STORE.get_show(raw_show)
+            except Exception as e:
+                log.error(f"Error loading episodes for '{raw_show}': {e}")
+                seasons = {}
+            log.debug(f"API Episode Request: '{raw_show}' -> {len(seasons)} seasons")
+            self._send_json(seasons)
                 
+        elif path == '/api/events':
+            stream_events(self, EVENTS)
+
+        elif path == '/api/metrics':
+            self._send_json(METRICS.snapshot())
+
         elif path == '/api/last_watched':
             show = qs.get('show', [''])[0].strip()
             data = get_last_watched(show)
             self._send_json(data or {})
 
-        elif path == '/api/search_history':
+        elif path in ('/api/next_episode', '/api/prev_episode'):
+            show = qs.get('show', [''])[0].strip()
+            try:
+                step = 1 if path == '/api/next_episode' else -1
+                result = EPISODE_STORE.resolve(show, get_last_watched(show), step)
+                result["show"] = show
+                self._send_json(result)
+            except Exception as e:
+                self._send_error(str(e))
+
+        elif path.startswith('/api/facets/'):
+            facet = path[len('/api/facets/'):]
             try:
-                history_path = os.path.join(DIRECTORY, "search_history.json")
-                if os.path.exists(history_path):
-                    with open(history_path, 'r') as f:
-                        data = json.load(f)
-                        self._send_json(data)
+                view = FACETS.get(
+                    facet,
+                    type=qs.get('type', ['all'])[0],
+                    genre=qs.get('genre', [None])[0],
+                    name=qs.get('name', [None])[0],
+                )
+                if view is None:
+                    self.send_error(404, 'Unknown facet')
                 else:
-                    self._send_json([])
+                    self._send_cached_json(*view)
+            except Exception as e:
+                self._send_error(str(e))
+
+        elif path == '/api/catalog':
+            # data.json with mirrored images pointed at /img/<hash>
+            self._send_json(IMAGE_MIRROR.rewrite(read_catalog()))
+
+        elif path == '/api/catalog/search':
+            try:
+                query = qs.get('q', [''])[0]
+                try:
+                    limit = max(1, min(int(qs.get('limit', ['50'])[0]), 500))
+                except ValueError:
+                    limit = 50
+                results = CATALOG_INDEX.search(query, limit)
+                results = IMAGE_MIRROR.rewrite(results)
+                self._send_json({"query": query, "count": len(results), "results": results})
+            except Exception as e:
+                self._send_error(str(e))
+
+        elif path == '/api/search_history':
+            try:
+                self._send_json(SEARCH_HISTORY.terms())
+            except Exception as e:
+                self._send_error(str(e))
+
+        elif path == '/api/search_suggest':
+            try:
+                prefix = qs.get('prefix', [''])[0]
+                try:
+                    limit = max(1, min(int(qs.get('limit', ['6'])[0]), 50))
+                except ValueError:
+                    limit = 6
+                self._send_json(SEARCH_HISTORY.suggest(prefix, limit))
             except Exception as e:
                 self._send_error(str(e))
 
         else:
-            super().do_GET()
+            rel_path = unquote(path)
+            if rel_path.endswith('/'):
+                rel_path += 'index.html'
+            if not self._serve_asset(DIRECTORY, rel_path):
+                super().do_GET()
 
+    @METRICS.instrument
     def do_POST(self):
+        self._cache_policy = CACHE_NO_STORE
         if self.path == '/save_data':
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
@@ -571,10 +687,29 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                 json_path = os.path.join(DIRECTORY, "data.json")
                 with open(json_path, "w") as f:
                     json.dump(data, f, indent=2)
+                # Re-index only the items that changed
+                CATALOG_INDEX.update(data if isinstance(data, list) else [])
+                IMAGE_MIRROR.prefetch_catalog(data if isinstance(data, list) else [])
+                FACETS.rebuild()
                 self._send_json({"status": "success"})
             except Exception as e:
                 self._send_error(str(e))
 
+        elif self.path == '/api/events':
+            # Other hub processes (control bar) publishing on our bus
+            content_length = int(self.headers['Content-Length'])
+            post_data = self.rfile.read(content_length)
+            try:
+                data = json.loads(post_data)
+                event_type = str(data.get('type', '')).strip()
+                if not event_type:
+                    self.send_error(400, 'Missing event type')
+                    return
+                event = EVENTS.publish(event_type, data.get('data'))
+                self._send_json({"status": "published", "id": event["id"]})
+            except Exception as e:
+                self._send_error(str(e))
+
         elif self.path == '/api/save_progress':
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
@@ -613,6 +748,7 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                 json_path = os.path.join(DIRECTORY, "genres.json")
                 with open(json_path, "w") as f:
                     json.dump(data, f, indent=2)
+                FACETS.rebuild()
                 self._send_json({"status": "success"})
             except Exception as e:
                 self._send_error(str(e))
@@ -624,7 +760,7 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                 subprocess.Popen([sys.executable, control_bar_path, "--mode", "basic"])
                 self._send_json({"status": "launched"})
             except Exception as e:
-                print(f"Error launching control bar: {e}")
+                log.error(f"Error launching control bar: {e}")
                 self._send_error(str(e))
 
         elif self.path == '/api/save_search':
@@ -634,32 +770,15 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                 data = json.loads(post_data)
                 term = data.get('term', '').strip()
                 if term:
-                    history_path = os.path.join(DIRECTORY, "search_history.json")
-                    history = []
-                    if os.path.exists(history_path):
-                        with open(history_path, 'r') as f:
-                            try: history = json.load(f)
-                            except: pass
-                    
-                    # Add to front, remove duplicates
-                    if term in history:
-                        history.remove(term)
-                    history.insert(0, term)
-                    # Keep max 50
-                    history = history[:50]
-                    
-                    with open(history_path, 'w') as f:
-                        json.dump(history, f, indent=2)
-                        
+                    SEARCH_HISTORY.record(term)
+
                 self._send_json({"status": "saved"})
             except Exception as e:
                 self._send_error(str(e))
 
         elif self.path == '/api/clear_search_history':
             try:
-                history_path = os.path.join(DIRECTORY, "search_history.json")
-                with open(history_path, 'w') as f:
-                    json.dump([], f)
+                SEARCH_HISTORY.clear()
                 self._send_json({"status": "cleared"})
             except Exception as e:
                 self._send_error(str(e))
@@ -669,11 +788,11 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                 # Send response first before killing Chrome
                 self._send_json({"status": "closed"})
                 # Kill Chrome after response is sent
-                print("[EXIT] Killing Chrome...")
+                log.info("[EXIT] Killing Chrome...")
                 result = subprocess.run("taskkill /IM chrome.exe /F", shell=True, capture_output=True, text=True)
-                print(f"[EXIT] taskkill result: {result.returncode}, stdout: {result.stdout}, stderr: {result.stderr}")
+                log.debug(f"[EXIT] taskkill result: {result.returncode}, stdout: {result.stdout}, stderr: {result.stderr}")
             except Exception as e:
-                print(f"[EXIT] Error: {e}")
+                log.error(f"[EXIT] Error: {e}")
                 self._send_error(str(e))
         else:
             self.send_error(404)
@@ -684,13 +803,33 @@ class Handler(http.server.SimpleHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(json.dumps(data).encode('utf-8'))
 
+    def _send_cached_json(self, body, etag):
+        """Send prebuilt JSON bytes, or 304 if the client already has this ETag."""
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
     def _send_error(self, msg):
         self.send_response(500)
         self.end_headers()
-        print(f"Server Error: {msg}")
+        log.error(f"Server Error: {msg}")
         self.wfile.write(json.dumps({"error": msg}).encode('utf-8'))
 
 
+class ThreadingServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Threading HTTP server (event streams hold their connection open)."""
+    allow_reuse_address = True
+    daemon_threads = True
+
+
 def run_server():
     # Print startup info
     print(f"[Server] Starting Streaming server on port {PORT}")
@@ -754,9 +893,7 @@ def run_server():
 
     threading.Thread(target=open_browser, daemon=True).start()
 
-    # allow reuse address
-    socketserver.TCPServer.allow_reuse_address = True
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
+    with ThreadingServer(("", PORT), Handler) as httpd:
         print(f"Serving at http://localhost:{PORT}")
         try:
             httpd.serve_forever()
@@ -771,8 +908,7 @@ if __name__ == "__main__":
     if "--no-browser" in sys.argv:
         # Define run_server variant that doesn't launch browser
         def run_headless_server():
-            socketserver.TCPServer.allow_reuse_address = True
-            with socketserver.TCPServer(("", PORT), Handler) as httpd:
+            with ThreadingServer(("", PORT), Handler) as httpd:
                 print(f"Serving at http://localhost:{PORT} (Headless)")
                 try:
                     httpd.serve_forever()
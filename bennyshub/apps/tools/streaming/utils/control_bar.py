@@ -5,7 +5,7 @@ import time
 import json
 import threading
 import subprocess
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 
 import tkinter as tk
 
@@ -121,12 +121,12 @@ try:
 except Exception:
     _kbd = None  # noqa: F841 - used conditionally elsewhere
 
-# Optional: Try pyttsx3 first, fallback to win32com
+# Optional local engines, only created if the shared speech daemon is unreachable
 try:
     import pyttsx3
-    _tts_engine = pyttsx3.init()
 except Exception:
-    _tts_engine = None
+    pyttsx3 = None
+_tts_engine = None
 
 # Import shared voice settings
 # From utils/ folder: go up 4 levels to bennyshub/, then into shared/
@@ -136,9 +136,6 @@ if _shared_dir not in sys.path:
 try:
     from voice_settings import apply_voice_settings, apply_sapi_voice_settings, is_tts_enabled, check_settings_changed  # type: ignore
     _voice_settings_available = True
-    # Apply settings to engine immediately if available
-    if _tts_engine is not None:
-        apply_voice_settings(_tts_engine)
 except ImportError:
     _voice_settings_available = False
     def apply_voice_settings(_engine): pass  # noqa: E302
@@ -146,26 +143,63 @@ except ImportError:
     def is_tts_enabled(): return True  # noqa: E302
     def check_settings_changed(): return False  # noqa: E302
 
+def _local_tts_engine():
+    """pyttsx3 engine, created on first use (only needed without the speech daemon)."""
+    global _tts_engine
+    if _tts_engine is None and pyttsx3 is not None:
+        try:
+            _tts_engine = pyttsx3.init()
+            apply_voice_settings(_tts_engine)
+        except Exception:
+            _tts_engine = None
+    return _tts_engine
+
+# Shared speech daemon (one engine for all hub tools)
+try:
+    from speech_daemon import speak as speak_via_daemon, ensure_daemon, prerender  # type: ignore
+except ImportError:
+    def speak_via_daemon(*_args, **_kwargs): return False  # noqa: E302
+    def ensure_daemon(): pass  # noqa: E302
+    def prerender(_phrases): return False  # noqa: E302
+
+# Publish playback / progress events to the streaming server's /api/events
+try:
+    from event_bus import post_event  # type: ignore
+except ImportError:
+    def post_event(*_args, **_kwargs): return False  # noqa: E302
+
 # Optional Windows TTS (SAPI via pywin32)
 try:
     import win32com.client as _win32com_client
 except Exception:
     _win32com_client = None
 
+# Streaming modules (progress store) live one level up from utils/
+_streaming_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _streaming_dir not in sys.path:
+    sys.path.insert(0, _streaming_dir)
+from progress_store import ProgressStore  # noqa: E402
+from window_watcher import create_watcher  # noqa: E402
+from key_sequence import run_key_sequence, wait_for_condition, describe_steps, vk_for  # noqa: E402
+
 # ------------------------------ Config ------------------------------
 # Because this file lives in utils/, the data directory is one level up.
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
 EPISODE_SHEET = os.path.join(DATA_DIR, "EPISODE_SELECTION.xlsx")
 LAST_WATCHED_FILE = os.path.join(DATA_DIR, "last_watched.json")
+PROGRESS_DB = os.path.join(DATA_DIR, "progress.sqlite")
 APP_TITLE_MAIN = "Accessible Menu"  # comm-v10.py window title
 
 BUTTON_FONT = ("Arial Black", 20)   # was 16; ~25% larger
 BAR_HEIGHT = 88                     # was 70; ~25% taller
 BAR_OPACITY = 0.96
-POLL_INTERVAL = 0.75
+RAISE_POLL_MS = 400  # only used if the foreground hook can't be installed
 SCAN_DEBOUNCE = 0.35  # seconds after a scan/select before we accept another
 SPACE_HOLD_DELAY = 3.0   # seconds to hold before auto-scan starts
 SPACE_HOLD_REPEAT = 2.0  # repeat interval while holding Space
+STREAMING_SERVER = "http://127.0.0.1:8000"
+ALERT_SPEECH_PRIORITY = 10  # "I need help" / "I need suction" cut off any other speech
+AUTO_ADVANCE_MIN_DURATION = 300  # seconds; shorter videos (trailers, ads) never auto-advance
 
 # Disable spreadsheet-driven navigation entirely
 USE_SPREADSHEET_NAV = False
@@ -173,27 +207,36 @@ USE_SPREADSHEET_NAV = False
 # ------------------------------ Platform profiles ------------------------------
 PlatformProfile = Dict[str, Any]
 
+# post_nav steps are key names or {"key", "wait", "skip"} dicts; "wait"/"skip"
+# name a DOM condition (see key_sequence.CONDITIONS) checked in the page.
+# "post_nav_delay" is only used when keys have to go through the OS.
+FULLSCREEN_STEP = {"key": "f", "wait": "video", "skip": "fullscreen"}
+
 PROFILES: List[PlatformProfile] = [
     {"name": "YouTube", "match": ["youtube.com", "youtu.be"],
-     "playpause": ["k", "space"], "fullscreen": ["f"], "post_nav": ["f"]},
+     "playpause": ["k", "space"], "fullscreen": ["f"], "post_nav": [FULLSCREEN_STEP]},
     {"name": "Disney+", "match": ["disneyplus.com"],
-     "playpause": ["space"], "fullscreen": ["f"], "post_nav": ["f"]},
+     "playpause": ["space"], "fullscreen": ["f"], "post_nav": [FULLSCREEN_STEP]},
     {"name": "Netflix", "match": ["netflix.com"],
-     "playpause": ["space"], "fullscreen": ["f"], "post_nav": ["f"]},
+     "playpause": ["space"], "fullscreen": ["f"], "post_nav": [FULLSCREEN_STEP]},
     {"name": "Prime Video", "match": ["primevideo.com", "amazon.com"],
-     "playpause": ["space"], "fullscreen": ["f"], "post_nav": ["f"]},
+     "playpause": ["space"], "fullscreen": ["f"], "post_nav": [FULLSCREEN_STEP]},
     {"name": "Hulu", "match": ["hulu.com"],
-     "playpause": ["space"], "fullscreen": ["f"], "post_nav": ["f"]},
+     "playpause": ["space"], "fullscreen": ["f"], "post_nav": [FULLSCREEN_STEP]},
     {"name": "Paramount+", "match": ["paramountplus.com"],
-     "playpause": ["space"], "fullscreen": ["f"], "post_nav": ["f"]},
+     "playpause": ["space"], "fullscreen": ["f"], "post_nav": [FULLSCREEN_STEP]},
     {"name": "Max", "match": ["max.com", "hbomax.com"],
-     "playpause": ["space"], "fullscreen": ["f"], "post_nav": ["f"]},
+     "playpause": ["space"], "fullscreen": ["f"], "post_nav": [FULLSCREEN_STEP]},
     {"name": "PlutoTV", "match": ["pluto.tv"],
-     "playpause": ["space"], "fullscreen": ["f"], "post_nav": ["m", "f"]},
+     "playpause": ["space"], "fullscreen": ["f"],
+     "post_nav": [{"key": "m", "wait": "video"}, FULLSCREEN_STEP]},
+    # Each Plex key opens/changes UI the next one depends on; wait for the DOM to settle
     {"name": "Plex", "match": ["plex.tv", "app.plex.tv", ":32400"],
-     "playpause": ["space"], "fullscreen": ["f"], "post_nav": ["x", "enter", "p", "f"]},
+     "playpause": ["space"], "fullscreen": ["f"], "post_nav_delay": 1.0, "post_nav_autoplay": False,
+     "post_nav": [{"key": "x", "wait": "quiet"}, {"key": "enter", "wait": "quiet"},
+                  {"key": "p", "wait": "quiet"}, FULLSCREEN_STEP]},
     {"name": "Generic", "match": ["."],  # fallback
-     "playpause": ["space"], "fullscreen": ["f"], "post_nav": ["f"]},
+     "playpause": ["space"], "fullscreen": ["f"], "post_nav": [FULLSCREEN_STEP]},
 ]
 
 # ------------------------------ Episode cache (kept for compatibility, unused) ------------------------------
@@ -201,14 +244,13 @@ PROFILES: List[PlatformProfile] = [
 EPISODE_CACHE: Dict[str, Dict[int, List[Dict[str, Any]]]] = {}
 EPISODE_LINEAR: Dict[str, List[Dict[str, Any]]] = {}
 
+PROGRESS_STORE = ProgressStore(PROGRESS_DB, LAST_WATCHED_FILE)
+
 def load_last_watched() -> dict:
-    if os.path.exists(LAST_WATCHED_FILE):
-        try:
-            with open(LAST_WATCHED_FILE, "r") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+    try:
+        return PROGRESS_STORE.get() or {}
+    except Exception:
+        return {}
 
 # NEW: guard to avoid persisting unwanted locations
 def _safe_to_persist(url: str) -> bool:
@@ -231,14 +273,10 @@ def set_last_position(show_title: str, season: int, episode: int, url: str, line
     # Only persist if the URL is allowed
     if not _safe_to_persist(url):
         return
-    data = load_last_watched()
-    rec = {"season": int(season), "episode": int(episode), "url": url}
-    if linear_index is not None:
-        rec["linear_index"] = int(linear_index)
-    data[show_title] = rec
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(LAST_WATCHED_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    # Short-lived process (exits via os._exit), so write through immediately
+    PROGRESS_STORE.set(show_title, season, episode, url, linear_index=linear_index, flush_now=True)
+    post_event("progress", {"show": show_title, "season": season, "episode": episode,
+                            "url": url, "linear_index": linear_index})
 
 # ---- Console window helpers (keep the terminal out of the way) ----
 
@@ -419,125 +457,65 @@ def focus_comm_app():
 
 
 def navigate_current_tab(url: str) -> bool:
-    ws = cdp_find_ws()
-    if ws:
-        return cdp_navigate(ws, url)
+    tab = cdp_find_tab()
+    if tab:
+        return cdp_navigate(tab, url)
     print("[control_bar] CDP unavailable; cannot navigate without stealing focus.")
     return False
 
-# Try to read Chrome's active tab URL via the DevTools HTTP endpoint.
-# Requires launching Chrome with --remote-debugging-port=9222.
+# Chrome is launched with --remote-debugging-port=9222. All DevTools traffic
+# goes over one persistent, multiplexed connection (see cdp_client.py), so a
+# button press is a single WebSocket round trip with no tab listing first.
 try:
-    import requests  # local loopback only
-except Exception:
-    requests = None
+    from cdp_client import get_client as _get_cdp_client  # type: ignore
+    from media_mirror import MediaMirror  # type: ignore
+except ImportError:
+    _get_cdp_client = None
+    MediaMirror = None
 
-# Optional: WebSocket CDP for focus-free control
-try:
-    import websocket  # pip install websocket-client
-except Exception:
-    websocket = None
+
+def _cdp():
+    return _get_cdp_client() if _get_cdp_client else None
 
 
 def get_active_chrome_url_via_cdp() -> Optional[str]:
-    if not requests:
+    cdp = _cdp()
+    if not cdp:
         return None
-    try:
-        r = requests.get("http://127.0.0.1:9222/json", timeout=0.3)
-        tabs = r.json() if r.ok else []
-        for t in tabs:
-            if t.get("type") == "page" and t.get("url"):
-                return t.get("url")
-    except Exception:
-        return None
-    return None
+    return cdp.page_url(cdp.find_page())
 
 # ---------------- CDP helpers (no focus change) ----------------
+# "tab" below is a DevTools targetId from cdp_find_tab().
 
-def _cdp_tabs():
-    if not requests:
-        return []
-    try:
-        r = requests.get("http://127.0.0.1:9222/json", timeout=0.4)
-        return r.json() if r.ok else []
-    except Exception:
-        return []
-
-
-def cdp_find_ws(url_hint: Optional[str] = None) -> Optional[str]:
-    tabs = _cdp_tabs()
-    if not tabs:
-        return None
-    if url_hint:
-        base = _normalize_url(url_hint)
-        for t in tabs:
-            u = t.get("url", "")
-            if t.get("type") == "page" and t.get("webSocketDebuggerUrl") and (base == _normalize_url(u) or _normalize_url(u).startswith(base)):
-                return t.get("webSocketDebuggerUrl")
-    for t in tabs:
-        if t.get("type") == "page" and t.get("webSocketDebuggerUrl"):
-            return t.get("webSocketDebuggerUrl")
-    return None
-
-
-def _cdp_send(ws, method: str, params: Optional[dict] = None, msg_id: int = 1, timeout: float = 1.2):
-    payload = {"id": msg_id, "method": method}
-    if params:
-        payload["params"] = params
-    ws.send(json.dumps(payload))
-    ws.settimeout(timeout)
-    try:
-        reply = ws.recv()
-        return json.loads(reply)
-    except Exception:
-        return None
+def cdp_find_tab(url_hint: Optional[str] = None) -> Optional[str]:
+    cdp = _cdp()
+    return cdp.find_page(url_hint) if cdp else None
 
 
-def cdp_runtime_eval(ws_url: str, expression: str) -> bool:
-    if not websocket or not ws_url:
+def cdp_runtime_eval(tab: Optional[str], expression: str) -> bool:
+    cdp = _cdp()
+    if not cdp or not tab:
         return False
-    try:
-        ws = websocket.create_connection(ws_url, timeout=0.8)
-    except Exception:
-        return False
-    try:
-        _cdp_send(ws, "Runtime.enable")
-        res = _cdp_send(ws, "Runtime.evaluate", {"expression": expression, "awaitPromise": True, "returnByValue": True})
-        return bool(res)
-    finally:
-        try:
-            ws.close()
-        except Exception:
-            pass
+    ok, _value = cdp.evaluate(tab, expression, await_promise=True)
+    return ok
 
 
-def cdp_navigate(ws_url: str, url: str) -> bool:
-    if not websocket or not ws_url:
-        return False
-    try:
-        ws = websocket.create_connection(ws_url, timeout=0.8)
-    except Exception:
+def cdp_navigate(tab: Optional[str], url: str) -> bool:
+    cdp = _cdp()
+    if not cdp or not tab:
         return False
-    try:
-        _cdp_send(ws, "Page.enable")
-        res = _cdp_send(ws, "Page.navigate", {"url": url})
-        return bool(res)
-    finally:
-        try:
-            ws.close()
-        except Exception:
-            pass
+    return cdp.page_call(tab, "Page.navigate", {"url": url}) is not None
 
 
-def cdp_toggle_play(ws_url: str) -> bool:
+def cdp_toggle_play(tab: Optional[str]) -> bool:
     js = """
 (() => { const v = document.querySelector('video'); if (!v) return 'no video';
   if (v.paused) { try{v.play();}catch(e){} return 'play'; } else { v.pause(); return 'pause'; } })();
 """
-    return cdp_runtime_eval(ws_url, js)
+    return cdp_runtime_eval(tab, js)
 
 
-def cdp_adjust_volume(ws_url: str, delta: float) -> bool:
+def cdp_adjust_volume(tab: Optional[str], delta: float) -> bool:
     """Adjust video volume via CDP. delta should be between -1.0 and 1.0."""
     js = f"""
 (() => {{ 
@@ -547,79 +525,50 @@ def cdp_adjust_volume(ws_url: str, delta: float) -> bool:
     return true;
 }})();
 """
-    return cdp_runtime_eval(ws_url, js)
+    return cdp_runtime_eval(tab, js)
 
 
-def cdp_click_center_internal(ws) -> bool:
-    # Helper that assumes ws is open
-    try:
-        res = _cdp_send(ws, "Runtime.evaluate", {
-            "expression": "({width: window.innerWidth, height: window.innerHeight})",
-            "returnByValue": True
-        })
-        if res and res.get("result", {}).get("result", {}).get("value"):
-            dims = res["result"]["result"]["value"]
-            cx = dims.get("width", 1920) // 2
-            cy = dims.get("height", 1080) // 2
-            _cdp_send(ws, "Input.dispatchMouseEvent", {
-                "type": "mousePressed", "x": cx, "y": cy, "button": "left", "clickCount": 1
-            })
-            _cdp_send(ws, "Input.dispatchMouseEvent", {
-                "type": "mouseReleased", "x": cx, "y": cy, "button": "left", "clickCount": 1
-            })
-            return True
-    except Exception:
-        pass
-    return False
+def cdp_press_key(tab: Optional[str], key: str, code: str, vk: int) -> bool:
+    """Send a key press to the page without focusing Chrome (down/up pipelined)."""
+    cdp = _cdp()
+    if not cdp or not tab:
+        return False
+    down = {"type": "keyDown", "key": key, "code": code, "windowsVirtualKeyCode": vk, "keyCode": vk}
+    up = dict(down, type="keyUp")
+    return cdp.page_send(tab, "Input.dispatchKeyEvent", down) and cdp.page_send(tab, "Input.dispatchKeyEvent", up)
 
-def cdp_click_center(ws_url: str) -> bool:
+
+def cdp_click_center(tab: Optional[str]) -> bool:
     """Click the center of the page via CDP."""
-    if not websocket or not ws_url:
+    cdp = _cdp()
+    if not cdp or not tab:
         return False
-    try:
-        ws = websocket.create_connection(ws_url, timeout=0.8)
-    except Exception:
+    ok, dims = cdp.evaluate(tab, "({width: window.innerWidth, height: window.innerHeight})")
+    if not ok or not dims:
         return False
-    try:
-        _cdp_send(ws, "Runtime.enable")
-        return cdp_click_center_internal(ws)
-    finally:
-        try:
-            ws.close()
-        except Exception:
-            pass
-    return False
+    cx = dims.get("width", 1920) // 2
+    cy = dims.get("height", 1080) // 2
+    press = {"type": "mousePressed", "x": cx, "y": cy, "button": "left", "clickCount": 1}
+    return cdp.page_send(tab, "Input.dispatchMouseEvent", press) and \
+        cdp.page_send(tab, "Input.dispatchMouseEvent", dict(press, type="mouseReleased"))
+
+def cdp_ensure_playing(tab: Optional[str]) -> bool:
+    """Start the video if it is paused (no key press, so it can't toggle anything off)."""
+    return cdp_runtime_eval(tab, "(async() => {try{const v=document.querySelector('video'); if(v&&v.paused){await v.play().catch(()=>{});} }catch(e){} })();")
 
 # ensure video is playing and page is fullscreen (best-effort, focus-safe)
-def cdp_ensure_play_and_fullscreen(ws_url: Optional[str]) -> bool:
-    if not websocket or not ws_url:
+def cdp_ensure_play_and_fullscreen(tab: Optional[str]) -> bool:
+    cdp = _cdp()
+    if not cdp or not tab:
         return False
-    try:
-        ws = websocket.create_connection(ws_url, timeout=1.2)
-    except Exception:
+    cdp.page_send(tab, "Runtime.evaluate", {
+        "expression": "(async() => {try{const v=document.querySelector('video'); if(v){await v.play().catch(()=>{});} }catch(e){} })();",
+        "awaitPromise": True
+    })
+    ok, _value = cdp.evaluate(tab, "(async()=>{try{if(!document.fullscreenElement){const v=document.querySelector('video'); if(v&&v.requestFullscreen){await v.requestFullscreen().catch(()=>{});} else if(document.documentElement.requestFullscreen){await document.documentElement.requestFullscreen().catch(()=>{});} }}catch(e){} })();", await_promise=True)
+    if not ok:
         return False
-    ok = False
-    try:
-        _cdp_send(ws, "Runtime.enable")
-        _cdp_send(ws, "Runtime.evaluate", {
-            "expression": "(async() => {try{const v=document.querySelector('video'); if(v){await v.play().catch(()=>{});} }catch(e){} })();",
-            "awaitPromise": True
-        })
-        _cdp_send(ws, "Runtime.evaluate", {
-            "expression": "(async()=>{try{if(!document.fullscreenElement){const v=document.querySelector('video'); if(v&&v.requestFullscreen){await v.requestFullscreen().catch(()=>{});} else if(document.documentElement.requestFullscreen){await document.documentElement.requestFullscreen().catch(()=>{});} }}catch(e){} })();",
-            "awaitPromise": True
-        })
-        time.sleep(0.15)
-        _cdp_send(ws, "Runtime.evaluate", {"expression": "!!document.fullscreenElement", "returnByValue": True})
-        _cdp_send(ws, "Input.dispatchKeyEvent", {"type": "keyDown", "key": "f", "code": "KeyF", "windowsVirtualKeyCode": 0x46, "keyCode": 0x46})
-        _cdp_send(ws, "Input.dispatchKeyEvent", {"type": "keyUp", "key": "f", "code": "KeyF", "windowsVirtualKeyCode": 0x46, "keyCode": 0x46})
-        ok = True
-    finally:
-        try:
-            ws.close()
-        except Exception:
-            pass
-    return ok
+    return cdp_press_key(tab, "f", "KeyF", 0x46)
 
 # ------------------------------ Platform detection & actions ------------------------------
 
@@ -663,7 +612,7 @@ def _normalize_url(u: str) -> str:
 
 # ------------------------------ UI (Scan/Select) ------------------------------
 class ControlBar(tk.Tk):
-    def __init__(self, _mode: str, show_title: Optional[str]):
+    def __init__(self, _mode: str, show_title: Optional[str], post_nav_done: bool = False):
         super().__init__()
         # Force basic mode regardless of arg to avoid spreadsheet stepping
         self.mode = "basic"  # _mode parameter ignored, always use basic
@@ -688,6 +637,8 @@ class ControlBar(tk.Tk):
         self._restarting_chrome = False
         self._restart_deadline = 0.0
         self._btn_idx: Dict[str, int] = {}
+        self._media_state: Optional[Dict[str, Any]] = None
+        self._advanced_from: Optional[str] = None
         
         # We need to initialize the row container first since _build_ui uses it
         self.row = None
@@ -701,7 +652,6 @@ class ControlBar(tk.Tk):
         # self.after(1200, _minimize_all_consoles)
 
         self._update_prev_next_labels()
-        self.after(400, self._pulse_labels)
 
         self._last_action_ts = 0.0
         self._space_pressed = False
@@ -713,52 +663,66 @@ class ControlBar(tk.Tk):
         self._automation_in_progress = False
         self._automation_complete = False
 
-        self._watcher = threading.Thread(target=self._watch_chrome, daemon=True)
-        self._watcher.start()
+        self._focus_managed = False
+        self._start_watcher()
 
         self.bind("<KeyPress-space>", self._on_space_press)
         self.bind("<KeyRelease-space>", self._on_space_release)
         self.bind("<KeyPress-Return>", self._on_return_press)
         self.bind("<KeyRelease-Return>", self._on_return_release)
 
-        # Initialize global SAPI voice object for performance
+        # Speech goes through the shared daemon; a local SAPI voice is only
+        # created if the daemon can't be reached
         self._sapi_voice = None
-        if _win32com_client:
-            try:
-                self._sapi_voice = _win32com_client.Dispatch("SAPI.SpVoice")
-                # Apply shared voice settings
-                if _voice_settings_available:
-                    apply_sapi_voice_settings(self._sapi_voice)
-            except Exception:
-                pass
+        ensure_daemon()
+        prerender(self._fixed_speech_labels())
 
         # One-shot bootstrap: Apply post-navigation keys (x,enter,p,f for Plex, f for fullscreen, etc.)
         # This runs FIRST, before any focus-stealing mechanisms
+        def _bootstrap_done(_ok: bool = True):
+            self._automation_in_progress = False
+            self._automation_complete = True
+            post_event("automation", {"platform": "control_bar", "step": "post_nav", "ok": True})
+            # NOW start the focus-stealing for the control bar
+            self.after(500, self._start_focus_management)
+
         def _bootstrap_once():
+            if post_nav_done:
+                # Launched after the server's automation; replaying x/enter/p would toggle Plex back
+                print("[Bootstrap] post_nav already applied by the launcher")
+                _bootstrap_done()
+                return
             self._automation_in_progress = True
             try:
                 url = self._last_url_hint()
                 prof = get_profile_for_url(url)
-                print(f"[Bootstrap] Applying post_nav for {prof.get('name', 'Unknown')}: {prof.get('post_nav', [])}")
-                self._apply_post_nav(prof)
+                print(f"[Bootstrap] Applying post_nav for {prof.get('name', 'Unknown')}: {describe_steps(prof.get('post_nav'))}")
+                self._apply_post_nav(prof, on_done=_bootstrap_done)
             except Exception as e:
                 print(f"[Bootstrap] Error: {e}")
-            finally:
-                self._automation_in_progress = False
-                self._automation_complete = True
-                # NOW start the focus-stealing for the control bar
-                self.after(500, self._start_focus_management)
+                _bootstrap_done(False)
         
+        # Playback state pushed from the page (play/pause/volume/fullscreen/ended)
+        cdp = _cdp()
+        if cdp and MediaMirror:
+            MediaMirror(cdp).on_change(
+                lambda _t, event, state: self.after(0, self._on_media_event, event, state))
+
         # Run bootstrap after a short delay for window to be ready
         self.after(500, _bootstrap_once)
+        post_event("control_bar", {"state": "shown", "show": self.show_title})
 
     def _start_focus_management(self):
         """Start focus management AFTER automation is complete."""
         if not self.winfo_exists():
             return
+        self._focus_managed = True
         self.bind("<FocusOut>", lambda _e: self.after(1, self._force_foreground))
         self.after(100, self._force_foreground)
-        self.after(500, self._raise_forever)
+        if self._event_driven:
+            _minimize_all_consoles()  # once; new consoles arrive as window-shown events
+        else:
+            self.after(500, self._raise_forever)
 
     # ---------- Layout ----------
     def _place_bottom(self):
@@ -766,9 +730,9 @@ class ControlBar(tk.Tk):
         sh = self.winfo_screenheight()
         self.geometry(f"{sw}x{BAR_HEIGHT}+0+{sh - BAR_HEIGHT}")
 
-    def _make_items(self) -> List[Dict[str, Any]]:
-        # Toggle between Player Bar and Communication Menu
-        if self.menu_state == "comm":
+    def _make_items(self, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        # Toggle between Player Bar and Communication Menu (default: the current menu)
+        if (state or self.menu_state) == "comm":
             return [
                 {"label": "⬅ Player", "action": self.on_toggle_menu_player, "bg": "#b3d9ff", "tts": "player toggle"},
                 {"label": "Help", "action": self.on_help_tts, "bg": "#b3ffb3", "tts": "help"},
@@ -781,7 +745,7 @@ class ControlBar(tk.Tk):
             # Default "player"
             return [
                 {"label": "Menu", "action": self.on_toggle_menu_comm, "bg": "#e6f0ff"},       # Light Blue
-                {"label": "⏯ Play / Pause", "action": self.on_play_pause, "bg": "#b3ffb3"},   # Light Green
+                {"id": "play", "label": "⏯ Play / Pause", "action": self.on_play_pause, "bg": "#b3ffb3"},   # Light Green
                 {"id": "vol_down", "label": "🔉", "action": self.on_volume_down, "bg": "#d9b3ff"}, # Violet
                 {"id": "vol_up", "label": "🔊", "action": self.on_volume_up, "bg": "#d9b3ff"},     # Violet
                 {"id": "prev", "label": "⏮ Previous", "action": self.on_prev, "bg": "#80b3ff"},      # Darker Blue
@@ -825,11 +789,32 @@ class ControlBar(tk.Tk):
             self.tk_buttons.append(b)
             if "id" in it:
                 self._btn_idx[it["id"]] = len(self.tk_buttons) - 1
+        self._apply_media_labels()
 
-    def _speak(self, text: str):
+    def _local_sapi_voice(self):
+        if self._sapi_voice is None and _win32com_client:
+            try:
+                self._sapi_voice = _win32com_client.Dispatch("SAPI.SpVoice")
+                if _voice_settings_available:
+                    apply_sapi_voice_settings(self._sapi_voice)
+            except Exception:
+                self._sapi_voice = None
+        return self._sapi_voice
+
+    def _fixed_speech_labels(self) -> List[str]:
+        """Phrases the bar speaks over and over: menu labels and playback states."""
+        labels = ["playing", "paused", "last episode finished"]
+        labels += [f"volume {v}" for v in range(0, 101, 10)]
+        for state in ("player", "comm"):
+            labels += [it["tts"] for it in self._make_items(state) if it.get("tts")]
+        return labels
+
+    def _speak(self, text: str, priority: int = 0, cached: bool = False):
         if not text:
             return
-        
+        if speak_via_daemon(text, channel="control_bar", mode="interrupt", priority=priority, cache=cached):
+            return
+
         # Check shared voice settings
         if _voice_settings_available and not is_tts_enabled():
             return
@@ -842,7 +827,7 @@ class ControlBar(tk.Tk):
                 apply_sapi_voice_settings(self._sapi_voice)
         
         # Prefer SAPI via win32com for robust async/interrupt behavior
-        if self._sapi_voice:
+        if self._local_sapi_voice():
             try:
                 # SVSFlagsAsync = 1, SVSFPurgeBeforeSpeak = 2
                 # 1|2 ensures it returns immediately AND cuts off any previous speech
@@ -852,7 +837,7 @@ class ControlBar(tk.Tk):
                 pass
 
         # Fallback to pyttsx3 in a thread if SAPI failed or unavailable
-        if _tts_engine:
+        if _local_tts_engine():
             def _t():
                 try:
                     # Cloning the engine per thread is safer or just hope for the best with the global
@@ -891,7 +876,7 @@ class ControlBar(tk.Tk):
         try:
             item = self.items[idx]
             if item.get("tts"):
-                self._speak(item["tts"])
+                self._speak(item["tts"], cached=True)
         except Exception:
             pass
 
@@ -1054,14 +1039,30 @@ class ControlBar(tk.Tk):
         self._select_current()
 
     # ---------- Housekeeping ----------
-    def _watch_chrome(self):
-        while True:
-            time.sleep(POLL_INTERVAL)
-            if not self.winfo_exists():
-                break
-            running = is_chrome_running()
-            if getattr(self, "_restarting_chrome", False):
-                continue
+    def _start_watcher(self):
+        """Foreground and console-window notifications instead of polling loops."""
+        self._window_watcher = create_watcher()
+        self._window_watcher.on_foreground(lambda hwnd: self.after(0, self._on_foreground_changed, hwnd))
+        self._window_watcher.on_window_shown(self._on_window_shown)
+        self._event_driven = self._window_watcher.start()
+        if not self._event_driven:
+            print("[Watcher] Falling back to polling for focus")
+
+    def _on_foreground_changed(self, _hwnd: int):
+        # Our own windows are filtered out by the hook, so any change means we lost focus
+        if not self._focus_managed or not self.winfo_exists():
+            return
+        try:
+            self._force_foreground()
+        except Exception:
+            pass
+
+    def _on_window_shown(self, hwnd: int, class_name: str):
+        if (class_name or "").lower() == "consolewindowclass":
+            try:
+                win32gui.ShowWindow(hwnd, win32con.SW_MINIMIZE)
+            except Exception:
+                pass
 
     def _raise_forever(self):
         if not self.winfo_exists():
@@ -1075,7 +1076,7 @@ class ControlBar(tk.Tk):
             except Exception:
                 pass
         _minimize_all_consoles()
-        self.after(400, self._raise_forever)
+        self.after(RAISE_POLL_MS, self._raise_forever)
 
     # ---------------- actions ----------------
     def _last_url_hint(self) -> Optional[str]:
@@ -1107,14 +1108,78 @@ class ControlBar(tk.Tk):
         self.tk_buttons[prev_idx].configure(text="⏮ Previous", state=tk.NORMAL)
         self.tk_buttons[next_idx].configure(text="⏭ Next", state=tk.NORMAL)
 
-    def _pulse_labels(self):
+    # ---------- Media state (pushed from the page) ----------
+    def _apply_media_labels(self):
+        state = self._media_state
+        if not state or not state.get("hasVideo"):
+            return
+        play_idx = self._btn_idx.get("play")
+        if play_idx is not None:
+            label = "▶ Play" if state.get("paused") else "⏸ Pause"
+            self.tk_buttons[play_idx].configure(text=label)
+        volume = state.get("volume")
+        if isinstance(volume, (int, float)):
+            pct = "muted" if state.get("muted") else f"{round(volume * 100)}%"
+            for key, icon in (("vol_down", "🔉"), ("vol_up", "🔊")):
+                idx = self._btn_idx.get(key)
+                if idx is not None:
+                    self.tk_buttons[idx].configure(text=f"{icon} {pct}")
+
+    def _on_media_event(self, event: str, state: Dict[str, Any]):
         if not self.winfo_exists():
             return
-        try:
-            self._update_prev_next_labels()
-        except Exception:
-            pass
-        self.after(1500, self._pulse_labels)
+        previous = self._media_state or {}
+        self._media_state = state
+        self._apply_media_labels()
+        if event == "play" and previous.get("paused") is not False:
+            self._speak("playing", cached=True)
+        elif event == "pause" and previous.get("paused") is not True:
+            self._speak("paused", cached=True)
+        elif event == "volumechange" and state.get("volume") != previous.get("volume"):
+            self._speak(f"volume {round((state.get('volume') or 0) * 100)}", cached=True)
+        elif event == "ended":
+            self._auto_advance(state)
+
+    def _auto_advance(self, state: Dict[str, Any]):
+        """Open the next episode when one ends (long videos only, once per URL)."""
+        url = state.get("url")
+        if not self.show_title or (state.get("duration") or 0) < AUTO_ADVANCE_MIN_DURATION:
+            return
+        if url == self._advanced_from:
+            return
+        self._advanced_from = url
+
+        def _go():
+            from urllib.parse import quote
+            import urllib.request
+            try:
+                endpoint = f"{STREAMING_SERVER}/api/next_episode?show={quote(self.show_title)}"
+                with urllib.request.urlopen(endpoint, timeout=2) as resp:
+                    result = json.loads(resp.read().decode("utf-8"))
+            except Exception as e:
+                print(f"[Media] Could not resolve next episode: {e}")
+                return
+            if not result.get("current"):
+                # The saved episode isn't in the index; "next" would be a guess (S1E1)
+                print(f"[Media] Last watched episode of {self.show_title} not in the index; not advancing")
+                return
+            ep = result.get("episode")
+            if not ep or not ep.get("url"):
+                self.after(0, lambda: self._speak("last episode finished", cached=True))
+                return
+            print(f"[Media] Episode ended; opening S{ep['season']}E{ep['episode']}")
+            self.after(0, self._speak, f"next episode, season {ep['season']} episode {ep['episode']}")
+            if navigate_current_tab(ep["url"]):
+                set_last_position(self.show_title, ep["season"], ep["episode"], ep["url"],
+                                  linear_index=result.get("index"))
+                post_event("playback", {"action": "auto_advance", "show": self.show_title,
+                                        "season": ep["season"], "episode": ep["episode"]})
+                # Navigation drops fullscreen/autoplay; redo post_nav once the player is up
+                # (waited for on the shared DevTools connection the media mirror uses)
+                if wait_for_condition(_cdp(), cdp_find_tab(ep["url"]), "video_ready", timeout=20) is None:
+                    time.sleep(6)
+                self.after(0, self._apply_post_nav, get_profile_for_url(ep["url"]))
+        threading.Thread(target=_go, daemon=True).start()
 
     def _send_media_prev_next(self, direction: str) -> bool:
         # Fallback to global media keys
@@ -1137,18 +1202,19 @@ class ControlBar(tk.Tk):
     def _refresh_buttons(self):
         self.items = self._make_items()
         self._build_ui()
+        self._update_prev_next_labels()
         self.current_index = 0
         self._highlight(0)
 
     def on_toggle_menu_comm(self):
         self.menu_state = "comm"
         # Pause playback explicitly
-        ws = cdp_find_ws(self._last_url_hint())
-        if ws:
+        tab = cdp_find_tab(self._last_url_hint())
+        if tab:
             try:
                 # Force pause
                 js = "(() => { const v = document.querySelector('video'); if (v && !v.paused) { v.pause(); } })();"
-                cdp_runtime_eval(ws, js)
+                cdp_runtime_eval(tab, js)
             except Exception:
                 pass
         else:
@@ -1169,8 +1235,12 @@ class ControlBar(tk.Tk):
         if _voice_settings_available and not is_tts_enabled():
             self._refocus_bar()
             return
+        # Outranks scan labels and other apps' speech in the shared daemon
+        if speak_via_daemon("I need help", channel="alert", mode="interrupt", priority=ALERT_SPEECH_PRIORITY):
+            self._refocus_bar()
+            return
         # Use class SAPI voice with interrupt flag to prevent queuing
-        if self._sapi_voice:
+        if self._local_sapi_voice():
             try:
                 if _voice_settings_available:
                     apply_sapi_voice_settings(self._sapi_voice)
@@ -1192,8 +1262,12 @@ class ControlBar(tk.Tk):
         if _voice_settings_available and not is_tts_enabled():
             self._refocus_bar()
             return
+        # Outranks scan labels and other apps' speech in the shared daemon
+        if speak_via_daemon("I need suction", channel="alert", mode="interrupt", priority=ALERT_SPEECH_PRIORITY):
+            self._refocus_bar()
+            return
         # Use class SAPI voice with interrupt flag to prevent queuing
-        if self._sapi_voice:
+        if self._local_sapi_voice():
             try:
                 if _voice_settings_available:
                     apply_sapi_voice_settings(self._sapi_voice)
@@ -1351,10 +1425,10 @@ class ControlBar(tk.Tk):
         if not self._activated_once:
             self._activated_once = True
             did = False
-            ws = cdp_find_ws(self._last_url_hint())
-            if ws:
-                did = cdp_click_center(ws)
-                cdp_ensure_play_and_fullscreen(ws)
+            tab = cdp_find_tab(self._last_url_hint())
+            if tab:
+                did = cdp_click_center(tab)
+                cdp_ensure_play_and_fullscreen(tab)
             else:
                 try:
                     sw, sh = pyautogui.size()
@@ -1365,15 +1439,17 @@ class ControlBar(tk.Tk):
             self._refocus_bar()
             if did:
                 return
-        ws = cdp_find_ws(self._last_url_hint())
-        ok = cdp_toggle_play(ws)
+        tab = cdp_find_tab(self._last_url_hint())
+        ok = cdp_toggle_play(tab)
         if not ok:
             send_to_chrome([" "])
+        post_event("playback", {"action": "toggle_play"})
         self._refocus_bar()
 
     def on_volume_up(self):
-        ws = cdp_find_ws(self._last_url_hint())
-        if not cdp_adjust_volume(ws, 0.1):
+        post_event("playback", {"action": "volume_up"})
+        tab = cdp_find_tab(self._last_url_hint())
+        if not cdp_adjust_volume(tab, 0.1):
             try:
                 for _ in range(5):
                     win32api.keybd_event(0xAF, 0, 0, 0)
@@ -1383,8 +1459,9 @@ class ControlBar(tk.Tk):
         self._refocus_bar()
 
     def on_volume_down(self):
-        ws = cdp_find_ws(self._last_url_hint())
-        if not cdp_adjust_volume(ws, -0.1):
+        post_event("playback", {"action": "volume_down"})
+        tab = cdp_find_tab(self._last_url_hint())
+        if not cdp_adjust_volume(tab, -0.1):
             try:
                 for _ in range(5):
                     win32api.keybd_event(0xAE, 0, 0, 0)
@@ -1394,20 +1471,9 @@ class ControlBar(tk.Tk):
         self._refocus_bar()
 
     def on_fullscreen_toggle(self):
-        ws = cdp_find_ws(self._last_url_hint())
-        done = False
-        if ws and websocket:
-            try:
-                w = websocket.create_connection(ws, timeout=0.8)
-                try:
-                    _cdp_send(w, "Input.dispatchKeyEvent", {"type": "keyDown", "key": "f", "code": "KeyF", "windowsVirtualKeyCode": 0x46, "keyCode": 0x46})
-                    _cdp_send(w, "Input.dispatchKeyEvent", {"type": "keyUp", "key": "f", "code": "KeyF", "windowsVirtualKeyCode": 0x46, "keyCode": 0x46})
-                    done = True
-                finally:
-                    try: w.close()
-                    except Exception: pass
-            except Exception:
-                done = False
+        post_event("playback", {"action": "fullscreen"})
+        tab = cdp_find_tab(self._last_url_hint())
+        done = cdp_press_key(tab, "f", "KeyF", 0x46)
         if not done:
             if focus_chrome_window():
                 try:
@@ -1428,6 +1494,9 @@ class ControlBar(tk.Tk):
         except Exception:
             pass
 
+        # Tell the page before we exit (blocking, the process ends below)
+        post_event("control_bar", {"state": "closed"}, wait=True)
+
         # 2. Close ALL Chrome windows - just kill them all
         try:
             print("[Exit] Closing all Chrome windows...")
@@ -1445,17 +1514,50 @@ class ControlBar(tk.Tk):
         # 4. Hard exit the control bar
         os._exit(0)
 
-    def _apply_post_nav(self, prof: PlatformProfile) -> bool:
-        """Apply post-navigation keys for platform (e.g., x,enter,p,f for Plex, f for YouTube)."""
-        ok = False
-        ws = cdp_find_ws(self._last_url_hint())
-        if ws:
+    def _apply_post_nav(self, prof: PlatformProfile, on_done: Optional[Callable[[bool], None]] = None):
+        """
+        Apply post-navigation keys for platform (e.g., x,enter,p,f for Plex, f for YouTube).
+        The keys (and their DOM waits) run on a worker thread so the bar keeps
+        responding; on_done(ok) is then called on the Tk thread.
+        """
+        def _work():
             try:
-                ok = cdp_ensure_play_and_fullscreen(ws)
-            except Exception:
+                ok = self._run_post_nav(prof)
+            except Exception as e:
+                print(f"[PostNav] Error: {e}")
                 ok = False
-        if ok:
-            return True
+            try:
+                self.after(0, _finish, ok)
+            except Exception:
+                pass
+
+        def _finish(ok: bool):
+            # Only refocus bar if NOT during bootstrap automation
+            # During bootstrap, focus management will be started separately
+            if not getattr(self, '_automation_in_progress', False):
+                self._refocus_for(1.5)
+            if on_done:
+                on_done(ok)
+
+        threading.Thread(target=_work, name="post-nav", daemon=True).start()
+
+    def _run_post_nav(self, prof: PlatformProfile) -> bool:
+        """Send the profile's post_nav steps (worker thread). Returns True if they were delivered."""
+        steps = list(prof.get("post_nav") or [])
+        tab = cdp_find_tab(self._last_url_hint())
+        if tab:
+            # Whole sequence goes to the tab over DevTools; focus doesn't matter
+            try:
+                done = run_key_sequence(_cdp(), tab, steps)
+            except Exception as e:
+                print(f"[PostNav] DevTools sequence failed: {e}")
+                done = 0
+            if done == len(steps):
+                if prof.get("post_nav_autoplay", True):
+                    cdp_ensure_playing(tab)
+                return True
+            steps = steps[done:]
+            print(f"[PostNav] DevTools unavailable; {len(steps)} key(s) left for the OS")
 
         played_fullscreen = False
         if focus_chrome_window():
@@ -1472,27 +1574,12 @@ class ControlBar(tk.Tk):
                     pyautogui.click(sw // 2, sh // 2)
                 time.sleep(0.3)
 
-                def _vk_for(k: str) -> Optional[int]:
-                    if not k:
-                        return None
-                    k = k.lower()
-                    if k in ("enter", "return"):
-                        return 0x0D
-                    if k in ("space",):
-                        return 0x20
-                    if len(k) == 1 and "a" <= k <= "z":
-                        return ord(k.upper())
-                    return None
-
-                # Send post_nav keys with proper delays (1 second for Plex sequence)
-                post_nav_keys = prof.get("post_nav") or []
-                platform_name = prof.get("name", "").lower()
-                
-                # Use longer delays for Plex (x, enter, p, f needs time between each)
-                key_delay = 1.0 if platform_name == "plex" else 0.3
-                
-                for key in post_nav_keys:
-                    vk = _vk_for(str(key))
+                # No DOM access here, so step conditions become fixed delays
+                key_delay = float(prof.get("post_nav_delay", 0.3))
+
+                for step in steps:
+                    key = step.get("key") if isinstance(step, dict) else step
+                    vk = vk_for(key)
                     if vk is None:
                         continue
                     print(f"[PostNav] Pressing '{key}' (VK={hex(vk)})")
@@ -1504,18 +1591,13 @@ class ControlBar(tk.Tk):
             except Exception as e:
                 print(f"[PostNav] Error: {e}")
                 played_fullscreen = False
-
-        # Only refocus bar if NOT during bootstrap automation
-        # During bootstrap, focus management will be started separately
-        if not getattr(self, '_automation_in_progress', False):
-            self._refocus_for(1.5)
         return played_fullscreen
 
     def _ensure_fullscreen_once(self, prof: PlatformProfile):
         try:
-            ws = cdp_find_ws(self._last_url_hint())
-            if ws:
-                cdp_ensure_play_and_fullscreen(ws)
+            tab = cdp_find_tab(self._last_url_hint())
+            if tab:
+                cdp_ensure_play_and_fullscreen(tab)
                 return
         except Exception:
             pass
@@ -1547,6 +1629,8 @@ def main():
     ap.add_argument("--cdp", action="store_true", help="Launch Chrome with --remote-debugging-port=9222 for best results")
     ap.add_argument("--app-title", type=str, default=None, help="Title of the main app to refocus on exit")
     ap.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before showing the bar")
+    ap.add_argument("--post-nav-done", action="store_true",
+                    help="The launcher already pressed the platform's keys; don't replay post_nav")
     args = ap.parse_args()
 
     if args.delay > 0:
@@ -1555,7 +1639,7 @@ def main():
     if args.app_title:
         APP_TITLE_MAIN = args.app_title
 
-    app = ControlBar(args.mode, args.show)
+    app = ControlBar(args.mode, args.show, post_nav_done=args.post_nav_done)
     app.mainloop()
 
 
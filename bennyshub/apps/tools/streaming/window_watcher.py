@@ -0,0 +1,191 @@
+"""
+Window Watcher - Event-driven foreground and window notifications.
+
+The control bar used to poll: every 400 ms it re-forced the foreground and
+enumerated all top-level windows to minimize consoles. A watcher delivers
+the same information as events, so an idle bar does no work at all:
+
+    on_foreground(cb)        cb(hwnd)              the foreground window changed
+    on_window_shown(cb)      cb(hwnd, class_name)  a top-level window became visible
+
+Backends:
+    WinEventWatcher  SetWinEventHook (out-of-context) on a message-loop
+                     thread. Windows only.
+    FakeWatcher      emit_*() methods fire the callbacks directly; used off
+                     Windows, where there are no window events to hook.
+    NullWatcher      never delivers anything and start() returns False; used
+                     when the WinEvent backend can't be created on Windows, so
+                     callers fall back to polling.
+
+Callbacks run on the watcher's threads; GUI code should marshal them onto
+its own thread (e.g. tk's after()).
+
+Usage:
+    from window_watcher import create_watcher
+
+    watcher = create_watcher()
+    watcher.on_foreground(lambda hwnd: print("foreground", hwnd))
+    watcher.start()
+    ...
+    watcher.stop()
+"""
+
+import abc
+import sys
+import threading
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_SHOW = 0x8002
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WM_QUIT = 0x0012
+GA_ROOT = 2
+
+
+class WindowWatcher(abc.ABC):
+    """Callback registry shared by the backends."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._foreground = []
+        self._shown = []
+
+    def on_foreground(self, callback):
+        with self._lock:
+            self._foreground.append(callback)
+
+    def on_window_shown(self, callback):
+        with self._lock:
+            self._shown.append(callback)
+
+    def _fire(self, callbacks, *args):
+        with self._lock:
+            callbacks = list(callbacks)
+        for callback in callbacks:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"[Watcher] Callback error: {e}")
+
+    @abc.abstractmethod
+    def start(self):
+        """Begin delivering events. Returns True if the backend is running."""
+
+    def stop(self):
+        pass
+
+
+class FakeWatcher(WindowWatcher):
+    """In-process backend for non-Windows runs; emit_*() fire the callbacks."""
+
+    def __init__(self):
+        super().__init__()
+        self.running = False
+
+    def start(self):
+        self.running = True
+        return True
+
+    def stop(self):
+        self.running = False
+
+    def emit_foreground(self, hwnd):
+        self._fire(self._foreground, hwnd)
+
+    def emit_window_shown(self, hwnd, class_name):
+        self._fire(self._shown, hwnd, class_name)
+
+
+class NullWatcher(WindowWatcher):
+    """Backend that delivers no events; start() reports it isn't running."""
+
+    def start(self):
+        return False
+
+
+class WinEventWatcher(WindowWatcher):
+    """SetWinEventHook backend (Windows only)."""
+
+    def __init__(self):
+        super().__init__()
+        import ctypes
+        from ctypes import wintypes
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._user32.GetAncestor.argtypes = (wintypes.HWND, wintypes.UINT)
+        self._user32.GetAncestor.restype = wintypes.HWND
+        self._thread = None
+        self._thread_id = None
+        self._started = threading.Event()
+        self._ok = False
+        self._hooks = []
+        self._proc = None  # keeps the ctypes callback alive while hooked
+
+    # ---------- WinEvent hooks ----------
+    def _class_name(self, hwnd):
+        buf = self._ctypes.create_unicode_buffer(256)
+        self._user32.GetClassNameW(hwnd, buf, 256)
+        return buf.value
+
+    def _on_event(self, _hook, event, hwnd, id_object, id_child, _thread, _time):
+        if not hwnd or id_object != OBJID_WINDOW or id_child != CHILDID_SELF:
+            return
+        if event == EVENT_SYSTEM_FOREGROUND:
+            self._fire(self._foreground, hwnd)
+        elif event == EVENT_OBJECT_SHOW:
+            # Top-level windows only; child controls show/hide constantly
+            if self._user32.GetAncestor(hwnd, GA_ROOT) == hwnd:
+                self._fire(self._shown, hwnd, self._class_name(hwnd))
+
+    def _run(self):
+        ctypes, wintypes = self._ctypes, self._wintypes
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        self._proc = WinEventProc(self._on_event)
+        self._user32.SetWinEventHook.restype = wintypes.HANDLE
+        self._thread_id = self._kernel32.GetCurrentThreadId()
+        flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        for event in (EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_SHOW):
+            hook = self._user32.SetWinEventHook(event, event, 0, self._proc, 0, 0, flags)
+            if hook:
+                self._hooks.append(hook)
+        self._ok = bool(self._hooks)
+        self._started.set()
+        if not self._ok:
+            print("[Watcher] SetWinEventHook failed")
+            return
+        # Out-of-context hooks are delivered through this thread's message queue
+        msg = wintypes.MSG()
+        while self._user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            self._user32.TranslateMessage(ctypes.byref(msg))
+            self._user32.DispatchMessageW(ctypes.byref(msg))
+        for hook in self._hooks:
+            self._user32.UnhookWinEvent(hook)
+        self._hooks = []
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="win-event-hook", daemon=True)
+            self._thread.start()
+            self._started.wait(2.0)
+        return self._ok
+
+    def stop(self):
+        if self._thread_id:
+            self._user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+
+
+def create_watcher():
+    """WinEventWatcher on Windows (NullWatcher if it can't be created), FakeWatcher elsewhere."""
+    if sys.platform == "win32":
+        try:
+            return WinEventWatcher()
+        except Exception as e:
+            print(f"[Watcher] WinEvent backend unavailable: {e}")
+            return NullWatcher()
+    return FakeWatcher()
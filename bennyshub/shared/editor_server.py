@@ -14,6 +14,13 @@ Usage:
     python editor_server.py --editor matchymatch
     python editor_server.py --editor wordjumble
     python editor_server.py --editor phraseboard
+    python editor_server.py --daemon
+
+Daemon mode keeps one long-lived server running for every editor. Once the
+socket is listening it prints "[EditorServer] READY port=<port>" on stdout and
+records {"port", "pid"} in editor-server.json next to this script. Later
+launches (including plain --editor runs) find that file, ping the daemon and
+just open a URL instead of starting another interpreter and scanning ports.
 """
 
 import http.server
@@ -29,8 +36,11 @@ import time
 import urllib.request
 import urllib.error
 import ssl
+import signal
 from urllib.parse import urlparse, parse_qs, unquote, urlencode
 
+from http_metrics import RequestMetrics, MetricsHandlerMixin, get_logger
+
 # Base directory is the bennyshub folder
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -50,6 +60,9 @@ EDITORS = {
     'peggle': ('apps/games/BENNYSPEGGLE', 'editor.html'),
 }
 
+# Daemon state file - written once the daemon is listening, removed on shutdown
+DAEMON_STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'editor-server.json')
+
 # Chrome path
 CHROME_PATH = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
 
@@ -67,16 +80,19 @@ ssl_context = ssl.create_default_context()
 ssl_context.check_hostname = False
 ssl_context.verify_mode = ssl.CERT_NONE
 
-class EditorHandler(http.server.SimpleHTTPRequestHandler):
+# Request metrics (served at /api/metrics) and leveled logging (HUB_LOG_LEVEL)
+log = get_logger("EditorServer")
+METRICS = RequestMetrics()
+
+class EditorHandler(MetricsHandlerMixin, http.server.SimpleHTTPRequestHandler):
     """Handler that serves files from bennyshub directory and handles API requests."""
     
+    logger = log
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=BASE_DIR, **kwargs)
     
-    def log_message(self, format, *args):
-        """Print logs to console."""
-        sys.stderr.write(f"[EditorServer] {format % args}\n")
-    
+    @METRICS.instrument
     def do_GET(self):
         """Handle GET requests including API endpoints."""
         parsed = urlparse(self.path)
@@ -87,6 +103,16 @@ class EditorHandler(http.server.SimpleHTTPRequestHandler):
             self.handle_api_proxy('GET')
             return
         
+        # API: Request counts and latencies per route
+        if path == '/api/metrics':
+            self.send_json(METRICS.snapshot())
+            return
+        
+        # API: Liveness check used by launchers to reuse a running daemon
+        if path == '/api/ping':
+            self.send_json({'ok': True, 'pid': os.getpid(), 'port': self.server.server_address[1]})
+            return
+        
         # API: List available editors
         if path == '/api/editors':
             self.send_json({
@@ -104,6 +130,7 @@ class EditorHandler(http.server.SimpleHTTPRequestHandler):
         # Serve static files from bennyshub
         return super().do_GET()
     
+    @METRICS.instrument
     def do_POST(self):
         """Handle POST requests for saving data."""
         parsed = urlparse(self.path)
@@ -324,6 +351,7 @@ class EditorHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         super().end_headers()
     
+    @METRICS.instrument
     def do_OPTIONS(self):
         """Handle CORS preflight."""
         self.send_response(200)
@@ -375,7 +403,7 @@ class EditorHandler(http.server.SimpleHTTPRequestHandler):
             if query_string:
                 target_url = f"{target_url}?{query_string}"
             
-            self.log_message(f"Proxying {method} -> {target_url}")
+            log.debug(f"Proxying {method} -> {target_url}")
             
             # Make the request to the external API
             req = urllib.request.Request(target_url, method=method)
@@ -391,8 +419,10 @@ class EditorHandler(http.server.SimpleHTTPRequestHandler):
                     req.add_header('Content-Type', self.headers.get('Content-Type', 'application/json'))
             
             try:
-                with urllib.request.urlopen(req, data=body_data, timeout=30, context=ssl_context) as response:
+                with METRICS.upstream(service) as upstream, \
+                        urllib.request.urlopen(req, data=body_data, timeout=30, context=ssl_context) as response:
                     response_data = response.read()
+                    upstream['status'] = response.status
                     content_type = response.headers.get('Content-Type', 'application/json')
                     
                     self.send_response(response.status)
@@ -403,15 +433,15 @@ class EditorHandler(http.server.SimpleHTTPRequestHandler):
                     
             except urllib.error.HTTPError as e:
                 error_body = e.read().decode('utf-8', errors='replace')
-                self.log_message(f"Proxy HTTP Error {e.code}: {error_body[:200]}")
+                log.warning(f"Proxy HTTP Error {e.code}: {error_body[:200]}")
                 self.send_json({'error': f'API returned {e.code}', 'details': error_body[:500]}, e.code)
                 
             except urllib.error.URLError as e:
-                self.log_message(f"Proxy URL Error: {e.reason}")
+                log.warning(f"Proxy URL Error: {e.reason}")
                 self.send_json({'error': f'Failed to connect to API: {e.reason}'}, 502)
                 
         except Exception as e:
-            self.log_message(f"Proxy Error: {str(e)}")
+            log.error(f"Proxy Error: {str(e)}")
             self.send_json({'error': str(e)}, 500)
 
 
@@ -433,6 +463,57 @@ def find_free_port(start=8800, end=8900):
     return None
 
 
+def editor_url(port, editor=None):
+    """Build the URL for an editor (or the server root) on the given port."""
+    if editor and editor.lower() in EDITORS:
+        editor_path, editor_file = EDITORS[editor.lower()]
+        return f"http://127.0.0.1:{port}/{editor_path}/{editor_file}"
+    return f"http://127.0.0.1:{port}/"
+
+
+def ping_server(port, timeout=0.5):
+    """Return True if an editor server answers /api/ping on the given port."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/ping", timeout=timeout) as response:
+            return json.loads(response.read()).get('ok') is True
+    except Exception:
+        return False
+
+
+def find_running_daemon():
+    """
+    Return the port of a live editor daemon, or None.
+    
+    Reads DAEMON_STATE_FILE and confirms the daemon still answers; a stale
+    file (crashed daemon, reused port) is ignored.
+    """
+    try:
+        with open(DAEMON_STATE_FILE, 'r', encoding='utf-8') as f:
+            port = int(json.load(f).get('port'))
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None
+    return port if ping_server(port) else None
+
+
+def write_daemon_state(port):
+    """Record the daemon port/pid atomically so readers never see a partial file."""
+    tmp_path = DAEMON_STATE_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'port': port, 'pid': os.getpid()}, f)
+    os.replace(tmp_path, DAEMON_STATE_FILE)
+
+
+def clear_daemon_state():
+    """Remove the daemon state file if it still belongs to this process."""
+    try:
+        with open(DAEMON_STATE_FILE, 'r', encoding='utf-8') as f:
+            if json.load(f).get('pid') != os.getpid():
+                return
+        os.remove(DAEMON_STATE_FILE)
+    except (OSError, ValueError, AttributeError):
+        pass
+
+
 def open_chrome(url, fullscreen=False):
     """Open URL in Chrome browser."""
     chrome_path = CHROME_PATH
@@ -477,13 +558,8 @@ def start_server(editor=None, port=None, open_browser=True, fullscreen=False):
         print(f"[EditorServer] ERROR: Could not start server on port {port}: {e}")
         return None, None, None
     
-    # Determine editor URL
-    if editor and editor.lower() in EDITORS:
-        editor_path, editor_file = EDITORS[editor.lower()]
-        url = f"http://127.0.0.1:{port}/{editor_path}/{editor_file}"
-    else:
-        # Default to base URL if no editor specified
-        url = f"http://127.0.0.1:{port}/"
+    # Determine editor URL (base URL if no editor specified)
+    url = editor_url(port, editor)
     
     print(f"[EditorServer] Starting server at http://127.0.0.1:{port}")
     print(f"[EditorServer] Serving from: {BASE_DIR}")
@@ -495,9 +571,9 @@ def start_server(editor=None, port=None, open_browser=True, fullscreen=False):
     server_thread = threading.Thread(target=server.serve_forever, daemon=True)
     server_thread.start()
     
-    # Open in Chrome if requested
+    # Open in Chrome if requested - the socket is already listening once
+    # ThreadingServer is constructed, so no startup delay is needed
     if open_browser:
-        time.sleep(0.5)  # Give server a moment to start
         print(f"[EditorServer] Opening Chrome: {url}")
         open_chrome(url, fullscreen)
     
@@ -518,6 +594,8 @@ def main():
                        help='Open Chrome in fullscreen mode')
     parser.add_argument('--list', '-l', action='store_true',
                        help='List available editors')
+    parser.add_argument('--daemon', '-d', action='store_true',
+                       help='Run as the shared long-lived editor daemon')
     
     args = parser.parse_args()
     
@@ -527,6 +605,22 @@ def main():
             print(f"  {name:15} -> {path}/{file}")
         return
     
+    # Reuse a running daemon: opening an editor is then just a URL open
+    running_port = find_running_daemon()
+    if running_port:
+        url = editor_url(running_port, args.editor)
+        if args.daemon:
+            print(f"[EditorServer] READY port={running_port}", flush=True)
+        else:
+            print(f"[EditorServer] Reusing daemon at http://127.0.0.1:{running_port}")
+            if not args.no_browser:
+                open_chrome(url, args.fullscreen)
+        return
+    
+    if args.daemon:
+        run_daemon(args.port)
+        return
+    
     server, port, url = start_server(
         editor=args.editor,
         port=args.port,
@@ -546,5 +640,31 @@ def main():
             server.shutdown()
 
 
+def run_daemon(port=None):
+    """
+    Run the shared editor daemon until interrupted.
+    
+    The readiness handshake happens only after the socket is bound: the state
+    file is written and a READY line is flushed to stdout for the launcher.
+    """
+    server, port, url = start_server(port=port, open_browser=False)
+    if not server:
+        sys.exit(1)
+    
+    # Treat termination like Ctrl+C so the state file is cleaned up
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    
+    write_daemon_state(port)
+    print(f"[EditorServer] READY port={port}", flush=True)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n[EditorServer] Shutting down daemon...")
+    finally:
+        clear_daemon_state()
+        server.shutdown()
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,179 @@
+"""
+Event Bus - In-process publish/subscribe with Server-Sent Events helpers.
+
+A server holds one EventBus. Code in the same process calls publish();
+other hub Python processes (the control bar, tools) call post_event(),
+which POSTs the event to the server's /api/events endpoint where it is
+published on the bus. Browsers subscribe with EventSource("/api/events")
+and receive every event as it happens.
+
+The last few hundred events are kept in a ring buffer, so a reconnecting
+EventSource (which sends Last-Event-ID) gets what it missed. Each subscriber
+has a bounded queue; a stalled client loses its oldest events rather than
+slowing publishers down.
+
+Usage (server):
+    from event_bus import EventBus, stream_events
+
+    EVENTS = EventBus()
+    EVENTS.publish("launch", {"title": "Bluey"})
+
+    # inside a request handler for GET /api/events
+    stream_events(self, EVENTS)
+
+Usage (another process):
+    from event_bus import post_event
+    post_event("playback", {"state": "paused"})   # non-blocking, best effort
+"""
+
+import itertools
+import json
+import queue
+import threading
+import time
+import urllib.request
+from collections import deque
+
+DEFAULT_HISTORY = 256
+SUBSCRIBER_QUEUE_SIZE = 256
+KEEPALIVE_INTERVAL = 15.0
+DEFAULT_EVENTS_URL = "http://127.0.0.1:8000/api/events"
+
+
+class Subscription:
+    """One listener's queue of events."""
+
+    def __init__(self, bus, backlog):
+        self._bus = bus
+        self._queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        for event in backlog:
+            self._put(event)
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Drop the oldest event to make room
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                pass
+
+    def get(self, timeout=None):
+        """Next event dict, or None if nothing arrived within `timeout` seconds."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._bus._unsubscribe(self)
+
+
+class EventBus:
+    """Thread-safe publisher with replay of recent events."""
+
+    def __init__(self, history=DEFAULT_HISTORY):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._history = deque(maxlen=history)
+        self._subscribers = set()
+
+    def publish(self, event_type, data=None):
+        """Publish an event to every subscriber. Returns the event dict."""
+        event = {
+            "id": next(self._ids),
+            "type": str(event_type),
+            "time": int(time.time() * 1000),
+            "data": data if data is not None else {},
+        }
+        with self._lock:
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub._put(event)
+        return event
+
+    def subscribe(self, last_event_id=None):
+        """
+        Start listening. With last_event_id, events after it that are still
+        in the history are delivered first.
+        """
+        with self._lock:
+            backlog = []
+            if last_event_id is not None:
+                backlog = [e for e in self._history if e["id"] > last_event_id]
+            sub = Subscription(self, backlog)
+            self._subscribers.add(sub)
+        return sub
+
+    def _unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+def format_sse(event):
+    """Encode an event in text/event-stream framing."""
+    payload = json.dumps(event["data"], separators=(",", ":"))
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n".encode("utf-8")
+
+
+def stream_events(handler, bus, keepalive=KEEPALIVE_INTERVAL):
+    """
+    Serve a text/event-stream response on a BaseHTTPRequestHandler until the
+    client disconnects. Needs a threading server: the call blocks for as long
+    as the browser stays connected.
+    """
+    try:
+        last_id = int(handler.headers.get("Last-Event-ID", ""))
+    except ValueError:
+        last_id = None
+    sub = bus.subscribe(last_id)
+    handler.close_connection = True
+    try:
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Connection", "keep-alive")
+        handler.send_header("X-Accel-Buffering", "no")
+        handler.end_headers()
+        handler.wfile.write(b"retry: 2000\n\n")
+        handler.wfile.flush()
+        while True:
+            event = sub.get(timeout=keepalive)
+            handler.wfile.write(format_sse(event) if event else b": keepalive\n\n")
+            handler.wfile.flush()
+    except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError, OSError):
+        pass  # client went away
+    finally:
+        sub.close()
+
+
+def post_event(event_type, data=None, url=DEFAULT_EVENTS_URL, timeout=0.5, wait=False):
+    """
+    Publish an event on a server's bus from another process. Runs on a
+    background thread unless wait=True; failures (server not running) are
+    ignored. Returns True if the event was accepted (only meaningful with wait).
+    """
+    body = json.dumps({"type": event_type, "data": data or {}}).encode("utf-8")
+
+    def _send():
+        try:
+            req = urllib.request.Request(url, data=body, method="POST",
+                                         headers={"Content-Type": "application/json"})
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                return 200 <= resp.status < 300
+        except Exception:
+            return False
+
+    if wait:
+        return _send()
+    threading.Thread(target=_send, daemon=True).start()
+    return True
@@ -0,0 +1,251 @@
+"""
+HTTP Metrics - Request instrumentation and leveled logging for the hub HTTP servers.
+
+Both the streaming server and the editor server are SimpleHTTPRequestHandler
+subclasses. RequestMetrics records, per route:
+
+    count / errors / status codes
+    in-flight requests (gauge)
+    latency histogram (fixed millisecond buckets) with p50/p95/p99 estimates
+
+plus the same latency data for upstream calls the server makes (API proxy
+requests). snapshot() returns everything as plain JSON for /api/metrics.
+Long-lived streaming routes (Server-Sent Events such as /api/events) are
+counted as open "streams" rather than requests in flight.
+
+Routes are normalized so per-file or per-id paths don't create unbounded
+keys: "/img/<hash>" -> "/img/:hash", "/api/proxy/tmdb/..." -> "/api/proxy/tmdb",
+static files -> "static".
+
+Logging goes through the standard logging module with a bracketed prefix
+("[Streaming] ...") so the console looks like before. Set HUB_LOG_LEVEL to
+DEBUG to see every request, or OFF to silence the servers entirely.
+
+Usage:
+    from http_metrics import RequestMetrics, MetricsHandlerMixin, get_logger
+
+    log = get_logger("Streaming")
+    METRICS = RequestMetrics()
+
+    class Handler(MetricsHandlerMixin, http.server.SimpleHTTPRequestHandler):
+        logger = log
+
+        @METRICS.instrument
+        def do_GET(self):
+            ...
+
+    with METRICS.upstream("tmdb"):
+        urllib.request.urlopen(...)
+"""
+
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+# Routes whose responses stay open (SSE); not counted in the global in_flight
+STREAMING_ROUTES = ("/api/events",)
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +inf)
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+LOG_LEVEL_ENV = "HUB_LOG_LEVEL"
+_OFF = logging.CRITICAL + 10
+
+
+def get_logger(name):
+    """
+    Logger printing "[name] message" to stderr, level from HUB_LOG_LEVEL
+    (DEBUG, INFO, WARNING, ERROR or OFF; default INFO).
+    """
+    logger = logging.getLogger(f"hub.{name}")
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter(f"[{name}] %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    level_name = os.environ.get(LOG_LEVEL_ENV, "INFO").upper()
+    logger.setLevel(_OFF if level_name == "OFF" else getattr(logging, level_name, logging.INFO))
+    return logger
+
+
+def normalize_route(path):
+    """Collapse per-file / per-id paths into a bounded set of route names."""
+    if path.startswith("/api/proxy/"):
+        parts = path.split("/")
+        return "/".join(parts[:4]) if len(parts) > 3 else "/api/proxy"
+    if path.startswith("/api/"):
+        return path
+    if path.startswith("/img/"):
+        return "/img/:hash"
+    if path.startswith("/shared/"):
+        return "/shared/*"
+    if path.endswith("/") or os.path.splitext(path)[1]:
+        return "static"
+    return path  # fixed action routes such as /save_data
+
+
+class _Histogram:
+    __slots__ = ("count", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def observe(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else round(self.max_ms, 2)
+        return round(self.max_ms, 2)
+
+    def snapshot(self):
+        labels = [f"le_{b}" for b in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class _RouteStats:
+    __slots__ = ("in_flight", "errors", "statuses", "latency")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.errors = 0
+        self.statuses = {}
+        self.latency = _Histogram()
+
+    def snapshot(self):
+        data = self.latency.snapshot()
+        data.update({"in_flight": self.in_flight, "errors": self.errors, "statuses": dict(self.statuses)})
+        return data
+
+
+class RequestMetrics:
+    """Thread-safe per-route and per-upstream request statistics."""
+
+    def __init__(self, route_fn=normalize_route, streaming_routes=STREAMING_ROUTES):
+        self.route_fn = route_fn
+        self.streaming_routes = frozenset(streaming_routes)
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._upstreams = {}
+
+    def _begin(self, table, key):
+        with self._lock:
+            stats = table.get(key)
+            if stats is None:
+                stats = table[key] = _RouteStats()
+            stats.in_flight += 1
+        return stats
+
+    def _end(self, stats, started, status):
+        ms = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            stats.in_flight -= 1
+            stats.latency.observe(ms)
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+            if not isinstance(status, int) or status >= 500:
+                stats.errors += 1
+        return ms
+
+    def instrument(self, method):
+        """Decorator for do_GET/do_POST/...: times the request under its route."""
+        @functools.wraps(method)
+        def wrapper(handler, *args, **kwargs):
+            route = f"{handler.command} {self.route_fn(urlparse(handler.path).path)}"
+            handler._metrics_status = None
+            stats = self._begin(self._routes, route)
+            started = time.perf_counter()
+            try:
+                return method(handler, *args, **kwargs)
+            except Exception:
+                handler._metrics_status = handler._metrics_status or 500
+                raise
+            finally:
+                self._end(stats, started, handler._metrics_status or 200)
+        return wrapper
+
+    @contextmanager
+    def upstream(self, name):
+        """
+        Time an outgoing call. The yielded dict's "status" may be set by the
+        caller; an exception counts as an error.
+        """
+        stats = self._begin(self._upstreams, name)
+        started = time.perf_counter()
+        outcome = {"status": "ok"}
+        try:
+            yield outcome
+        except Exception as e:
+            outcome["status"] = getattr(e, "code", None) or "error"
+            raise
+        finally:
+            self._end(stats, started, outcome["status"] if outcome["status"] != "ok" else 200)
+
+    def snapshot(self):
+        with self._lock:
+            routes = {k: v.snapshot() for k, v in sorted(self._routes.items())}
+            upstreams = {k: v.snapshot() for k, v in sorted(self._upstreams.items())}
+        # Route keys are "<METHOD> <route>"
+        streams = {k for k in routes if k.split(" ", 1)[-1] in self.streaming_routes}
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "in_flight": sum(r["in_flight"] for k, r in routes.items() if k not in streams),
+            "streams": sum(routes[k]["in_flight"] for k in streams),
+            "routes": routes,
+            "upstreams": upstreams,
+        }
+
+
+class MetricsHandlerMixin:
+    """
+    Mixin for SimpleHTTPRequestHandler subclasses: records the response status
+    for RequestMetrics and sends request/diagnostic logs to a leveled logger
+    instead of printing every request to stderr.
+    """
+
+    logger = logging.getLogger("hub")
+    _metrics_status = None
+
+    def log_request(self, code="-", size="-"):
+        try:
+            self._metrics_status = int(getattr(code, "value", code))
+        except (TypeError, ValueError):
+            pass
+        self.logger.debug('%s "%s" %s', self.address_string(), self.requestline, code)
+
+    def log_error(self, format, *args):
+        self.logger.warning(format, *args)
+
+    def log_message(self, format, *args):
+        self.logger.info(format, *args)
@@ -0,0 +1,161 @@
+"""
+Phrase Cache - Pre-rendered WAVs for short phrases spoken over and over.
+
+Scanning speaks the same labels all day ("A", "Row 2", "Next",
+"Play / Pause"). Synthesising each one live costs a full engine round trip
+before any sound comes out. PhraseCache keeps a WAV per phrase, rendered
+once with the current voice, and plays it straight from disk with winsound,
+so sound starts almost as soon as the highlight moves.
+
+Renderings live in one directory per voice-settings hash
+(voice, rate, pitch, volume), so changing the voice starts a fresh set
+instead of playing stale audio. Rendering happens on the speech daemon's
+thread while it is idle; until a phrase is ready it is spoken live.
+
+Usage (inside the speech daemon):
+    cache = PhraseCache("speech_cache")
+    cache.set_settings(get_voice_settings())
+    clip = cache.lookup("Next")          # (path, seconds) or None
+    if clip is None:
+        cache.request("Next")            # render later
+    cache.render_next(voice)             # when idle; voice.render(text, path)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import wave
+
+try:
+    import winsound
+except ImportError:
+    winsound = None
+
+MAX_PHRASES = 2000        # per settings directory; dynamic text shouldn't fill the disk
+MAX_PHRASE_LENGTH = 60
+SETTINGS_KEYS = ("voiceName", "voiceIndex", "rate", "pitch", "volume")
+
+
+def settings_hash(settings):
+    subset = {k: (settings or {}).get(k) for k in SETTINGS_KEYS}
+    return hashlib.sha1(json.dumps(subset, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def _phrase_key(text):
+    return hashlib.sha1(text.strip().casefold().encode("utf-8")).hexdigest()
+
+
+class PhraseCache:
+    """WAV renderings of phrases for the current voice settings."""
+
+    def __init__(self, root, max_phrases=MAX_PHRASES):
+        self.root = root
+        self.max_phrases = max_phrases
+        self._lock = threading.Lock()
+        self._dir = None
+        self._clips = {}       # phrase key -> (path, seconds) for the current settings
+        self._pending = {}     # phrase key -> text, waiting to be rendered
+
+    # ---------- Settings ----------
+    def set_settings(self, settings):
+        """Switch to the rendering set for these voice settings."""
+        directory = os.path.join(self.root, settings_hash(settings))
+        with self._lock:
+            if directory == self._dir:
+                return
+            self._dir = directory
+            self._clips = {}
+            self._pending = {}
+        self._scan(directory)
+
+    def _scan(self, directory):
+        clips = {}
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            names = []
+        for name in names:
+            if name.endswith(".wav") and not name.endswith(".part.wav"):
+                path = os.path.join(directory, name)
+                seconds = self._duration(path)
+                if seconds is not None:
+                    clips[name[:-4]] = (path, seconds)
+        with self._lock:
+            if directory == self._dir:
+                self._clips.update(clips)
+        if clips:
+            print(f"[Speech] {len(clips)} cached phrases for voice set {os.path.basename(directory)}")
+
+    @staticmethod
+    def _duration(path):
+        try:
+            with wave.open(path, "rb") as w:
+                return w.getnframes() / float(w.getframerate() or 1)
+        except (OSError, EOFError, wave.Error):
+            return None
+
+    # ---------- Lookup / rendering ----------
+    @staticmethod
+    def cacheable(text):
+        return bool(text) and len(text) <= MAX_PHRASE_LENGTH
+
+    def lookup(self, text):
+        """(wav path, seconds) if the phrase is rendered for the current voice, else None."""
+        with self._lock:
+            return self._clips.get(_phrase_key(text))
+
+    def request(self, text):
+        """Queue a phrase for rendering. Returns True if it was queued."""
+        if not self.cacheable(text) or winsound is None:
+            return False
+        key = _phrase_key(text)
+        with self._lock:
+            if self._dir is None or key in self._clips or key in self._pending:
+                return False
+            if len(self._clips) + len(self._pending) >= self.max_phrases:
+                return False
+            self._pending[key] = text.strip()
+        return True
+
+    def has_pending(self):
+        with self._lock:
+            return bool(self._pending)
+
+    def render_next(self, voice):
+        """Render one queued phrase with voice.render(text, path). Returns True if one was rendered."""
+        with self._lock:
+            if not self._pending:
+                return False
+            key, text = next(iter(self._pending.items()))
+            del self._pending[key]
+            directory = self._dir
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, key + ".wav")
+        tmp_path = os.path.join(directory, key + ".part.wav")  # SAPI wants a .wav name
+        try:
+            if not voice.render(text, tmp_path):
+                return False
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[Speech] Could not render {text!r}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        seconds = self._duration(path)
+        if seconds is None:
+            return False
+        with self._lock:
+            if directory == self._dir:
+                self._clips[key] = (path, seconds)
+        return True
+
+
+def play_clip(clip, cancelled):
+    """Play a cached WAV, returning early (and stopping it) if `cancelled` is set."""
+    path, seconds = clip
+    winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+    if cancelled.wait(seconds):
+        winsound.PlaySound(None, 0)
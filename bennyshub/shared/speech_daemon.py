@@ -0,0 +1,438 @@
+"""
+Speech Daemon - One text-to-speech engine shared by every hub Python process.
+
+The messenger, keyboard, search browser, DM listener and control bars used
+to start their own pyttsx3/SAPI engine, paying the init cost at startup and
+talking over each other on the audio device. The daemon owns the only
+engine; tools send it requests over a local socket (newline-delimited JSON
+on 127.0.0.1:SPEECH_PORT):
+
+    {"op": "speak", "text": "...", "channel": "keyboard", "mode": "latest", "priority": 0}
+    {"op": "stop", "channel": "keyboard"}     channel omitted = stop everything
+    {"op": "ping"}                            replies {"ok": true}
+
+Modes:
+    queue      speak after what is already pending
+    latest     replace anything still pending on the same channel (scan labels)
+    interrupt  like latest, and also cut off the channel's current utterance
+
+Higher priority is spoken first and cuts off a lower-priority utterance
+that is playing ("I need help" over a scan label). Voice, rate, volume and
+the TTS on/off switch come from voice_settings, re-read whenever the
+settings file changes.
+
+Requests with "cache": true (fixed scan labels) are played from WAVs
+pre-rendered by phrase_cache once the daemon has had an idle moment to
+render them; {"op": "prerender", "phrases": [...]} renders a set ahead of
+time.
+
+Usage (daemon, normally started on demand by the client helpers):
+    python speech_daemon.py
+
+Usage (tools):
+    from speech_daemon import speak, stop_speech
+
+    if not speak("Next", channel="control_bar", mode="interrupt", cache=True):
+        ...  # daemon unreachable - fall back to a local engine
+"""
+
+import itertools
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+from phrase_cache import PhraseCache, play_clip, winsound
+
+try:
+    from voice_settings import (  # type: ignore
+        apply_voice_settings, apply_sapi_voice_settings, is_tts_enabled, check_settings_changed,
+        get_voice_settings,
+    )
+    _voice_settings_available = True
+except ImportError:
+    _voice_settings_available = False
+    def get_voice_settings(): return {}  # noqa: E302
+    def apply_voice_settings(_engine): pass  # noqa: E302
+    def apply_sapi_voice_settings(_sapi): pass  # noqa: E302
+    def is_tts_enabled(): return True  # noqa: E302
+    def check_settings_changed(): return False  # noqa: E302
+
+SPEECH_HOST = "127.0.0.1"
+SPEECH_PORT = int(os.environ.get("HUB_SPEECH_PORT", "8071"))
+MODES = ("queue", "latest", "interrupt")
+CONNECT_TIMEOUT = 0.3
+AUTOSTART_INTERVAL = 10.0
+PHRASE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "speech_cache")
+RENDER_IDLE_DELAY = 0.5  # render cached phrases only after this long with nothing to say
+
+
+# ------------------------------ Scheduling ------------------------------
+
+class Utterance:
+    __slots__ = ("seq", "text", "channel", "priority", "cache")
+
+    def __init__(self, seq, text, channel, priority, cache=False):
+        self.seq = seq
+        self.text = text
+        self.channel = channel
+        self.priority = priority
+        self.cache = cache
+
+
+class SpeechQueue:
+    """Pending utterances ordered by priority, then arrival."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._pending = []
+        self.current = None
+
+    def submit(self, text, channel="default", mode="latest", priority=0, cache=False):
+        """Queue text. Returns True if the utterance playing now should be cut off."""
+        with self._cond:
+            if mode in ("latest", "interrupt"):
+                self._pending = [u for u in self._pending if u.channel != channel]
+            self._pending.append(Utterance(next(self._seq), text, channel, priority, cache))
+            self._cond.notify()
+            current = self.current
+            if current is None:
+                return False
+            if priority > current.priority:
+                return True
+            return mode == "interrupt" and current.channel == channel
+
+    def stop(self, channel=None):
+        """Drop pending speech (one channel or all). Returns True if the current utterance should stop."""
+        with self._cond:
+            self._pending = [u for u in self._pending if channel is not None and u.channel != channel]
+            current = self.current
+            return current is not None and (channel is None or current.channel == channel)
+
+    def next(self, timeout=None):
+        """Pop the next utterance to speak (blocks up to timeout), marking it current."""
+        with self._cond:
+            self.current = None
+            if not self._pending:
+                self._cond.wait(timeout)
+            if not self._pending:
+                return None
+            best = min(self._pending, key=lambda u: (-u.priority, u.seq))
+            self._pending.remove(best)
+            self.current = best
+            return best
+
+    def done(self):
+        with self._cond:
+            self.current = None
+
+    def wake(self):
+        """Wake a next() call that is waiting (e.g. new phrases to render)."""
+        with self._cond:
+            self._cond.notify()
+
+
+# ------------------------------ Engines ------------------------------
+
+class _SapiVoice:
+    """SAPI SpVoice: async speak, polled so a cancel takes effect within ~30 ms."""
+
+    def __init__(self):
+        import pythoncom
+        import win32com.client
+        pythoncom.CoInitialize()  # the engine lives on the daemon's speech thread
+        self._dispatch = win32com.client.Dispatch
+        self._voice = self._dispatch("SAPI.SpVoice")
+        self._file_voice = self._dispatch("SAPI.SpVoice")  # renders phrase WAVs
+        self.apply_settings()
+
+    def apply_settings(self):
+        apply_sapi_voice_settings(self._voice)
+        apply_sapi_voice_settings(self._file_voice)
+
+    def render(self, text, path):
+        stream = self._dispatch("SAPI.SpFileStream")
+        stream.Format.Type = 22  # SAFT22kHz16BitMono
+        stream.Open(path, 3)     # SSFMCreateForWrite
+        try:
+            self._file_voice.AudioOutputStream = stream
+            self._file_voice.Speak(text, 0)
+        finally:
+            stream.Close()
+        return True
+
+    def say(self, text, cancelled):
+        self._voice.Speak(text, 1 | 2)  # SVSFlagsAsync | SVSFPurgeBeforeSpeak
+        while not self._voice.WaitUntilDone(30):
+            if cancelled.is_set():
+                self._voice.Speak("", 1 | 2)
+                return
+
+    def interrupt(self):
+        pass  # say() notices the cancel flag
+
+
+class _Pyttsx3Voice:
+    """pyttsx3 fallback; runAndWait blocks, so interrupts call engine.stop()."""
+
+    def __init__(self):
+        import pyttsx3
+        self._engine = pyttsx3.init()
+        self.apply_settings()
+
+    def apply_settings(self):
+        apply_voice_settings(self._engine)
+
+    def say(self, text, cancelled):
+        if cancelled.is_set():
+            return
+        self._engine.say(text)
+        self._engine.runAndWait()
+
+    def render(self, text, path):
+        self._engine.save_to_file(text, path)
+        self._engine.runAndWait()
+        return os.path.exists(path)
+
+    def interrupt(self):
+        try:
+            self._engine.stop()
+        except Exception:
+            pass
+
+
+def _create_voice():
+    for factory in (_SapiVoice, _Pyttsx3Voice):
+        try:
+            return factory()
+        except Exception as e:
+            print(f"[Speech] {factory.__name__} unavailable: {e}")
+    return None
+
+
+# ------------------------------ Daemon ------------------------------
+
+class SpeechDaemon:
+    """Owns the engine thread and applies speak/stop requests to the queue."""
+
+    def __init__(self, voice_factory=_create_voice, cache_dir=PHRASE_CACHE_DIR):
+        self.queue = SpeechQueue()
+        self.cache = PhraseCache(cache_dir)
+        self._voice_factory = voice_factory
+        self._voice = None
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="speech", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _refresh_settings(self):
+        if _voice_settings_available and check_settings_changed():
+            if self._voice is not None:
+                self._voice.apply_settings()
+            self.cache.set_settings(get_voice_settings())
+
+    def _run(self):
+        self._voice = self._voice_factory()
+        if self._voice is None:
+            print("[Speech] No TTS engine available; requests will be dropped")
+        self.cache.set_settings(get_voice_settings())
+        while True:
+            # Clear before picking the next utterance so a cut aimed at it isn't lost
+            self._cancelled.clear()
+            idle = RENDER_IDLE_DELAY if self.cache.has_pending() else None
+            utterance = self.queue.next(idle)
+            if self._voice is None:
+                continue
+            if utterance is None:
+                # Quiet moment: render one phrase, then check for speech again
+                self._refresh_settings()
+                self.cache.render_next(self._voice)
+                continue
+            self._refresh_settings()
+            if _voice_settings_available and not is_tts_enabled():
+                self.queue.done()
+                continue
+            clip = self.cache.lookup(utterance.text) if utterance.cache else None
+            try:
+                if clip:
+                    play_clip(clip, self._cancelled)
+                else:
+                    self._voice.say(utterance.text, self._cancelled)
+                    if utterance.cache:
+                        self.cache.request(utterance.text)
+            except Exception as e:
+                print(f"[Speech] Engine error, recreating: {e}")
+                self._voice = self._voice_factory()
+            self.queue.done()
+
+    def _cut(self):
+        self._cancelled.set()
+        if self._voice is not None:
+            self._voice.interrupt()
+
+    def handle(self, msg):
+        """Apply one request dict. Returns a reply dict."""
+        op = msg.get("op")
+        if op == "speak":
+            text = str(msg.get("text") or "").strip()
+            if not text:
+                return {"ok": False, "error": "empty text"}
+            mode = msg.get("mode") if msg.get("mode") in MODES else "latest"
+            try:
+                priority = int(msg.get("priority") or 0)
+            except (TypeError, ValueError):
+                priority = 0
+            cache = bool(msg.get("cache")) and winsound is not None
+            if self.queue.submit(text, str(msg.get("channel") or "default"), mode, priority, cache):
+                self._cut()
+            return {"ok": True}
+        if op == "prerender":
+            phrases = msg.get("phrases") or []
+            queued = sum(1 for p in phrases if isinstance(p, str) and self.cache.request(p.strip()))
+            if queued:
+                self.queue.wake()
+            return {"ok": True, "queued": queued}
+        if op == "stop":
+            if self.queue.stop(msg.get("channel")):
+                self._cut()
+            return {"ok": True}
+        if op == "ping":
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(msg, dict):
+                continue
+            reply = self.server.daemon.handle(msg)
+            if msg.get("reply"):
+                try:
+                    self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+                except OSError:
+                    return
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = False  # a second daemon must fail to bind
+
+
+def serve(port=SPEECH_PORT):
+    daemon = SpeechDaemon()
+    try:
+        server = _Server((SPEECH_HOST, port), _Handler)
+    except OSError:
+        print(f"[Speech] Port {port} in use; another speech daemon is running")
+        return
+    server.daemon = daemon
+    daemon.start()
+    print(f"[Speech] Listening on {SPEECH_HOST}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ------------------------------ Client ------------------------------
+
+_client_lock = threading.Lock()
+_client_sock = None
+_last_autostart = 0.0
+
+
+def _launch_daemon():
+    global _last_autostart
+    now = time.monotonic()
+    if now - _last_autostart < AUTOSTART_INTERVAL:
+        return
+    _last_autostart = now
+    python = sys.executable
+    kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL,
+              "cwd": os.path.dirname(os.path.abspath(__file__))}
+    if sys.platform == "win32":
+        pythonw = os.path.join(os.path.dirname(python), "pythonw.exe")
+        if os.path.exists(pythonw):
+            python = pythonw
+        kwargs["creationflags"] = 0x00000008 | 0x08000000  # DETACHED_PROCESS | CREATE_NO_WINDOW
+    else:
+        kwargs["start_new_session"] = True
+    try:
+        subprocess.Popen([python, os.path.abspath(__file__)], **kwargs)
+        print("[Speech] Started speech daemon")
+    except OSError as e:
+        print(f"[Speech] Could not start daemon: {e}")
+
+
+def _send(msg, autostart=True):
+    """Send one request on the shared connection, reconnecting once. Returns True if sent."""
+    global _client_sock
+    data = (json.dumps(msg) + "\n").encode("utf-8")
+    with _client_lock:
+        for _attempt in range(2):
+            if _client_sock is None:
+                try:
+                    _client_sock = socket.create_connection((SPEECH_HOST, SPEECH_PORT), timeout=CONNECT_TIMEOUT)
+                    _client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                except OSError:
+                    _client_sock = None
+                    if autostart:
+                        _launch_daemon()
+                    return False
+            try:
+                _client_sock.sendall(data)
+                return True
+            except OSError:
+                try:
+                    _client_sock.close()
+                except OSError:
+                    pass
+                _client_sock = None
+    return False
+
+
+def speak(text, channel="default", mode="latest", priority=0, cache=False):
+    """
+    Ask the daemon to speak. cache=True marks a fixed label worth playing
+    from a pre-rendered WAV. Returns False if the daemon couldn't be reached
+    (it is started in the background so later calls succeed); callers should
+    fall back to their own engine for that utterance.
+    """
+    if not text:
+        return True
+    msg = {"op": "speak", "text": str(text), "channel": channel, "mode": mode, "priority": priority}
+    if cache:
+        msg["cache"] = True
+    return _send(msg)
+
+
+def prerender(phrases):
+    """Ask the daemon to render these labels while it is idle."""
+    return _send({"op": "prerender", "phrases": [str(p) for p in phrases if p]})
+
+
+def stop_speech(channel=None):
+    """Stop current and pending speech on a channel (or everywhere)."""
+    return _send({"op": "stop", "channel": channel}, autostart=False)
+
+
+def ensure_daemon():
+    """Start the daemon in the background if it isn't running (call at tool startup)."""
+    _send({"op": "ping"})
+
+
+if __name__ == "__main__":
+    serve()
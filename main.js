@@ -934,80 +934,108 @@ const EDITOR_PATHS = {
   peggle: { path: 'apps/games/BENNYSPEGGLE', file: 'editor.html' },
 };
 
-// Find a free port
-async function findFreePort(start = 8800, end = 8900) {
-  const net = require('net');
-  for (let port = start; port < end; port++) {
-    const available = await new Promise((resolve) => {
-      const tester = net.createServer()
-        .once('error', () => resolve(false))
-        .once('listening', () => {
-          tester.close();
-          resolve(true);
-        })
-        .listen(port, '127.0.0.1');
+const EDITOR_SERVER_STATE_PATH = path.join(BENNYSHUB_DIR, 'shared', 'editor-server.json');
+const EDITOR_SERVER_READY_TIMEOUT = 10000;
+
+// Check that an editor server answers /api/ping on the given port
+function pingEditorServer(port, timeout = 500) {
+  return new Promise((resolve) => {
+    const req = http.get({ host: '127.0.0.1', port, path: '/api/ping', timeout }, (res) => {
+      let body = '';
+      res.on('data', (chunk) => { body += chunk; });
+      res.on('end', () => {
+        try {
+          resolve(JSON.parse(body).ok === true);
+        } catch (e) {
+          resolve(false);
+        }
+      });
     });
-    if (available) return port;
+    req.on('timeout', () => req.destroy());
+    req.on('error', () => resolve(false));
+  });
+}
+
+// Port of an already-running editor daemon (from its state file), or null
+async function findRunningEditorDaemon() {
+  try {
+    const state = JSON.parse(fs.readFileSync(EDITOR_SERVER_STATE_PATH, 'utf-8'));
+    if (state.port && await pingEditorServer(state.port)) {
+      return state.port;
+    }
+  } catch (e) {
+    // No state file or unreadable - no daemon to reuse
   }
   return null;
 }
 
-// Start the editor server (if not already running)
+// Start the editor daemon (if not already running)
+// The daemon prints "READY port=<n>" once it is listening, so we wait for that
+// instead of sleeping; later launches reuse it and cost only a URL open.
 async function startEditorServer() {
-  if (editorServerProcess && editorServerPort) {
-    // Check if server is still responding
-    const net = require('net');
-    const isRunning = await new Promise((resolve) => {
-      const client = net.createConnection({ port: editorServerPort, host: '127.0.0.1' }, () => {
-        client.end();
-        resolve(true);
-      });
-      client.on('error', () => resolve(false));
-    });
-    
-    if (isRunning) {
-      console.log(`[EDITOR-SERVER] Already running on port ${editorServerPort}`);
-      return editorServerPort;
-    }
+  if (editorServerPort && await pingEditorServer(editorServerPort)) {
+    return editorServerPort;
   }
   
-  // Find a free port
-  editorServerPort = await findFreePort();
-  if (!editorServerPort) {
-    console.error('[EDITOR-SERVER] Could not find a free port');
+  const runningPort = await findRunningEditorDaemon();
+  if (runningPort) {
+    console.log(`[EDITOR-SERVER] Reusing daemon on port ${runningPort}`);
+    editorServerPort = runningPort;
+    return editorServerPort;
+  }
+  
+  if (!fs.existsSync(EDITOR_SERVER_SCRIPT)) {
+    console.error('[EDITOR-SERVER] Script not found:', EDITOR_SERVER_SCRIPT);
     return null;
   }
   
-  // Start the Python server
-  if (fs.existsSync(EDITOR_SERVER_SCRIPT)) {
-    editorServerProcess = spawn('python', [EDITOR_SERVER_SCRIPT, '--port', editorServerPort.toString(), '--no-browser'], {
-      cwd: path.dirname(EDITOR_SERVER_SCRIPT),
-      detached: false,
-      stdio: 'pipe',
-      windowsHide: true
-    });
+  editorServerProcess = spawn('python', [EDITOR_SERVER_SCRIPT, '--daemon'], {
+    cwd: path.dirname(EDITOR_SERVER_SCRIPT),
+    detached: false,
+    stdio: 'pipe',
+    windowsHide: true
+  });
+  
+  editorServerPort = await new Promise((resolve) => {
+    const timer = setTimeout(() => {
+      console.error('[EDITOR-SERVER] Timed out waiting for daemon readiness');
+      resolve(null);
+    }, EDITOR_SERVER_READY_TIMEOUT);
+    
+    const finish = (port) => {
+      clearTimeout(timer);
+      resolve(port);
+    };
     
     editorServerProcess.on('error', (err) => {
       console.error('[EDITOR-SERVER] Error:', err);
+      finish(null);
+    });
+    
+    editorServerProcess.on('exit', (code) => {
+      console.log(`[EDITOR-SERVER] Exited with code ${code}`);
+      editorServerProcess = null;
+      finish(null);
     });
     
     editorServerProcess.stdout.on('data', (data) => {
-      console.log(`[EDITOR-SERVER] ${data}`);
+      const text = data.toString();
+      console.log(`[EDITOR-SERVER] ${text}`);
+      const match = text.match(/READY port=(\d+)/);
+      if (match) {
+        finish(parseInt(match[1], 10));
+      }
     });
     
     editorServerProcess.stderr.on('data', (data) => {
       console.log(`[EDITOR-SERVER] ${data}`);
     });
-    
-    // Wait for server to start
-    await new Promise(resolve => setTimeout(resolve, 1000));
-    
-    console.log(`[EDITOR-SERVER] Started on port ${editorServerPort}`);
-    return editorServerPort;
-  }
+  });
   
-  console.error('[EDITOR-SERVER] Script not found:', EDITOR_SERVER_SCRIPT);
-  return null;
+  if (editorServerPort) {
+    console.log(`[EDITOR-SERVER] Ready on port ${editorServerPort}`);
+  }
+  return editorServerPort;
 }
 
 // Launch an editor in Chrome